@@ -0,0 +1,126 @@
+import threading
+    # 워커 스레드와 캐시를 같이 쓰기 위해
+from typing import Dict,Optional,Tuple
+
+import pygame
+    # 게임 라이브러리
+
+from startup_profiler import PROFILER
+
+# 씬이 바뀔 때마다 같은 PNG/WAV를 디스크에서 다시 읽고 다시 스케일하지 않도록
+# 한 프로세스 안에서 모든 씬이 공유하는 에셋 캐시.
+# 이미지는 (경로, 목표 크기, 변환 모드, 스케일 방식), 효과음은 경로 단위로 한 번만 로드함.
+#
+# 씬 미리 준비(SceneManager.prewarm)와 Game의 로더 스레드가 동시에 미리 읽을 수 있으므로
+# 캐시를 채우는 건 락 안에서 함 (같은 파일은 한 번만 읽음). 워커 스레드는 decode()로 디스크에서
+# 읽기만 하고, 디스플레이 픽셀 포맷 변환(convert/convert_alpha)은 메인 스레드의 image()에서 함.
+
+ImageKey=Tuple[str,Optional[Tuple[int,int]],str,bool]
+
+class AssetManager:
+    def __init__(self)->None:
+        self.images:Dict[ImageKey,pygame.Surface]={}
+        self.decoded:Dict[str,pygame.Surface]={}
+            # 경로 -> 변환 안 한 원본 (decode()가 읽어 둔 것, image()가 디스크 대신 씀)
+        self.sounds:Dict[str,pygame.mixer.Sound]={}
+        self.lock:threading.RLock=threading.RLock()
+            # 캐시 채우기용 (캐시에 있는 걸 꺼내는 건 락 없이 함)
+
+    def decode(self,path:str)->pygame.Surface:
+        """이미지를 디스크에서 읽기만 하고 캐시함 (디스플레이 변환 안 함). 워커 스레드에서 불러도 됨.
+
+        Raises:
+            pygame.error, FileNotFoundError: 로드 실패 시 (pygame.image.load와 같음)
+        """
+        surf=self.decoded.get(path)
+        if surf is not None:
+            return surf
+        with self.lock:
+            surf=self.decoded.get(path)
+                # 기다리는 동안 다른 스레드가 읽었으면 그걸 씀
+            if surf is None:
+                with PROFILER.span('decode',path):
+                    surf=pygame.image.load(path)
+                self.decoded[path]=surf
+        return surf
+
+    def image(self,path:str,size:Optional[Tuple[int,int]]=None,
+              alpha:bool=True,smooth:bool=True)->pygame.Surface:
+        """이미지를 로드/변환/스케일해서 반환함. 같은 요청은 캐시된 Surface를 돌려줌.
+
+        디스플레이 변환을 하므로 메인 스레드에서만 부름 (워커 스레드는 decode()).
+
+        Args:
+            path (str): 이미지 경로.
+            size (Optional[Tuple[int,int]]): 목표 크기. None이면 원본 크기.
+            alpha (bool): True면 convert_alpha, False면 convert (불투명 배경용).
+                디스플레이가 아직 없으면 변환 없이 로드하고 따로 캐시함
+                (디스플레이가 생긴 뒤 다시 요청하면 변환된 것을 새로 만듦).
+            smooth (bool): True면 smoothscale, False면 scale.
+
+        Returns:
+            pygame.Surface: 여러 씬이 공유하므로 직접 수정하지 말 것
+
+        Raises:
+            pygame.error, FileNotFoundError: 로드 실패 시 (pygame.image.load와 같음)
+        """
+        if size is not None:
+            size=(int(size[0]),int(size[1]))
+        else:
+            smooth=True
+                # 원본 크기는 스케일 방식과 무관하게 한 항목으로 캐시
+        has_display=pygame.display.get_surface() is not None
+        if not has_display:
+            mode='raw'
+        else:
+            mode='alpha' if alpha else 'opaque'
+        key=(path,size,mode,smooth)
+        surf=self.images.get(key)
+        if surf is not None:
+            return surf
+
+        with self.lock:
+            surf=self.images.get(key)
+            if surf is not None:
+                return surf
+            with PROFILER.span('image',path):
+                surf=self.images.get((path,None,mode,True))
+                    # 원본 크기를 이미 변환했으면 그걸 스케일함
+                if surf is None:
+                    surf=self.decode(path)
+                        # 미리 읽어 둔 원본이 있으면 디스크를 다시 안 읽음
+                    if has_display:
+                        surf=surf.convert_alpha() if alpha else surf.convert()
+                            # 디스플레이 픽셀 포맷에 맞춰 두면 blit이 빠름
+                if size is not None and surf.get_size()!=size:
+                    surf=pygame.transform.smoothscale(surf,size) if smooth else pygame.transform.scale(surf,size)
+            self.images[key]=surf
+        return surf
+
+    def sound(self,path:str,volume:Optional[float]=None)->pygame.mixer.Sound:
+        """효과음을 한 번만 열어서 공유함.
+
+        Raises:
+            pygame.error, FileNotFoundError: 로드 실패 시
+        """
+        sound=self.sounds.get(path)
+        if sound is None:
+            with self.lock:
+                sound=self.sounds.get(path)
+                if sound is None:
+                    with PROFILER.span('sound',path):
+                        sound=pygame.mixer.Sound(path)
+                    self.sounds[path]=sound
+        if volume is not None:
+            sound.set_volume(volume)
+        return sound
+
+    def clear(self)->None:
+        """캐시 비움 (디스플레이 모드를 바꿔서 픽셀 포맷이 달라졌을 때 등)."""
+        with self.lock:
+            self.images.clear()
+            self.decoded.clear()
+            self.sounds.clear()
+
+ASSETS:AssetManager=AssetManager()
+    # 프로세스 전역 인스턴스 (모든 씬이 이걸 씀)
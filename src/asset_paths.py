@@ -21,6 +21,8 @@ ASSET_PATHS = {
         'assets/sounds/pop_02.wav',
     ],
     'tap_sound': 'assets/sounds/tap.wav',
+    'map_data': 'assets/map_data',
+    'stage_pack': 'assets/map_data/stages.pack',
 
     # ─────────────────────────────────────────
     # 설명
@@ -41,4 +43,6 @@ ASSET_PATHS = {
     #     ['assets/sounds/pop_01.wav': 첫 번째 터트림 효과음
     #      'assets/sounds/pop_02.wav': 두 번째 터트림 효과음]
     # 'tap_sound': 화면 탭 시 재생할 효과음
+    # 'map_data': 스테이지 CSV 폴더 (stage1.csv, stage2.csv, ...)
+    # 'stage_pack': CSV 폴더를 묶은 바이너리 스테이지 팩 (python src/stage_pack.py 로 생성, 있으면 CSV 대신 사용)
 }
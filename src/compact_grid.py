@@ -0,0 +1,249 @@
+from typing import Dict,Iterator,List,Set,Tuple,Union
+
+from config import BUBBLE_RADIUS,WALL_DROP_PIXELS
+from color_settings import COLORS
+from hex_grid import Bubble,HexGrid,NeighborTable,build_neighbor_table
+from obstacle import Obstacle
+
+# HexGrid와 같은 API를 가지지만 셀 상태를 bytearray 한 줄에 정수 코드로 저장하는 그리드.
+# 버블/장애물 객체를 따로 들고 있지 않고 필요할 때 셀 좌표에서 만들어 씀.
+# 보드 복제가 bytes 복사 한 번이라 탐색/시뮬레이션에서 수없이 복제할 때 유리함.
+
+CELL_CHARS:str='.RYBGN/'
+    # 코드 -> 문자 (0 = 빈 칸)
+CELL_CODES:Dict[str,int]={ch:i for i,ch in enumerate(CELL_CHARS)}
+    # 문자 -> 코드
+EMPTY:int=CELL_CODES['.']
+OBSTACLE:int=CELL_CODES['N']
+COLOR_CODES:bytes=bytes(CELL_CODES[ch] for ch in COLORS)
+
+class _RowView:
+    """grid.map[r]처럼 쓰기 위한 한 줄 뷰 (읽기/쓰기 모두 bytearray로 바로 반영됨)."""
+    __slots__=('cells','start','cols')
+
+    def __init__(self,cells:bytearray,start:int,cols:int)->None:
+        self.cells=cells
+        self.start=start
+        self.cols=cols
+
+    def __len__(self)->int:
+        return self.cols
+
+    def __getitem__(self,c):
+        if isinstance(c,slice):
+            return [CELL_CHARS[v] for v in self.cells[self.start:self.start+self.cols][c]]
+        if c<0:
+            c+=self.cols
+        if not 0<=c<self.cols:
+            raise IndexError(c)
+        return CELL_CHARS[self.cells[self.start+c]]
+
+    def __setitem__(self,c:int,ch:str)->None:
+        if c<0:
+            c+=self.cols
+        if not 0<=c<self.cols:
+            raise IndexError(c)
+        self.cells[self.start+c]=CELL_CODES.get(ch,EMPTY)
+
+    def __iter__(self)->Iterator[str]:
+        for v in self.cells[self.start:self.start+self.cols]:
+            yield CELL_CHARS[v]
+
+class _MapView:
+    """grid.map처럼 쓰기 위한 2차원 뷰."""
+    __slots__=('cells','rows','cols')
+
+    def __init__(self,cells:bytearray,rows:int,cols:int)->None:
+        self.cells=cells
+        self.rows=rows
+        self.cols=cols
+
+    def __len__(self)->int:
+        return self.rows
+
+    def __getitem__(self,r:int)->_RowView:
+        if r<0:
+            r+=self.rows
+        if not 0<=r<self.rows:
+            raise IndexError(r)
+        return _RowView(self.cells,r*self.cols,self.cols)
+
+    def __iter__(self)->Iterator[_RowView]:
+        for r in range(self.rows):
+            yield _RowView(self.cells,r*self.cols,self.cols)
+
+# ======== CompactHexGrid ========
+class CompactHexGrid(HexGrid):
+    def __init__(self,rows:int,cols:int,cell_size:int,wall_offset:int=0,
+                 x_offset:int=0,y_offset:int=0)->None:
+        self.rows:int=rows
+        self.cols:int=cols
+        self.cell:int=cell_size
+        self.wall_offset:int=wall_offset
+        self.x_offset:int=x_offset
+        self.y_offset:int=y_offset
+        self.cells:bytearray=bytearray(rows*cols)
+            # r*cols+c 위치에 셀 코드 저장
+        self.neighbors:NeighborTable=build_neighbor_table(rows,cols)
+        self.support_depth:Dict[Tuple[int,int],int]={}
+        self.loose_cells:Set[Tuple[int,int]]=set()
+        self.version:int=0
+        self.color_counts:Dict[str,int]=dict.fromkeys(COLORS,0)
+        self.bubble_count:int=0
+        self.row_counts:List[int]=[0]*rows
+        self.lowest_row:int=-1
+
+    def copy(self)->'CompactHexGrid':
+        """같은 상태의 그리드를 새로 만듦 (셀 배열 복사 한 번)."""
+        clone=CompactHexGrid.__new__(CompactHexGrid)
+        clone.rows=self.rows
+        clone.cols=self.cols
+        clone.cell=self.cell
+        clone.wall_offset=self.wall_offset
+        clone.x_offset=self.x_offset
+        clone.y_offset=self.y_offset
+        clone.cells=bytearray(self.cells)
+        clone.neighbors=self.neighbors
+        clone.support_depth=dict(self.support_depth)
+        clone.loose_cells=set(self.loose_cells)
+        clone.version=self.version
+        clone.color_counts=dict(self.color_counts)
+        clone.bubble_count=self.bubble_count
+        clone.row_counts=self.row_counts[:]
+        clone.lowest_row=self.lowest_row
+        return clone
+
+    @classmethod
+    def from_grid(cls,grid:HexGrid)->'CompactHexGrid':
+        """기존 HexGrid 상태를 그대로 옮겨옴."""
+        compact=cls(grid.rows,grid.cols,grid.cell,grid.wall_offset,grid.x_offset,grid.y_offset)
+        compact.load_from_stage(grid.map)
+        return compact
+
+    # ---------- HexGrid 호환 속성 (필요할 때 만들어서 반환) ----------
+    @property
+    def map(self)->_MapView:
+        return _MapView(self.cells,self.rows,self.cols)
+
+    @property
+    def bubble_list(self)->List[Bubble]:
+        bubbles=[]
+        for i,code in enumerate(self.cells):
+            if code in COLOR_CODES:
+                r,c=divmod(i,self.cols)
+                x,y=self.get_local_center(r,c)
+                b=Bubble(x,y,CELL_CHARS[code])
+                b.is_attached=True
+                b.set_grid_index(r,c)
+                bubbles.append(b)
+        return bubbles
+
+    @property
+    def obs_list(self)->List[Obstacle]:
+        obstacles=[]
+        for i,code in enumerate(self.cells):
+            if code==OBSTACLE:
+                r,c=divmod(i,self.cols)
+                x,y=self.get_local_center(r,c)
+                obstacles.append(Obstacle(x,y,BUBBLE_RADIUS,r,c))
+        return obstacles
+
+    @property
+    def occupants(self)->Dict[Tuple[int,int],Union[Bubble,Obstacle]]:
+        found={}
+        for b in self.bubble_list:
+            found[(b.row_idx,b.col_idx)]=b
+        for ob in self.obs_list:
+            found[(ob.row_idx,ob.col_idx)]=ob
+        return found
+
+    # ---------- 셀 상태 변경 ----------
+    def load_from_stage(self,stage_map:List[List[str]])->None:
+        self.cells=bytearray(self.rows*self.cols)
+        self.color_counts=dict.fromkeys(COLORS,0)
+        self.bubble_count=0
+        self.row_counts=[0]*self.rows
+        self.lowest_row=-1
+        padding=set()
+        for r in range(min(self.rows,len(stage_map))):
+            row=stage_map[r]
+            base=r*self.cols
+            for c in range(min(self.cols,len(row))):
+                ch=row[c]
+                if ch in COLORS or ch=='N':
+                    self.cells[base+c]=CELL_CODES[ch]
+                    self._count_cell(r,ch,1)
+                elif ch=='/':
+                    self.cells[base+c]=CELL_CODES['/']
+                    padding.add((r,c))
+        # HexGrid와 같이 '/' 패딩 셀은 이웃 표에서 뺌
+        self.neighbors=build_neighbor_table(self.rows,self.cols,frozenset(padding))
+        self._rebuild_support()
+        self.version+=1
+
+    def place_bubble(self,bubble:Bubble,r:int,c:int)->None:
+        if r<0 or r>=self.rows or c<0 or c>=self.cols:
+            print(f"Error: Out of bounds placement at ({r},{c})")
+            return
+
+        if self.cells[r*self.cols+c]==CELL_CODES['/']:
+            c=min(c+1,self.cols-1)
+
+        self._count_cell(r,CELL_CHARS[self.cells[r*self.cols+c]],-1)
+        self.cells[r*self.cols+c]=CELL_CODES[bubble.color]
+        self._count_cell(r,bubble.color,1)
+        bubble.x,bubble.y=self.get_local_center(r,c)
+        bubble.is_attached=True
+        bubble.in_air=False
+        bubble.set_grid_index(r,c)
+        self._attach_support(r,c)
+        self.version+=1
+
+    def remove_cells(self,cells:Set[Tuple[int,int]])->None:
+        for (r,c) in cells:
+            if self.is_in_bounds(r,c):
+                self._count_cell(r,CELL_CHARS[self.cells[r*self.cols+c]],-1)
+                self.cells[r*self.cols+c]=EMPTY
+        for cell in cells:
+            self.support_depth.pop(cell,None)
+            self.loose_cells.discard(cell)
+        self.version+=1
+
+    # ---------- 탐색 ----------
+    def nearby_occupants(self,x:float,y:float)->List[Union[Bubble,Obstacle]]:
+        found=[]
+        r0=int((y-self.wall_offset-self.y_offset)//self.cell)
+        for r in range(r0-1,r0+2):
+            if r<0 or r>=self.rows:
+                continue
+            c_base=x-self.x_offset
+            if r%2==1:
+                c_base-=self.cell//2
+            c0=int(c_base//self.cell)
+            for c in range(max(c0-1,0),min(c0+2,self.cols)):
+                code=self.cells[r*self.cols+c]
+                if code==EMPTY or code==CELL_CODES['/']:
+                    continue
+                cx,cy=self.get_local_center(r,c)
+                if code==OBSTACLE:
+                    found.append(Obstacle(cx,cy,BUBBLE_RADIUS,r,c))
+                else:
+                    b=Bubble(cx,cy,CELL_CHARS[code])
+                    b.is_attached=True
+                    b.set_grid_index(r,c)
+                    found.append(b)
+        return found
+
+    def cell_at(self,r:int,c:int)->str:
+        return CELL_CHARS[self.cells[r*self.cols+c]]
+
+    # ---------- 벽 이동 (HexGrid와 같이 오프셋만 바꿈) ----------
+    def drop_wall(self)->None:
+        self.wall_offset+=WALL_DROP_PIXELS
+        self.version+=1
+
+    def raise_wall(self)->None:
+        if self.wall_offset<=0:
+            return
+        self.wall_offset=max(0,self.wall_offset-WALL_DROP_PIXELS)
+        self.version+=1
@@ -29,6 +29,11 @@ BUBBLE_SPEED: int = int(BASE_BUBBLE_SPEED * SCALE)
 LAUNCH_COOLDOWN: int = 4
 WALL_DROP_PIXELS: int = CELL_SIZE
 
+# 발사대 각도 설정 (도 단위, 90 = 정면)
+CANNON_MIN_ANGLE: float = 10
+CANNON_MAX_ANGLE: float = 170
+CANNON_ANGLE_SPEED: float = 4.0
+
 # 맵 설정
 MAP_ROWS: int = 6
 MAP_COLS: int = 8
@@ -26,3 +26,14 @@ class Itemtype(Enum):
         # 벽 한 줄 올리기
     RAINBOW='rainbow'
         # 무지개 버블
+
+class Action(Enum):
+    """한 프레임 동안 시뮬레이터에 전달하는 입력 정의"""
+    LEFT='left'
+        # 발사대 왼쪽 회전
+    RIGHT='right'
+        # 발사대 오른쪽 회전
+    FIRE='fire'
+    SWAP='swap'
+    RAISE='raise'
+    RAINBOW='rainbow'
@@ -1,19 +1,33 @@
 import pygame
-from map_editor import MapEditor
+from map_editor import MapEditor, preload_assets
 
 class EditorScene:
     """Map Editor를 Scene으로 래핑하는 클래스"""
+    likely_next = 'menu'
+
     def __init__(self, manager):
         self.manager = manager
         self.editor = None
+
+    def enter(self):
+        """처음엔 MapEditor 생성, 다시 들어오면 기존 인스턴스 재사용"""
+        # MapEditor 인스턴스 생성 (이미 pygame.init()은 main.py에서 완료됨)
+        if self.editor is None:
+            self.editor = MapEditor()
+        else:
+            self.editor.resume()
     
     def run(self):
         """Map Editor 실행"""
-        # MapEditor 인스턴스 생성 (이미 pygame.init()은 main.py에서 완료됨)
-        self.editor = MapEditor()
+        if self.editor is None:
+            self.enter()
         
         # 에디터 실행 (ESC 키로 종료 가능)
         self.editor.run()
         
         # 에디터가 종료되면 메뉴로 돌아감
         return 'menu'
+
+def preload():
+    """SceneManager 백그라운드 준비용: 에디터 에셋 미리 디코딩"""
+    preload_assets()
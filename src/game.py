@@ -4,157 +4,182 @@ import random
     # 난수 생성 위해
 import sys
     # 경로 조작 위해
-import csv
-    # CSV 파일 읽기 위해
 import os
-    # 파일 경로 존재 여부 확인 위해
-from typing import List,Set,Tuple,Optional
+    # 환경 변수 읽기 위해
+from typing import Dict,List,Optional,Tuple
     # 타입 힌트 위해
 
 import pygame
     # 게임 라이브러리
 
 from config import (
-    SCREEN_WIDTH,SCREEN_HEIGHT,FPS,CELL_SIZE,BUBBLE_RADIUS,BUBBLE_SPEED,
-    LAUNCH_COOLDOWN,WALL_DROP_PIXELS,MAP_ROWS,MAP_COLS,
-    NEXT_BUBBLE_X,NEXT_BUBBLE_Y_OFFSET,SCALE
+    SCREEN_WIDTH,SCREEN_HEIGHT,FPS,BUBBLE_RADIUS,
+    NEXT_BUBBLE_X,NEXT_BUBBLE_Y_OFFSET,SCALE,
+    CANNON_MIN_ANGLE,CANNON_MAX_ANGLE,CANNON_ANGLE_SPEED,WALL_DROP_PIXELS
 )
     # 설정값 임포트
 from game_settings import (
-    END_SCREEN_DELAY,POP_SOUND_VOLUME,TAP_SOUND_VOLUME
+    END_SCREEN_DELAY,STAGE_CLEAR_DELAY,POP_SOUND_VOLUME,TAP_SOUND_VOLUME,INSTANT_RESOLVE,
+    WALL_DROP_ANIM_MS,AUTOPLAY_SHOT_DELAY,SOLVER_FRAME_BUDGET_MS,ARROW_ANGLE_STEP,ARROW_CACHE_SIZE
 )
     # 게임 설정값 임포트
 from asset_paths import ASSET_PATHS
-from constants import BubbleColor,GameState,Itemtype
-from color_settings import (COLORS,
-                            COLOR_MAP)
-
-from obstacle import Obstacle
+from constants import Action
+from color_settings import COLORS
+
+from hex_grid import Bubble,HexGrid,clamp,load_stage_from_csv
+    # 게임 모델 (pygame 비의존)
+from simulator import Simulator,ShotResult
+    # 게임 로직 엔진 (pygame 비의존)
+from text_cache import get_font,get_sys_font,render_text
+    # 폰트/텍스트 Surface 캐시
+from asset_manager import ASSETS
+    # 씬끼리 공유하는 이미지/효과음 캐시
+from stage_loader import LoadedStage,StageLoader
+    # 스테이지/에셋 백그라운드 로더
+from stage_catalog import Snapshot
+from stage_watcher import StageWatcher
+    # 스테이지 파일 변경 감시 (핫 리로드)
+from replay import REPLAY_ENV,ReplayRecorder,new_seed,save_replay
+    # 시드/입력 기록 (리플레이)
+from solver import Move,Solver
+    # 힌트/자동 플레이용 각도 고르는 봇
 
 from pathlib import Path
 sys.path.append(str(Path(__file__).parent))
     # 상대경로 임포트 위해
 
-# ======== 버블 이미지 로드 ========
-try:
-    BUBBLE_IMAGES:dict[str,pygame.Surface]={
-        'R':pygame.image.load(ASSET_PATHS['bubble_red']),
-        'Y':pygame.image.load(ASSET_PATHS['bubble_yellow']),
-        'B':pygame.image.load(ASSET_PATHS['bubble_blue']),
-        'G':pygame.image.load(ASSET_PATHS['bubble_green']),
-    }
-    print("버블 이미지 로드 완료.")
-except pygame.error as e:
-    print(f"이미지 로드 실패함: {e}. 기본 색상으로 대체합니다.")
-    BUBBLE_IMAGES=None
-
-# ======== 이미지 크기 조정 ========
-if BUBBLE_IMAGES:
-    target_size=BUBBLE_RADIUS*2
-    for color in BUBBLE_IMAGES:
-        BUBBLE_IMAGES[color]=pygame.transform.smoothscale(
-            BUBBLE_IMAGES[color],
-            (target_size,target_size)
-        )
-    print(f"버블 이미지 크기 조정 완료: {target_size}x{target_size}px")
-
-# 안전차원에서 다시 명시
-COLORS:dict[str,Tuple[int,int,int]]={
-    'R':(220,50,50),
-    'Y':(240,200,60),
-    'B':(60,100,240),
-    'G':(70,200,120),
+# ======== 버블 이미지 (처음 쓸 때 로드) ========
+# 모듈 임포트 시에는 파일을 읽지 않음 (헤드리스 도구도 I/O 없이 임포트 가능).
+BUBBLE_IMAGE_KEYS:Dict[str,str]={
+    'R':'bubble_red',
+    'Y':'bubble_yellow',
+    'B':'bubble_blue',
+    'G':'bubble_green',
 }
+_bubble_images:Optional[Dict[str,pygame.Surface]]=None
+_bubble_images_state:str='unloaded'
+    # 'unloaded' | 'raw'(디스플레이 전 로드) | 'converted' | 'failed'
+
+def get_bubble_images()->Optional[Dict[str,pygame.Surface]]:
+    """버블 스프라이트 반환함. 로드 실패 시 None (색 원으로 대체).
+
+    처음 부를 때 로드하고, 디스플레이가 생긴 뒤라면 그 픽셀 포맷으로 변환된 것을 씀.
+    디스플레이 전에 로드된 상태면 디스플레이가 생긴 뒤 한 번 더 변환해서 바꿔 둠.
+    """
+    global _bubble_images,_bubble_images_state
+    if _bubble_images_state in ('converted','failed'):
+        return _bubble_images
+    has_display=pygame.display.get_surface() is not None
+    if _bubble_images_state=='raw' and not has_display:
+        return _bubble_images
 
-# ======== 유틸리티 ========
-def clamp(v:float,lo:float,hi:float)->float:
-    return max(lo,min(hi,v))
-
-def load_stage_from_csv(stage_index:int)->List[List[str]]:
-    csv_path=f'assets/map_data/stage{stage_index+1}.csv'
-
-    if not os.path.exists(csv_path):
-        return [['.' for _ in range(MAP_COLS)] for _ in range(MAP_ROWS)]
-            # 빈 맵 반환 (로드 안 되면 빈 맵으로 처리)
-
-    stage_map=[]
+    target_size=BUBBLE_RADIUS*2
     try:
-        with open(csv_path,'r',encoding='utf-8') as f:
-            reader=csv.reader(f)
-            for row in reader:
-                map_row=[]
-                for cell in row:
-                    cell=cell.strip()
-                    if cell=='' or cell.upper()=='X':
-                        map_row.append('.')
-                    elif cell.upper()=='N':
-                        map_row.append('N')
-                    elif cell.upper() in COLORS:
-                        map_row.append(cell.upper())
-                    else:
-                        map_row.append('.')
-                while len(map_row)<MAP_COLS:
-                    map_row.append('.')
-                map_row=map_row[:MAP_COLS]
-                stage_map.append(map_row)
-
-        while len(stage_map)<MAP_ROWS:
-            stage_map.append(['.' for _ in range(MAP_COLS)])
-        stage_map=stage_map[:MAP_ROWS]
-
-        print(f"스테이지 {stage_index+1} 맵 데이터 로드 완료: {csv_path}")
-        return stage_map
-
-    except Exception as e:
-        print(f"오류: {csv_path} 파일을 읽는 중 오류가 발생했습니다: {e}")
-        return [['.' for _ in range(MAP_COLS)] for _ in range(MAP_ROWS)]
-
-# ======== Bubble ========
-class Bubble:
-    def __init__(self,x:float,y:float,color:str,radius:int=BUBBLE_RADIUS)->None:
-        self.x:float=x
-        self.y:float=y
-        self.color:str=color
-        self.radius:int=radius
-        self.in_air:bool=False
-        self.is_attached:bool=False
-        self.angle_degree:float=90
-        self.speed:int=BUBBLE_SPEED
-        self.row_idx:int=-1
-        self.col_idx:int=-1
-
-    def draw(self,screen:pygame.Surface)->None:
-        if BUBBLE_IMAGES:
-            img=BUBBLE_IMAGES[self.color]
-            rect=img.get_rect(center=(int(self.x),int(self.y)))
-            screen.blit(img,rect)
-        else:
-            pygame.draw.circle(screen,COLORS[self.color],(int(self.x),int(self.y)),self.radius)
-            pygame.draw.circle(screen,(255,255,255),(int(self.x),int(self.y)),self.radius,2)
-
-    def set_angle(self,angle_degree:float)->None:
-        self.angle_degree=angle_degree
-
-    def set_grid_index(self,r:int,c:int)->None:
-        self.row_idx=r
-        self.col_idx=c
-
-    def move(self)->None:
-        rad=math.radians(self.angle_degree)
-        dx=self.speed*math.cos(rad)
-        dy=-self.speed*math.sin(rad)
-        self.x+=dx
-        self.y+=dy
-
-        grid_x_start=(SCREEN_WIDTH-(MAP_COLS*CELL_SIZE))//2
-        grid_x_end=grid_x_start+(MAP_COLS*CELL_SIZE)
-
-        if self.x-self.radius<grid_x_start:
-            self.x=grid_x_start+self.radius
-            self.angle_degree=180-self.angle_degree
-        elif self.x+self.radius>grid_x_end:
-            self.x=grid_x_end-self.radius
-            self.angle_degree=180-self.angle_degree
+        _bubble_images={
+            color:ASSETS.image(ASSET_PATHS[key],(target_size,target_size))
+            for color,key in BUBBLE_IMAGE_KEYS.items()
+        }
+    except (pygame.error,FileNotFoundError) as e:
+        print(f"이미지 로드 실패함: {e}. 기본 색상으로 대체합니다.")
+        _bubble_images=None
+        _bubble_images_state='failed'
+        return None
+    _bubble_images_state='converted' if has_display else 'raw'
+    print(f"버블 이미지 로드 완료: {target_size}x{target_size}px")
+    return _bubble_images
+
+# ======== 그리드 스프라이트 (배치 렌더용) ========
+GridSprite=Tuple[pygame.Surface,int,int]
+    # (스프라이트, 중심까지 x 거리, 중심까지 y 거리)
+_grid_sprites:Optional[Tuple[Optional[Dict[str,pygame.Surface]],Dict[str,GridSprite]]]=None
+    # (만들 때 쓴 버블 이미지, 셀 문자 -> 스프라이트)
+
+def _circle_sprite(radius:int,layers:List[Tuple[Tuple[int,int,int],int]])->pygame.Surface:
+    """pygame.draw.circle 여러 겹을 투명 Surface에 미리 그려 둔 스프라이트."""
+    size=radius*2+2
+    surf=pygame.Surface((size,size),pygame.SRCALPHA)
+    for color,width in layers:
+        pygame.draw.circle(surf,color,(size//2,size//2),radius,width)
+    if pygame.display.get_surface() is not None:
+        surf=surf.convert_alpha()
+    return surf
+
+def get_grid_sprites()->Dict[str,GridSprite]:
+    """셀 문자('R','Y','B','G','N') -> 그리드 배치 렌더용 스프라이트.
+
+    버블은 버블 이미지(없으면 색 원), 장애물은 회색 원을 한 번 그려 둔 것을 씀.
+    버블 이미지가 바뀌면(디스플레이 생성 후 변환 등) 다시 만듦.
+    """
+    global _grid_sprites
+    images=get_bubble_images()
+    if _grid_sprites is not None and _grid_sprites[0] is images:
+        return _grid_sprites[1]
+    sprites:Dict[str,GridSprite]={}
+    for color,rgb in COLORS.items():
+        img=images[color] if images else _circle_sprite(BUBBLE_RADIUS,[(rgb,0),((255,255,255),2)])
+        sprites[color]=(img,img.get_width()//2,img.get_height()//2)
+    obstacle=_circle_sprite(BUBBLE_RADIUS,[((90,90,90),0),((160,160,160),4)])
+    sprites['N']=(obstacle,obstacle.get_width()//2,obstacle.get_height()//2)
+    _grid_sprites=(images,sprites)
+    return sprites
+
+def blit_sequence(screen:pygame.Surface,seq:List[Tuple[pygame.Surface,Tuple[int,int]]])->None:
+    """(스프라이트, 위치) 목록을 C 호출 한 번으로 그림 (pygame-ce면 fblits)."""
+    fblits=getattr(screen,'fblits',None)
+    if fblits is not None:
+        fblits(seq)
+    else:
+        screen.blits(seq,doreturn=False)
+
+def preload_assets()->None:
+    """게임 씬 이미지/효과음을 원본 크기로 미리 디코딩해서 캐시에 넣어 둠.
+
+    메뉴에 있는 동안(또는 Game 생성 중 로더 스레드에서) 백그라운드 스레드에서 불림.
+    디스크에서 읽기만 하고, 디스플레이 변환과 크기 조정은 Game이 만들어질 때 메인 스레드에서
+    캐시된 원본으로 함. 실패는 무시함 (Game 생성 시 보고됨).
+    """
+    for key in ('background','char_left','char_right','logo','cannon_arrow',
+                'item_swap','item_raise','item_rainbow',*BUBBLE_IMAGE_KEYS.values()):
+        try:
+            ASSETS.decode(ASSET_PATHS[key])
+        except (pygame.error,FileNotFoundError):
+            pass
+    for path in [*ASSET_PATHS['pop_sounds'],ASSET_PATHS['tap_sound']]:
+        try:
+            ASSETS.sound(path)
+        except (pygame.error,FileNotFoundError):
+            pass
+
+# ======== 그리기 ========
+def draw_bubble(screen:pygame.Surface,bubble:Bubble,dy:int=0)->pygame.Rect:
+    """버블 그리고 칠한 영역 반환함. dy는 y에 더할 값 (붙어있는 버블은 벽 위치)."""
+    center=(int(bubble.x),int(bubble.y)+dy)
+    images=get_bubble_images()
+    if images:
+        img=images[bubble.color]
+        rect=img.get_rect(center=center)
+        return screen.blit(img,rect)
+    pygame.draw.circle(screen,COLORS[bubble.color],center,bubble.radius)
+    return pygame.draw.circle(screen,(255,255,255),center,bubble.radius,2)
+
+# 색은 회색 계열로 설정 (임시)
+def draw_grid(screen:pygame.Surface,grid:HexGrid,wall_offset:Optional[int]=None)->None:
+    """붙어있는 버블/장애물 그림. wall_offset을 주면 실제 벽 위치 대신 그 위치에 그림 (벽 이동 연출).
+
+    스프라이트와 위치를 한 목록으로 모아서 blits 한 번으로 보냄.
+    """
+    dy=grid.wall_offset if wall_offset is None else wall_offset
+    sprites=get_grid_sprites()
+    seq=[]
+    for b in grid.bubble_list:
+        img,hx,hy=sprites[b.color]
+        seq.append((img,(int(b.x)-hx,int(b.y)+dy-hy)))
+
+    img,hx,hy=sprites['N']
+    for ob in grid.obs_list:
+        seq.append((img,(int(ob.x)-hx,int(ob.y)+dy-hy)))
+    blit_sequence(screen,seq)
 
 # ======== Cannon ========
 class Cannon:
@@ -162,13 +187,14 @@ class Cannon:
         self.x:int=x
         self.y:int=y
         self.angle:float=90
-        self.min_angle:float=10
-        self.max_angle:float=170
-        self.angle_speed:float=4.0
+        self.min_angle:float=CANNON_MIN_ANGLE
+        self.max_angle:float=CANNON_MAX_ANGLE
+        self.angle_speed:float=CANNON_ANGLE_SPEED
+        self.rotated_cache:Dict[int,Tuple[pygame.Surface,Tuple[int,int]]]={}
+            # 각도 단계 -> (회전된 이미지, 중심 기준 좌상단 오프셋). 최근에 쓴 것이 뒤쪽
 
         try:
-            self.arrow_image=pygame.image.load(ASSET_PATHS['cannon_arrow']).convert_alpha()
-            self.arrow_image=pygame.transform.smoothscale(self.arrow_image,(152,317))
+            self.arrow_image=ASSETS.image(ASSET_PATHS['cannon_arrow'],(152,317))
         except pygame.error:
             print("발사대 이미지 로드 실패")
             self.arrow_image=None
@@ -177,371 +203,172 @@ class Cannon:
         self.angle+=delta
         self.angle=clamp(self.angle,self.min_angle,self.max_angle)
 
-    def draw(self,screen:pygame.Surface)->None:
-        if self.arrow_image:
-            rotated_arrow=pygame.transform.rotate(self.arrow_image,self.angle-90)
-            arrow_rect=rotated_arrow.get_rect(center=(self.x,self.y))
-            screen.blit(rotated_arrow,arrow_rect)
-        else:
-            length=100
-            rad=math.radians(self.angle)
-            end_x=self.x+length*math.cos(rad)
-            end_y=self.y-length*math.sin(rad)
-            pygame.draw.line(screen,(255,255,255),(self.x,self.y),(end_x,end_y),4)
-            pygame.draw.circle(screen,(255,0,0),(self.x,self.y),6)
-
-# ======== HexGrid ========
-class HexGrid:
-    def __init__(self,rows:int,cols:int,cell_size:int,wall_offset:int=0,
-                 x_offset:int=0,y_offset:int=0)->None:
-        self.rows:int=rows
-        self.cols:int=cols
-        self.cell:int=cell_size
-        self.wall_offset:int=wall_offset
-        self.x_offset:int=x_offset
-        self.y_offset:int=y_offset
-        self.map:List[List[str]]=[['.' for _ in range(cols)] for _ in range(rows)]
-        self.bubble_list:List[Bubble]=[]
-        self.obs_list:List[Obstacle]=[]
-
-    def load_from_stage(self,stage_map:List[List[str]])->None:
-        self.map=[row[:] for row in stage_map]
-        self.bubble_list=[]
-        self.obs_list=[]
-        for r in range(self.rows):
-            if r>=len(self.map):
-                break
-            for c in range(self.cols):
-                if c<len(self.map[r]):
-                    ch=self.map[r][c]
-                else:
-                    ch='.'
-
-                # 버블 파싱
-                if ch in COLORS:
-                    x,y=self.get_cell_center(r,c)
-                    b=Bubble(x,y,ch)
-                    b.is_attached=True
-                    b.set_grid_index(r,c)
-                    self.bubble_list.append(b)
-                    continue
-
-                # 장애물 파싱
-                if ch=='N':
-                    obsx,obsy=self.get_cell_center(r,c)
-                    # ob=Obstacle(obsx,obsy,BUBBLE_RADIUS)
-                    ob=Obstacle(obsx,obsy,BUBBLE_RADIUS,r,c)
-                    self.obs_list.append(ob)
-                    self.map[r][c]='N'
-                    continue
-
-    def get_cell_center(self,r:int,c:int)->Tuple[int,int]:
-        x=c*self.cell+self.cell//2+self.x_offset
-        y=r*self.cell+self.cell//2+self.wall_offset+self.y_offset
-        if r%2==1:
-            x+=self.cell//2
-        return x,y
-
-    def screen_to_grid(self,x:float,y:float)->Tuple[int,int]:
-        r=int((y-self.wall_offset-self.y_offset)//self.cell)
-        if r<0:
-            r=0
-        c_base=x-self.x_offset
-        if r%2==1:
-            c=int((c_base-self.cell//2)//self.cell)
-        else:
-            c=int(c_base//self.cell)
-        c=clamp(c,0,self.cols-1)
-        r=clamp(r,0,self.rows-1)
-        return int(r),int(c)
-
-    def place_bubble(self,bubble:Bubble,r:int,c:int)->None:
-        if r<0 or r>=self.rows or c<0 or c>=self.cols:
-            print(f"Error: Out of bounds placement at ({r},{c})")
-            return
-
-        if self.map[r][c]=='/':
-            c=clamp(c+1,0,self.cols-1)
-
-        if r>=len(self.map) or c>=len(self.map[r]):
-            print(f"Warning: Placing bubble at ({r},{c}) which may be out of map data bounds.")
-
-        self.map[r][c]=bubble.color
-        cx,cy=self.get_cell_center(r,c)
-        bubble.x,bubble.y=cx,cy
-        bubble.is_attached=True
-        bubble.in_air=False
-        bubble.set_grid_index(r,c)
-        self.bubble_list.append(bubble)
-
-    def nearest_grid_to_point(self,x:float,y:float)->Tuple[int,int]:
-        r,c=self.screen_to_grid(x,y)
-
-        if not self.is_in_bounds(r,c):
-            return (0,clamp(c,0,self.cols-1))
-
-        if self.map[r][c] in COLORS or self.map[r][c]=='/':
-            neighbors=self.get_neighbors(r,c)
-            best_neighbor=(r,c)
-            min_dist_sq=float('inf')
-            found_empty=False
-
-            for nr,nc in neighbors:
-                if self.is_in_bounds(nr,nc) and self.map[nr][nc]=='.':
-                    nx,ny=self.get_cell_center(nr,nc)
-                    dist_sq=(x-nx)**2+(y-ny)**2
-                    if dist_sq<min_dist_sq:
-                        min_dist_sq=dist_sq
-                        best_neighbor=(nr,nc)
-                        found_empty=True
-
-            if found_empty:
-                return best_neighbor
-
-        if self.is_in_bounds(r,c) and self.map[r][c]=='.':
-            return r,c
-
-        print(f"Warning: no empty cell found near. ({r},{c}). Forcing.")
-        return r,c
-
-    def is_in_bounds(self,r:int,c:int)->bool:
-        return 0<=r<self.rows and 0<=c<self.cols
-
-    def get_neighbors(self,r:int,c:int)->List[Tuple[int,int]]:
-        if r%2==0:
-            dr=[0,-1,-1,0,1,1]
-            dc=[-1,-1,0,1,0,-1]
-        else:
-            dr=[0,-1,-1,0,1,1]
-            dc=[-1,0,1,1,1,0]
-        return [(r+dr[i],c+dc[i]) for i in range(6)]
-
-    def dfs_same_color(self,row:int,col:int,color:str,visited:Set[Tuple[int,int]])->None:
-        stack=[(row,col)]
-        while stack:
-            r,c=stack.pop()
-            if not self.is_in_bounds(r,c) or (r,c) in visited:
-                continue
-            if r>=len(self.map) or c>=len(self.map[r]):
-                continue
-            if self.map[r][c]!=color:
-                continue
-            visited.add((r,c))
-            for nr,nc in self.get_neighbors(r,c):
-                stack.append((nr,nc))
-
-    def remove_cells(self,cells:Set[Tuple[int,int]])->None:
-        cell_set=set(cells)
-        for (r,c) in cell_set:
-            if self.is_in_bounds(r,c):
-                self.map[r][c]='.'
-        self.bubble_list=[
-            b for b in self.bubble_list
-            if (b.row_idx,b.col_idx) not in cell_set
-        ]
+    def angle_step(self,angle:float)->int:
+        """각도를 ARROW_ANGLE_STEP 간격 단계 번호로 반올림함 (0도 = 0단계).
 
-    def flood_from_top(self)->Set[Tuple[int,int]]:
-        visited:Set[Tuple[int,int]]=set()
-        for c in range(self.cols):
-            if 0<len(self.map) and c<len(self.map[0]):
-                if self.map[0][c] in COLORS:
-                    self._dfs_reachable(0,c,visited)
-        return visited
-
-    def _dfs_reachable(self,row:int,col:int,visited:Set[Tuple[int,int]])->None:
-        if not self.is_in_bounds(row,col) or (row,col) in visited:
-            return
-        if row>=len(self.map) or col>=len(self.map[row]):
-            return
-        if self.map[row][col] not in COLORS:
-            return
-        visited.add((row,col))
-        for nr,nc in self.get_neighbors(row,col):
-            self._dfs_reachable(nr,nc,visited)
-
-    def remove_hanging(self)->None:
-        connected=self.flood_from_top()
-        not_connected:List[Tuple[int,int]]=[]
-        for r in range(self.rows):
-            if r>=len(self.map):
-                break
-            for c in range(self.cols):
-                if c>=len(self.map[r]):
-                    break
-                if self.map[r][c] in COLORS and (r,c) not in connected:
-                    not_connected.append((r,c))
-        if not_connected:
-            self.remove_cells(set(not_connected))
-
-    def draw(self,screen:pygame.Surface)->None:
-        for b in self.bubble_list:
-            b.draw(screen)
-
-        for ob in self.obs_list:
-            ob.draw(screen)
-
-    def drop_wall(self)->None:
-        self.wall_offset+=WALL_DROP_PIXELS
-        for b in self.bubble_list:
-            cx,cy=self.get_cell_center(b.row_idx,b.col_idx)
-            b.x,b.y=cx,cy
-
-        for ob in self.obs_list:
-            cx,cy=self.get_cell_center(ob.row_idx,ob.col_idx)
-            ob.x,ob.y=cx,cy
-
-    def raise_wall(self)->None:
-        """벽을 한 칸 올려서(위로 이동) 여유 공간 늘림.
+        간격은 고정이라 힌트/자동 플레이를 켜고 끄는 것과 무관하게 같은 각도는 항상 같은 이미지임.
         """
-        if self.wall_offset<=0:
-            # 더 이상 못 올리면
-            return
-        self.wall_offset=max(0,self.wall_offset-WALL_DROP_PIXELS)
-        for b in self.bubble_list:
-            cx,cy=self.get_cell_center(b.row_idx,b.col_idx)
-            b.x,b.y=cx,cy
-
-        for ob in self.obs_list:
-            cx,cy=self.get_cell_center(ob.row_idx,ob.col_idx)
-            ob.x,ob.y=cx,cy
+        angle=clamp(angle,self.min_angle,self.max_angle)
+        return round(angle/ARROW_ANGLE_STEP)
+
+    def rotated_arrow(self,angle:float)->Tuple[pygame.Surface,Tuple[int,int]]:
+        """해당 각도 단계의 회전 이미지 반환함. 단계마다 한 번만 회전시키고 재사용함."""
+        step=self.angle_step(angle)
+        cached=self.rotated_cache.pop(step,None)
+        if cached is None:
+            image=pygame.transform.rotate(self.arrow_image,step*ARROW_ANGLE_STEP-90)
+            w,h=image.get_size()
+            cached=(image,(-(w//2),-(h//2)))
+            if len(self.rotated_cache)>=ARROW_CACHE_SIZE:
+                del self.rotated_cache[next(iter(self.rotated_cache))]
+                    # 가장 오래 안 쓴 각도부터 버림
+        self.rotated_cache[step]=cached
+            # 맨 뒤로 다시 넣어서 최근에 쓴 순서 유지
+        return cached
+
+    def draw(self,screen:pygame.Surface)->pygame.Rect:
+        """발사대 그리고 칠한 영역 반환함."""
+        if self.arrow_image:
+            image,(ox,oy)=self.rotated_arrow(self.angle)
+            return screen.blit(image,(self.x+ox,self.y+oy))
+        length=100
+        rad=math.radians(self.angle)
+        end_x=self.x+length*math.cos(rad)
+        end_y=self.y-length*math.sin(rad)
+        line_rect=pygame.draw.line(screen,(255,255,255),(self.x,self.y),(end_x,end_y),4)
+        return line_rect.union(pygame.draw.circle(screen,(255,0,0),(self.x,self.y),6))
 
 # ======== ScoreDisplay ========
 class ScoreDisplay:
     def __init__(self)->None:
         self.score:int=0
-        try:
-            self.font=pygame.font.Font(ASSET_PATHS['font'],50)
-        except:
-            print("픽셀 폰트 로드 실패. 기본 폰트로 대체합니다.")
-            self.font=pygame.font.Font(None,50)
+        self.font=get_font(ASSET_PATHS['font'],50)
 
     def add(self,points:int)->None:
         self.score+=points
 
-    def draw(self,screen:pygame.Surface,level:int)->None:
-        score_txt=self.font.render(f'SCORE : {self.score}',True,(0,0,0))
-        level_txt=self.font.render(f'LEVEL : {level}',True,(0,0,0))
-        screen.blit(score_txt,(30,30))
-        screen.blit(level_txt,(30,80))
+    def draw(self,screen:pygame.Surface,level:int)->List[pygame.Rect]:
+        score_txt=render_text(self.font,f'SCORE : {self.score}',(0,0,0))
+        level_txt=render_text(self.font,f'LEVEL : {level}',(0,0,0))
+        return [screen.blit(score_txt,(30,30)),screen.blit(level_txt,(30,80))]
 
 # ======== Game ========
 class Game:
+    """Simulator 위에서 입력 변환, 렌더링, 사운드만 담당하는 어댑터."""
     def __init__(self)->None:
         self.screen:pygame.Surface=pygame.display.set_mode((SCREEN_WIDTH,SCREEN_HEIGHT))
         pygame.display.set_caption("Bubble Pop (K-Univ. Edition)")
         self.clock:pygame.time.Clock=pygame.time.Clock()
+        self.running:bool=True
 
-        map_pixel_width=(MAP_COLS*CELL_SIZE)+(CELL_SIZE//2)
-        self.grid_x_offset=((SCREEN_WIDTH-map_pixel_width)//2)+int(25*SCALE)
-        self.grid_y_offset=int(30*SCALE)
-
-        padding=int(10*SCALE)
-        game_area_w=map_pixel_width+(padding*2)
-        game_area_h=SCREEN_HEIGHT-self.grid_y_offset
-        game_area_x=(SCREEN_WIDTH-game_area_w)//2
-        game_area_y=self.grid_y_offset-padding
-        self.game_rect=pygame.Rect(game_area_x,game_area_y,game_area_w,game_area_h)
-
-        self.grid:HexGrid=HexGrid(MAP_ROWS,MAP_COLS,CELL_SIZE,
-                                  0,
-                                  self.grid_x_offset,self.grid_y_offset)
-
-        cannon_x=self.game_rect.centerx
-        cannon_y=self.game_rect.bottom-int(170*SCALE)
-        self.cannon:Cannon=Cannon(cannon_x,cannon_y)
-
-        self.game_over_line=self.cannon.y-CELL_SIZE*0.5
+        # 에셋 디코딩과 첫 스테이지 파싱은 워커 스레드에서 하고 그동안 로딩 화면 표시
+        self.loader:StageLoader=StageLoader()
+        self.wait_with_loading_screen(self.loader.submit(preload_assets))
+        first_stage=self.loader.request(0)
+        self.watcher:StageWatcher=StageWatcher(self.loader.catalog)
+        self.watcher.start()
+
+        self.seed:int=new_seed()
+        self.sim:Simulator=Simulator(instant_resolve=INSTANT_RESOLVE,seed=self.seed)
+        self.grid:HexGrid=self.sim.grid
+        self.recorder:ReplayRecorder=ReplayRecorder(self.seed,INSTANT_RESOLVE)
+        self.sound_rng:random.Random=random.Random(self.seed)
+            # 효과음 고르기용 (판 진행 난수와 따로 둠)
+        self.game_rect=pygame.Rect(*self.sim.game_area)
+
+        self.cannon:Cannon=Cannon(self.sim.cannon_x,self.sim.cannon_y)
+        self.solver:Solver=Solver.for_sim(self.sim,min_angle=self.cannon.min_angle,
+                                          max_angle=self.cannon.max_angle)
+        self.show_hint:bool=False
+            # H 키/HINT 버튼: 봇이 고른 궤적 표시
+        self.autoplay:bool=False
+            # A 키: 봇이 대신 쏨 (입력은 sim.step()으로 넣으므로 리플레이에도 남음)
+        self.autoplay_at:int=0
+            # 자동 플레이 다음 발사 가능 시각 (ms)
+        self.hint_move:Optional[Move]=None
+            # 봇이 고른 발사. update()에서 프레임마다 SOLVER_FRAME_BUDGET_MS만큼만 풀고, 다 풀리기 전엔 None
+
+        self.game_over_line=self.sim.game_over_line
         self.score_ui:ScoreDisplay=ScoreDisplay()
 
         try:
-            self.background_image=pygame.image.load(ASSET_PATHS['background']).convert()
-            self.background_image=pygame.transform.scale(self.background_image,(SCREEN_WIDTH,SCREEN_HEIGHT))
-
-            self.char_left=pygame.image.load(ASSET_PATHS['char_left']).convert_alpha()
-            self.char_right=pygame.image.load(ASSET_PATHS['char_right']).convert_alpha()
-            self.logo=pygame.image.load(ASSET_PATHS['logo']).convert_alpha()
+            self.background_image=ASSETS.image(
+                ASSET_PATHS['background'],(SCREEN_WIDTH,SCREEN_HEIGHT),alpha=False,smooth=False
+            )
 
             # SCALE 적용하여 화면 크기에 따라 조정
-            self.char_left=pygame.transform.smoothscale(self.char_left,(int(313*SCALE),int(546*SCALE)))
-            self.char_right=pygame.transform.smoothscale(self.char_right,(int(308*SCALE),int(555*SCALE)))
-            self.logo=pygame.transform.smoothscale(self.logo,(int(176*SCALE),int(176*SCALE)))
+            self.char_left=ASSETS.image(ASSET_PATHS['char_left'],(int(313*SCALE),int(546*SCALE)))
+            self.char_right=ASSETS.image(ASSET_PATHS['char_right'],(int(308*SCALE),int(555*SCALE)))
+            self.logo=ASSETS.image(ASSET_PATHS['logo'],(int(176*SCALE),int(176*SCALE)))
 
-        except pygame.error as e:
+        except (pygame.error,FileNotFoundError) as e:
             print(f"배경/UI 이미지 로드 실패: {e}")
             self.background_image=None
             self.char_left=None
             self.char_right=None
             self.logo=None
 
-        try:
-            pygame.mixer.music.load(ASSET_PATHS['bgm'])
-            pygame.mixer.music.set_volume(0.1)
-            pygame.mixer.music.play(-1)
-            print("BGM 재생 시작")
-        except pygame.error as e:
-            print(f"BGM 로드 실패: {e}")
+        self.play_bgm()
 
         self.pop_sounds=[]
         for sound_path in ASSET_PATHS['pop_sounds']:
             try:
-                sound=pygame.mixer.Sound(sound_path)
-                sound.set_volume(POP_SOUND_VOLUME)
-                self.pop_sounds.append(sound)
-            except pygame.error as e:
+                self.pop_sounds.append(ASSETS.sound(sound_path,POP_SOUND_VOLUME))
+            except (pygame.error,FileNotFoundError) as e:
                 print(f"효과음 로드 실패: {sound_path} - {e}")
 
         if not self.pop_sounds:
             print("경고: 효과음 파일을 찾을 수 없습니다.")
 
         try:
-            self.tap_sound=pygame.mixer.Sound(ASSET_PATHS['tap_sound'])
-            self.tap_sound.set_volume(TAP_SOUND_VOLUME)
-        except pygame.error as e:
+            self.tap_sound=ASSETS.sound(ASSET_PATHS['tap_sound'],TAP_SOUND_VOLUME)
+        except (pygame.error,FileNotFoundError) as e:
             print(f"tap 효과음 로드 실패: {ASSET_PATHS['tap_sound']} - {e}")
             self.tap_sound=None
 
         self.current_stage:int=0
-        self.current_bubble:Optional[Bubble]=None
-        self.next_bubble:Optional[Bubble]=None
-        self.fire_in_air:bool=False
-        self.fire_count:int=0
-        self.running:bool=True
-        # --- 특수 아이템 개수 설정 (임시: 테스트용) ---
-        self.item_swap_count:int=3
-            # 버블 스왑 아이템 개수
-        self.item_raise_count:int=3
-            # 벽 한 줄 올리기 아이템 개수
-        self.item_rainbow_count:int=3
-            # 무지개 버블 아이템 개수
-        # ------------------------------------------
-
-        # --- 요청 플래그만 추가 (임시: 테스트용) ---
-            # 플래그 방식 안 쓸 예정.
+        self.clear_started:Optional[int]=None
+            # 스테이지 클리어 연출 시작 시각 (ms). None이면 플레이 중
+        self.clear_backdrop:Optional[pygame.Surface]=None
+            # 클리어 순간의 화면 (연출 배경)
+        self.clear_overlay:Optional[pygame.Surface]=None
+            # 클리어 연출의 검은 덮개 (한 번 만들고 매 프레임 알파만 바꿈)
+
+        # 레이어 렌더러 상태
+        self.static_layer:Optional[pygame.Surface]=None
+            # 배경, 게임 영역, 캐릭터, 로고, 붙어있는 버블을 미리 그려둔 화면
+        self.static_version:int=-1
+            # static_layer를 그릴 때의 grid.version
+        self.wall_shown:float=0
+            # 화면에 보이는 벽 위치. 벽이 움직이면 grid.wall_offset 쪽으로 조금씩 따라감
+        self.static_wall:int=-1
+            # static_layer를 그릴 때의 벽 위치
+        self.prev_dirty:List[pygame.Rect]=[]
+            # 지난 프레임에 동적 요소를 그린 영역 (다음 프레임에 static_layer로 지움)
+        self.full_redraw:bool=True
+            # 다음 프레임은 화면 전체를 다시 보냄
 
         # FIXME: UI용 폰트
-        self.ui_font=pygame.font.SysFont('malgungothic',20)
+        self.ui_font=get_sys_font('malgungothic',20)
 
         # 아이템 이미지 로드 (SCALE 적용)
         self.item_images = {}
         item_size = (int(80*SCALE), int(80*SCALE))  # 버튼 크기에 맞춤
-        
+
         try:
-            swap_img = pygame.image.load(ASSET_PATHS['item_swap']).convert_alpha()
-            self.item_images['swap'] = pygame.transform.smoothscale(swap_img, item_size)
+            self.item_images['swap'] = ASSETS.image(ASSET_PATHS['item_swap'], item_size)
         except (pygame.error, FileNotFoundError) as e:
             print(f"SWAP 아이템 이미지 로드 실패: {e}")
             self.item_images['swap'] = None
-        
+
         try:
-            raise_img = pygame.image.load(ASSET_PATHS['item_raise']).convert_alpha()
-            self.item_images['raise'] = pygame.transform.smoothscale(raise_img, item_size)
+            self.item_images['raise'] = ASSETS.image(ASSET_PATHS['item_raise'], item_size)
         except (pygame.error, FileNotFoundError) as e:
             print(f"RAISE 아이템 이미지 로드 실패: {e}")
             self.item_images['raise'] = None
-        
+
         try:
-            rainbow_img = pygame.image.load(ASSET_PATHS['item_rainbow']).convert_alpha()
-            self.item_images['rainbow'] = pygame.transform.smoothscale(rainbow_img, item_size)
+            self.item_images['rainbow'] = ASSETS.image(ASSET_PATHS['item_rainbow'], item_size)
         except (pygame.error, FileNotFoundError) as e:
             print(f"RAINBOW 아이템 이미지 로드 실패: {e}")
             self.item_images['rainbow'] = None
@@ -549,51 +376,99 @@ class Game:
         # 아이템 버튼 초기화
         self.init_item_buttons()
 
-        self.load_stage(self.current_stage)
+        self.apply_stage(self.wait_with_loading_screen(first_stage))
+        self.loader.request(self.current_stage+1)
+            # 다음 스테이지는 플레이하는 동안 미리 읽어 둠
 
-    def load_stage(self,stage_index:int)->None:
-        stage_map=load_stage_from_csv(stage_index)
-
-        if not stage_map or all(all(cell=='.' for cell in row) for row in stage_map):
-            next_csv_path=f'assets/map_data/stage{stage_index+2}.csv'
-            if not os.path.exists(next_csv_path):
-                self.running=False
-                return
-
-        self.grid.wall_offset=0
-        self.grid.y_offset=self.grid_y_offset
-
-        self.grid.load_from_stage(stage_map)
+    def play_bgm(self)->None:
+        try:
+            pygame.mixer.music.load(ASSET_PATHS['bgm'])
+            pygame.mixer.music.set_volume(0.1)
+            pygame.mixer.music.play(-1)
+            print("BGM 재생 시작")
+        except pygame.error as e:
+            print(f"BGM 로드 실패: {e}")
 
-        self.current_bubble=None
-        self.next_bubble=None
-        self.fire_in_air=False
-        self.fire_count=0
+    def reset(self)->None:
+        """새 게임 상태로 되돌림 (씬을 재사용할 때 호출). 에셋은 다시 로드하지 않음."""
+        self.screen=pygame.display.get_surface()
+            # 다른 씬이 set_mode를 다시 불렀을 수 있으므로
+        pygame.display.set_caption("Bubble Pop (K-Univ. Edition)")
 
-        self.prepare_bubbles()
+        self.seed=new_seed()
+        self.sim=Simulator(instant_resolve=INSTANT_RESOLVE,seed=self.seed)
+        self.grid=self.sim.grid
+        self.recorder=ReplayRecorder(self.seed,INSTANT_RESOLVE)
+        self.sound_rng=random.Random(self.seed)
+        self.cannon.angle=self.sim.cannon_angle
+        self.solver=Solver.for_sim(self.sim,min_angle=self.cannon.min_angle,
+                                   max_angle=self.cannon.max_angle)
+        self.autoplay=False
+        self.hint_move=None
+        self.score_ui.score=0
+        self.current_stage=0
+        self.running=True
+        self.clear_started=None
+        self.clear_backdrop=None
+        for item_type in self.item_button_pressed_until:
+            self.item_button_pressed_until[item_type]=0
+
+        self.static_version=-1
+        self.prev_dirty=[]
+        self.full_redraw=True
+
+        self.play_bgm()
+        self.loader.sync()
+            # 에디터에서 바뀐 스테이지 파일만 다시 읽음
+        self.watcher.start()
+        self.apply_stage(self.wait_with_loading_screen(self.loader.request(0)))
+        self.loader.request(self.current_stage+1)
+
+    def wait_with_loading_screen(self,future):
+        """워커 작업이 끝날 때까지 이벤트를 처리하면서 로딩 화면을 그림. 작업 결과 반환함."""
+        if not future.done():
+            font=get_font(ASSET_PATHS['font'],50)
+            text=render_text(font,'LOADING...',(255,255,255))
+            rect=text.get_rect(center=(SCREEN_WIDTH//2,SCREEN_HEIGHT//2))
+            while not future.done():
+                for event in pygame.event.get():
+                    if event.type==pygame.QUIT:
+                        self.running=False
+                self.screen.fill((0,0,0))
+                self.screen.blit(text,rect)
+                pygame.display.flip()
+                self.clock.tick(FPS)
+            self.full_redraw=True
+        return future.result()
+
+    def apply_stage(self,loaded:LoadedStage)->None:
+        """워커가 준비한 스테이지를 시뮬레이터에 올림."""
+        self.load_stage(loaded.index,loaded.stage_map)
+        self.wall_shown=self.grid.wall_offset
+            # 새 판은 연출 없이 바로 제자리
+
+    def reload_stage_files(self,snapshot:Snapshot)->None:
+        """감시 스레드가 알려 준 파일 변경 반영함. 지금 스테이지가 바뀌었으면 그 자리에서 다시 올림."""
+        changed=self.loader.sync(snapshot)
+        if not changed:
+            return
+        print(f"스테이지 파일 변경: {', '.join(str(i+1) for i in changed)}")
+        if self.current_stage in changed and self.loader.catalog.exists(self.current_stage):
+            self.apply_stage(self.wait_with_loading_screen(self.loader.request(self.current_stage)))
+                # 점수는 유지, 판은 새 맵으로 다시 시작
+        self.loader.request(self.current_stage+1)
 
-    def random_color_from_map(self)->str:
-        colors=set()
-        for bubble in self.grid.bubble_list:
-            if bubble.color in COLORS:
-                colors.add(bubble.color)
-        if not colors:
-            colors=set(COLORS.keys())
-        return random.choice(list(colors))
+    def load_stage(self,stage_index:int,stage_map:Optional[List[List[str]]]=None)->None:
+        if stage_map is None:
+            stage_map=load_stage_from_csv(stage_index)
 
-    def create_bubble(self)->Bubble:
-        color=self.random_color_from_map()
-        b=Bubble(self.cannon.x,self.cannon.y,color)
-        return b
+        if not stage_map or all(all(cell=='.' for cell in row) for row in stage_map):
+            if not self.loader.catalog.exists(stage_index+1):
+                self.running=False
+                return
 
-    def prepare_bubbles(self)->None:
-        if self.next_bubble is not None:
-            self.current_bubble=self.next_bubble
-        else:
-            self.current_bubble=self.create_bubble()
-        self.current_bubble.x,self.current_bubble.y=self.cannon.x,self.cannon.y
-        self.current_bubble.in_air=False
-        self.next_bubble=self.create_bubble()
+        self.recorder.stage(stage_index,stage_map)
+        self.sim.load_stage(stage_map)
 
     def init_item_buttons(self)->None:
         # SCALE 적용
@@ -611,6 +486,9 @@ class Game:
              'rect': pygame.Rect(x, y0 + 2*(btn_h+padding), btn_w, btn_h)},
         ]
 
+        # 힌트 버튼 (아이템 버튼 아래, 수량 없음)
+        self.hint_button=pygame.Rect(x, y0 + 3*(btn_h+padding), btn_w, btn_h)
+
         # 버튼 눌림 연출용 타이머 구현 (ms 단위로)
         self.item_button_pressed_until={
             'swap':0,
@@ -618,38 +496,37 @@ class Game:
             'rainbow':0,
         }
 
-    def handle_mouse_click(self,pos:Tuple[int,int])->None:
+    def handle_mouse_click(self,pos:Tuple[int,int])->Optional[Action]:
         mx,my=pos
+        if self.hint_button.collidepoint(mx,my):
+            self.show_hint=not self.show_hint
+            return None
         for btn in self.item_buttons:
             if btn['rect'].collidepoint(mx,my):
-                self.handle_item_button_click(btn['type'])
-                break
+                return self.handle_item_button_click(btn['type'])
+        return None
 
-    def handle_item_button_click(self,item_type:str)->None:
+    def handle_item_button_click(self,item_type:str)->Optional[Action]:
+        """아이템 버튼 클릭 처리함. 쓸 수 있으면 이번 프레임에 넣을 입력 반환함."""
         # 아이템 수량 0개면 그냥 무시
-        if item_type=='swap' and self.item_swap_count<=0:
+        if item_type=='swap' and self.sim.item_swap_count<=0:
             print("No SWAP items left.")
-            return
-        if item_type=='raise' and self.item_raise_count<=0:
+            return None
+        if item_type=='raise' and self.sim.item_raise_count<=0:
             print("No RAISE items left.")
-            return
-        if item_type=='rainbow' and self.item_rainbow_count<=0:
+            return None
+        if item_type=='rainbow' and self.sim.item_rainbow_count<=0:
             print("No RAINBOW items left.")
-            return
-
-        # 로직 적용 (UI 클릭하면 그 순간 바로 효과 반영함)
-        if item_type=='swap':
-            self.use_item_swap()
-        elif item_type=='raise':
-            self.use_item_raise()
-        elif item_type=='rainbow':
-            self.use_item_rainbow()
+            return None
 
         # 버튼 눌림 연출용 타이머 설정 (120ms 정도 유지)
         now=pygame.time.get_ticks()
         self.item_button_pressed_until[item_type]=now+120
 
-    def draw_item_buttons(self,screen:pygame.Surface)->None:
+        # 로직은 키보드 입력과 같이 이번 프레임 sim.step()에서 적용함 (리플레이에 남도록)
+        return {'swap':Action.SWAP,'raise':Action.RAISE,'rainbow':Action.RAINBOW}.get(item_type)
+
+    def draw_item_buttons(self,screen:pygame.Surface)->List[pygame.Rect]:
         now=pygame.time.get_ticks()
 
         for btn in self.item_buttons:
@@ -659,28 +536,28 @@ class Game:
 
             # 아이템 이미지가 있으면 이미지 사용, 없으면 기존 방식
             item_img = self.item_images.get(item_type)
-            
+
             if item_img:
                 # 이미지 표시
                 screen.blit(item_img, rect)
-                
+
                 # 눌림 효과: 테두리 강조
                 border_color = (255, 255, 100) if pressed else (220, 220, 220)
                 border_w = 4 if pressed else 2
                 pygame.draw.rect(screen, border_color, rect, border_w)
-                
+
                 # 남은 개수 표시 (이미지 위에)
                 if item_type=='swap':
-                    cnt=self.item_swap_count
+                    cnt=self.sim.item_swap_count
                 elif item_type=='raise':
-                    cnt=self.item_raise_count
+                    cnt=self.sim.item_raise_count
                 else: # rainbow
-                    cnt=self.item_rainbow_count
-                
+                    cnt=self.sim.item_rainbow_count
+
                 # 개수를 오른쪽 하단에 표시
-                cnt_surf=self.ui_font.render(str(cnt),True,(255,255,0))
+                cnt_surf=render_text(self.ui_font,str(cnt),(255,255,0))
                 cnt_rect=cnt_surf.get_rect(bottomright=(rect.right-5, rect.bottom-5))
-                
+
                 # 개수 배경 (가독성 향상)
                 bg_rect = cnt_rect.inflate(4, 4)
                 pygame.draw.rect(screen, (0, 0, 0), bg_rect)
@@ -694,344 +571,335 @@ class Game:
                 # 라벨 + 남은 개수
                 if item_type=='swap':
                     label='SWAP'
-                    cnt=self.item_swap_count
+                    cnt=self.sim.item_swap_count
                 elif item_type=='raise':
                     label='RAISE'
-                    cnt=self.item_raise_count
+                    cnt=self.sim.item_raise_count
                 else: # rainbow
                     label='RAIN'
-                    cnt=self.item_rainbow_count
+                    cnt=self.sim.item_rainbow_count
 
-                text_surf=self.ui_font.render(label,True,(255,255,255))
+                text_surf=render_text(self.ui_font,label,(255,255,255))
                 text_rect=text_surf.get_rect(center=(rect.centerx,rect.centery-14))
                 screen.blit(text_surf,text_rect)
 
-                cnt_surf=self.ui_font.render(str(cnt),True,(255,255,0))
+                cnt_surf=render_text(self.ui_font,str(cnt),(255,255,0))
                 cnt_rect=cnt_surf.get_rect(center=(rect.centerx,rect.centery+18))
                 screen.blit(cnt_surf,cnt_rect)
 
-    def process_collision_and_attach(self)->bool:
-        if self.current_bubble is None:
-            return False
-
-        if self.current_bubble.y-self.current_bubble.radius<=(
-            self.grid.y_offset+self.grid.wall_offset
-        ):
-            r,c=self.grid.nearest_grid_to_point(self.current_bubble.x,self.current_bubble.y)
-            r=0
-            self.grid.place_bubble(self.current_bubble,r,c)
-
-            popped_count=self.pop_if_match(r,c)
-            if popped_count==0:
-                if hasattr(self,'tap_sound') and self.tap_sound:
-                    try:
-                        self.tap_sound.play()
-                    except:
-                        pass
-            return True
-
-        for b in self.grid.bubble_list:
-            dist=math.hypot(self.current_bubble.x-b.x,self.current_bubble.y-b.y)
-            if dist<=self.current_bubble.radius+b.radius-2:
-                r,c=self.grid.nearest_grid_to_point(self.current_bubble.x,self.current_bubble.y)
-                self.grid.place_bubble(self.current_bubble,r,c)
-
-                popped_count=self.pop_if_match(r,c)
-                if popped_count==0:
-                    if hasattr(self,'tap_sound') and self.tap_sound:
-                        try:
-                            self.tap_sound.play()
-                        except:
-                            pass
-                return True
-
-        # 장애물 충돌 검사
-        for ob in self.grid.obs_list:
-            dist=math.hypot(self.current_bubble.x-ob.x,self.current_bubble.y-ob.y)
-            if dist<=self.current_bubble.radius+ob.radius-2:
-                r,c=self.grid.nearest_grid_to_point(self.current_bubble.x,self.current_bubble.y)
-                self.grid.place_bubble(self.current_bubble,r,c)
-
-                # 장애물 근처에 붙어도 매칭 체크는 해야 함
-                popped_count=self.pop_if_match(r,c)
-                if popped_count==0:
-                    if hasattr(self,'tap_sound') and self.tap_sound:
-                        try:
-                            self.tap_sound.play()
-                        except:
-                            pass
-
-                return True
-
-        return False
-
-    def pop_if_match(self,row:int,col:int)->int:
-        if self.current_bubble is None:
-            return 0
-
-        if not self.grid.is_in_bounds(row,col):
-            return 0
-
-        color=self.grid.map[row][col]
-        if color not in COLORS:
-            return 0
-
-        visited=set()
-        self.grid.dfs_same_color(row,col,color,visited)
-
-        if len(visited)>=3:
-            self.grid.remove_cells(visited)
-            self.grid.remove_hanging()
-            self.score_ui.add(len(visited)*10)
-
+        # 힌트 버튼 (켜져 있으면 테두리 강조)
+        rect=self.hint_button
+        pygame.draw.rect(screen,(30,30,30),rect)
+        border_color=(255,255,100) if self.show_hint else (220,220,220)
+        pygame.draw.rect(screen,border_color,rect,4 if self.show_hint else 2)
+        text_surf=render_text(self.ui_font,'HINT',(255,255,255))
+        screen.blit(text_surf,text_surf.get_rect(center=(rect.centerx,rect.centery-14)))
+        state_surf=render_text(self.ui_font,'AUTO' if self.autoplay else ('ON' if self.show_hint else 'OFF'),
+                               (255,255,0))
+        screen.blit(state_surf,state_surf.get_rect(center=(rect.centerx,rect.centery+18)))
+
+        return [btn['rect'] for btn in self.item_buttons]+[self.hint_button]
+
+    def play_shot_sound(self,result:ShotResult)->None:
+        """착지 결과에 맞는 효과음 재생 (터지면 pop, 아니면 tap)."""
+        if result.popped>0:
             if hasattr(self,'pop_sounds') and self.pop_sounds:
-                random_sound=random.choice(self.pop_sounds)
+                random_sound=self.sound_rng.choice(self.pop_sounds)
                 try:
                     random_sound.play()
                 except:
                     pass
-
-            return len(visited)
-        return 0
+        else:
+            if hasattr(self,'tap_sound') and self.tap_sound:
+                try:
+                    self.tap_sound.play()
+                except:
+                    pass
 
     def update(self)->None:
+        if self.clear_started is not None:
+            self.update_stage_clear()
+            return
+
+        snapshot=self.watcher.poll()
+        if snapshot is not None:
+            self.reload_stage_files(snapshot)
+
+        actions=[]
         for event in pygame.event.get():
             if event.type==pygame.QUIT:
                 self.running=False
             elif event.type==pygame.KEYDOWN:
                 if event.key==pygame.K_SPACE:
-                    if self.current_bubble and not self.fire_in_air:
-                        self.fire_in_air=True
-                        self.current_bubble.in_air=True
-                        self.current_bubble.set_angle(self.cannon.angle)
+                    actions.append(Action.FIRE)
                 # --- 특수 아이템 테스트용 단축키 ---
                 # FIXME: 키보드 1/2/3 --> 바로 아이템 사용
                 # FIXME: 마우스 왼쪽 버튼 클릭 --> handle_mouse_click() 호출
                     # --> 버튼 클릭하면 아이템 사용
                 elif event.key==pygame.K_1:
-                    self.use_item_swap()
+                    actions.append(Action.SWAP)
                 elif event.key==pygame.K_2:
-                    self.use_item_raise()
+                    actions.append(Action.RAISE)
                 elif event.key==pygame.K_3:
-                    self.use_item_rainbow()
+                    actions.append(Action.RAINBOW)
+                elif event.key==pygame.K_h:
+                    self.show_hint=not self.show_hint
+                elif event.key==pygame.K_a:
+                    self.autoplay=not self.autoplay
 
             elif event.type==pygame.MOUSEBUTTONDOWN and event.button==1:
-                self.handle_mouse_click(event.pos)
+                action=self.handle_mouse_click(event.pos)
+                if action is not None:
+                    actions.append(action)
+            elif event.type in (pygame.VIDEOEXPOSE,pygame.WINDOWEXPOSED):
+                self.full_redraw=True
+                    # 창이 가려졌다 보이면 화면 전체 다시 보냄
 
 
         keys=pygame.key.get_pressed()
         if keys[pygame.K_LEFT]:
-            self.cannon.rotate(+self.cannon.angle_speed)
+            actions.append(Action.LEFT)
         if keys[pygame.K_RIGHT]:
-            self.cannon.rotate(-self.cannon.angle_speed)
-
-        if self.current_bubble and self.fire_in_air:
-            self.current_bubble.move()
-
-            if self.current_bubble.y<-BUBBLE_RADIUS:
-                self.fire_in_air=False
-                self.prepare_bubbles()
-                return
-            # --- 특수 아이템 플래그 처리(임시) ---
-            # 플래그 방식 안 쓸 예정이라 지움.
-            # AttributeError 터질 것 같음.
-            # --------------------------
-            if self.process_collision_and_attach():
-                self.fire_count+=1
-                if self.fire_count>=LAUNCH_COOLDOWN:
-                    self.grid.drop_wall()
-                    self.fire_count=0
-                self.current_bubble=None
-                self.fire_in_air=False
-                self.prepare_bubbles()
-
-        if self.is_stage_cleared():
-            self.show_stage_clear()
-            self.current_stage+=1
-            next_csv_path=f'assets/map_data/stage{self.current_stage+1}.csv'
-            if not os.path.exists(next_csv_path):
-                self.running=False
-                print("All stages cleared!")
-            else:
-                self.load_stage(self.current_stage)
+            actions.append(Action.RIGHT)
+
+        if self.autoplay and Action.FIRE not in actions:
+            self.autoplay_shot(actions)
+
+        self.recorder.record(self.sim,actions)
+        result=self.sim.step(*actions)
+        if result is not None:
+            self.play_shot_sound(result)
+            self.autoplay_at=pygame.time.get_ticks()+AUTOPLAY_SHOT_DELAY
+        self.score_ui.score=self.sim.score
+        self.animate_wall()
+        self.update_solver()
+
+        if self.sim.is_stage_cleared():
+            self.begin_stage_clear()
+            return
 
-        if self.lowest_bubble_bottom()>self.game_over_line:
+        if self.sim.is_game_over():
             self.running=False
             print("Game Over")
 
-    def is_stage_cleared(self)->bool:
-        for r in range(self.grid.rows):
-            if r>=len(self.grid.map):
-                continue
-            for c in range(self.grid.cols):
-                if c>=len(self.grid.map[r]):
-                    continue
-                if self.grid.map[r][c] in COLORS:
-                    return False
-        return True
-
-    def lowest_bubble_bottom(self)->int:
-        if not self.grid.bubble_list:
-            return 0
-        bottoms=[b.y+b.radius for b in self.grid.bubble_list]
-        return int(max(bottoms))
-
-    def use_item_swap(self)->None:
-        """현재 버블과 다음 버블 스왑함.
+    def update_solver(self)->None:
+        """힌트나 자동 플레이가 켜져 있으면 봇 풀이를 이번 프레임 몫만큼 진행함.
+
+        한 번에 다 풀면 프레임이 밀리므로 Solver가 하던 걸 남겨두고 다음 프레임에 이어서 풂.
         """
-        if self.item_swap_count<=0:
-            print("No SWAP items left.")
-            return
-        if self.current_bubble is None or self.next_bubble is None:
-            print("Cannot swap: one of the bubbles is missing.")
+        if not (self.show_hint or self.autoplay):
+            self.hint_move=None
             return
+        self.hint_move=self.solver.suggest(self.sim,SOLVER_FRAME_BUDGET_MS)
 
-        self.current_bubble.color,self.next_bubble.color\
-            =self.next_bubble.color,self.current_bubble.color
+    def autoplay_shot(self,actions:List[Action])->None:
+        """쏠 수 있으면 봇이 고른 각도로 돌리고 FIRE를 넣음. 각도는 기록 직전에 바꾸므로 리플레이에 남음.
 
-        self.item_swap_count-=1
-        print(f"SWAP used. Remaining: {self.item_swap_count}")
-
-    def use_item_raise(self)->None:
-        """벽을 한 줄 올림.
+        FIRE는 맨 앞에 넣음 (step()은 입력 순서대로 처리하므로 방향키가 눌려 있어도 돌기 전에 쏨).
         """
-        if self.item_raise_count<=0:
-            print("No RAISE items left.")
+        if pygame.time.get_ticks()<self.autoplay_at:
             return
-
-        # HexGrid에 위임
-        before_offset=self.grid.wall_offset
-        self.grid.raise_wall()
-
-        if self.grid.wall_offset==before_offset:
-            print("Cannot RAISE: wall is already at the top.")
+        move=self.solver.suggest(self.sim,0)
+            # 지금 상태로 다 풀린 결과만 받음 (아직 푸는 중이면 None, 이어서 푸는 건 update_solver())
+        if move is None:
             return
+        self.sim.cannon_angle=move.angle
+        actions.insert(0,Action.FIRE)
 
-        self.item_raise_count-=1
-        print(f"RAISE used. Remaining: {self.item_raise_count}")
+    def draw_hint(self,screen:pygame.Surface)->List[pygame.Rect]:
+        """update_solver()가 구해둔 궤적과 붙을 셀 그림. 여기서는 풀지 않음.
 
-    def best_color_for_rainbow(self)->str:
-        """현재 맵에서 가장 많이 남아있는 색 선택함.
-
-        Returns:
-            str: 가장 많이 등장한 색을 반환
+        궤적이 실제 벽 위치(grid.wall_offset) 기준이므로 셀 원도 같은 기준으로 그림
+        (벽 내려오는 연출 중에도 궤적 끝과 원이 맞음).
         """
-        color_count:dict[str,int]={}
+        move=self.hint_move
+        if move is None or self.sim.fire_in_air:
+            return []
+        width=max(2,int(3*SCALE))
+        rects=[pygame.draw.lines(screen,(255,255,255),False,move.path,width)]
+        cx,cy=self.grid.get_cell_center(move.row,move.col)
+        rects.append(pygame.draw.circle(screen,(255,255,255),(int(cx),int(cy)),BUBBLE_RADIUS,width))
+        return rects
+
+    def animate_wall(self)->None:
+        """화면의 벽 위치를 실제 벽 위치로 한 프레임만큼 옮김 (벽 이동은 오프셋 하나라 매 프레임 다시 그려도 쌈)."""
+        target=self.grid.wall_offset
+        if self.wall_shown==target:
+            return
+        step=WALL_DROP_PIXELS*1000/(WALL_DROP_ANIM_MS*FPS) if WALL_DROP_ANIM_MS>0 else math.inf
+        if abs(target-self.wall_shown)<=step:
+            self.wall_shown=target
+        elif target>self.wall_shown:
+            self.wall_shown+=step
+        else:
+            self.wall_shown-=step
 
-        for b in self.grid.bubble_list:
-            if b.color in COLORS:
-                color_count[b.color]=color_count.get(b.color,0)+1
+    def begin_stage_clear(self)->None:
+        """클리어 연출 시작. 연출이 도는 동안 다음 스테이지는 워커가 준비함."""
+        self.clear_started=pygame.time.get_ticks()
+        self.clear_backdrop=self.screen.copy()
+        self.loader.request(self.current_stage+1)
 
-        # 맵 거의 비어있으면 그냥 랜덤 색
-        if not color_count:
-            return random.choice(list(COLORS.keys()))
-        # 가장 많이 등장한 색 반환함.
-        best=max(color_count,key=color_count.get)
-        return best
+    def update_stage_clear(self)->None:
+        """클리어 연출 중: 이벤트만 처리하고, 연출 시간이 지나고 로드가 끝나면 다음 스테이지로 넘어감."""
+        for event in pygame.event.get():
+            if event.type==pygame.QUIT:
+                self.running=False
+            elif event.type in (pygame.VIDEOEXPOSE,pygame.WINDOWEXPOSED):
+                self.full_redraw=True
 
-    def use_item_rainbow(self)->None:
-        """현재 버블을 최적의 색으로 변경함.
-        """
-        if self.item_rainbow_count<=0:
-            print("No RAINBOW items left.")
-            return
-        if self.current_bubble is None:
-            print("Cannot use RAINBOW: current bubble is missing.")
+        future=self.loader.request(self.current_stage+1)
+        if pygame.time.get_ticks()-self.clear_started<STAGE_CLEAR_DELAY or not future.done():
             return
 
-        # 변환 전 색상 저장
-        original_color = self.current_bubble.color
-        
-        # 최적 색상으로 변환
-        best_color = self.best_color_for_rainbow()
-        self.current_bubble.color = best_color
+        self.clear_started=None
+        self.clear_backdrop=None
+        self.full_redraw=True
+            # 오버레이 지우기 위해
+        self.current_stage+=1
+        loaded=future.result()
+        if not loaded.exists:
+            self.running=False
+            print("All stages cleared!")
+            return
+        self.apply_stage(loaded)
+        self.loader.request(self.current_stage+1)
 
-        self.item_rainbow_count -= 1
-        
-        # 변환 전후 색상 출력
-        print(f"🌈 RAINBOW: {original_color} → {best_color}")
-        print(f"RAINBOW used. Remaining: {self.item_rainbow_count}")
+    def build_static_layer(self)->None:
+        """그리드가 바뀌었을 때만 정적 레이어(배경~붙어있는 버블)를 다시 그림."""
+        if self.static_layer is None:
+            self.static_layer=pygame.Surface(self.screen.get_size()).convert()
+        layer=self.static_layer
 
-    def draw(self)->None:
         if self.background_image:
-            self.screen.blit(self.background_image,(0,0))
+            layer.blit(self.background_image,(0,0))
         else:
-            self.screen.fill((10,20,30))
+            layer.fill((10,20,30))
 
-        pygame.draw.rect(self.screen,(0,100,200),self.game_rect)
+        pygame.draw.rect(layer,(0,100,200),self.game_rect)
 
-        pygame.draw.line(self.screen,(0,255,3),
+        pygame.draw.line(layer,(0,255,3),
                          (self.game_rect.left,self.game_over_line),
                          (self.game_rect.right,self.game_over_line),10)
 
-        self.grid.draw(self.screen)
-        self.cannon.draw(self.screen)
-        if self.current_bubble:
-            self.current_bubble.draw(self.screen)
+        draw_grid(layer,self.grid,int(self.wall_shown))
 
         if self.char_left:
             char_left_x = self.game_rect.left - int(419*SCALE)
             char_left_y = SCREEN_HEIGHT - int(617*SCALE)
-            self.screen.blit(self.char_left,(char_left_x, char_left_y))
+            layer.blit(self.char_left,(char_left_x, char_left_y))
         if self.char_right:
             char_right_x = self.game_rect.right + int(80*SCALE)
             char_right_y = SCREEN_HEIGHT - int(617*SCALE)
-            self.screen.blit(self.char_right,(char_right_x, char_right_y))
+            layer.blit(self.char_right,(char_right_x, char_right_y))
         if self.logo:
             logo_x = SCREEN_WIDTH - int(198*SCALE)
             logo_y = int(18*SCALE)
-            self.screen.blit(self.logo,(logo_x, logo_y))
+            layer.blit(self.logo,(logo_x, logo_y))
 
-        if self.next_bubble:
+        self.static_version=self.grid.version
+        self.static_wall=int(self.wall_shown)
+        self.full_redraw=True
+
+    def draw(self)->None:
+        if self.clear_started is not None:
+            self.show_stage_clear()
+            return
+
+        if (self.static_layer is None or self.static_version!=self.grid.version
+                or self.static_wall!=int(self.wall_shown)):
+            self.build_static_layer()
+
+        # 지난 프레임의 동적 요소 자리를 정적 레이어로 덮어서 지움
+        if self.full_redraw:
+            self.screen.blit(self.static_layer,(0,0))
+        else:
+            for rect in self.prev_dirty:
+                self.screen.blit(self.static_layer,rect,rect)
+
+        # 동적 요소 (발사대, 날아가는 버블, NEXT, HUD)
+        dirty=[]
+        if self.show_hint:
+            dirty.extend(self.draw_hint(self.screen))
+        self.cannon.angle=self.sim.cannon_angle
+        dirty.append(self.cannon.draw(self.screen))
+        if self.sim.current_bubble:
+            dirty.append(draw_bubble(self.screen,self.sim.current_bubble))
+
+        next_bubble=self.sim.next_bubble
+        if next_bubble:
             # NEXT 버블 위치를 config.py 설정값 사용 (스케일 적용)
             next_x = int(NEXT_BUBBLE_X * SCALE)
             next_y_offset = int(NEXT_BUBBLE_Y_OFFSET * SCALE) if NEXT_BUBBLE_Y_OFFSET < 0 else int(NEXT_BUBBLE_Y_OFFSET * SCALE)
             next_y = SCREEN_HEIGHT + next_y_offset if NEXT_BUBBLE_Y_OFFSET < 0 else next_y_offset
 
-            try:
-                font_size = int(40 * SCALE)
-                font = pygame.font.Font(ASSET_PATHS['font'], font_size) if ASSET_PATHS['font'] else pygame.font.Font(None, font_size)
-            except:
-                font = pygame.font.Font(None, int(40 * SCALE))
-            next_txt = font.render("NEXT", True, (0,0,0))
+            font = get_font(ASSET_PATHS['font'] or None, int(40 * SCALE))
+            next_txt = render_text(font, "NEXT", (0,0,0))
             next_txt_offset_y = int(70 * SCALE)
             next_txt_rect = next_txt.get_rect(center=(next_x, next_y - next_txt_offset_y))
-            self.screen.blit(next_txt, next_txt_rect)
+            dirty.append(self.screen.blit(next_txt, next_txt_rect))
 
-            original_x, original_y = self.next_bubble.x, self.next_bubble.y
-            self.next_bubble.x, self.next_bubble.y = next_x, next_y
-            self.next_bubble.draw(self.screen)
-            self.next_bubble.x, self.next_bubble.y = original_x, original_y
+            original_x, original_y = next_bubble.x, next_bubble.y
+            next_bubble.x, next_bubble.y = next_x, next_y
+            dirty.append(draw_bubble(self.screen,next_bubble))
+            next_bubble.x, next_bubble.y = original_x, original_y
 
-        self.score_ui.draw(self.screen,self.current_stage+1)
+        dirty.extend(self.score_ui.draw(self.screen,self.current_stage+1))
 
-        self.draw_item_buttons(self.screen)
+        dirty.extend(self.draw_item_buttons(self.screen))
             # 아이템 버튼 그리기.
 
-        pygame.display.flip()
+        if self.full_redraw:
+            pygame.display.flip()
+            self.full_redraw=False
+        else:
+            pygame.display.update(self.prev_dirty+dirty)
+                # 지운 영역 + 새로 그린 영역만 화면에 보냄
+        self.prev_dirty=dirty
 
     def show_stage_clear(self)->None:
-        overlay=pygame.Surface((SCREEN_WIDTH,SCREEN_HEIGHT))
-        overlay.set_alpha(200)
-        overlay.fill((0,0,0))
-        self.screen.blit(overlay,(0,0))
-
-        font=pygame.font.Font(ASSET_PATHS['font'],120)
-        text=font.render('CLEAR!',True,(100,255,100))
+        """클리어 연출 한 프레임 그림 (오버레이가 서서히 어두워짐, 로드가 늦으면 LOADING 표시)."""
+        elapsed=pygame.time.get_ticks()-self.clear_started
+        progress=min(1.0,elapsed/max(1,STAGE_CLEAR_DELAY*0.3))
+
+        self.screen.blit(self.clear_backdrop,(0,0))
+        if self.clear_overlay is None:
+            self.clear_overlay=pygame.Surface((SCREEN_WIDTH,SCREEN_HEIGHT))
+            self.clear_overlay.fill((0,0,0))
+        self.clear_overlay.set_alpha(int(200*progress))
+        self.screen.blit(self.clear_overlay,(0,0))
+
+        font=get_font(ASSET_PATHS['font'],120)
+        text=render_text(font,'CLEAR!',(100,255,100))
         rect=text.get_rect(center=(SCREEN_WIDTH//2,SCREEN_HEIGHT//2))
         self.screen.blit(text,rect)
 
-        small_font=pygame.font.Font(ASSET_PATHS['font'],50)
-        info=small_font.render(
+        small_font=get_font(ASSET_PATHS['font'],50)
+        info=render_text(
+            small_font,
             f'Stage {self.current_stage+1} Complete.',
-            True,
             (200,200,200)
         )
         info_rect=info.get_rect(center=(SCREEN_WIDTH//2,SCREEN_HEIGHT//2+80))
         self.screen.blit(info,info_rect)
 
+        if elapsed>=STAGE_CLEAR_DELAY:
+            loading=render_text(small_font,'LOADING...',(200,200,200))
+            self.screen.blit(loading,loading.get_rect(center=(SCREEN_WIDTH//2,SCREEN_HEIGHT//2+150)))
+
         pygame.display.flip()
-        pygame.time.delay(1000)
+
+    def save_replay(self)->None:
+        """BUBBLE_POP_REPLAY가 있으면 이번 판 리플레이 저장함."""
+        path=os.environ.get(REPLAY_ENV)
+        if not path:
+            return
+        try:
+            saved=save_replay(self.recorder.finish(self.sim),path)
+        except OSError as e:
+            print(f"리플레이 저장 실패: {e}")
+            return
+        print(f"리플레이 저장: {saved} (seed {self.seed})")
 
     def run(self)->None:
         while self.running:
@@ -1039,18 +907,19 @@ class Game:
             self.update()
             self.draw()
 
+        self.watcher.stop()
         pygame.mixer.music.stop()
+        self.save_replay()
 
         self.screen.fill((0,0,0))
-        font=pygame.font.Font(ASSET_PATHS['font'],100)
+        font=get_font(ASSET_PATHS['font'],100)
 
-        next_csv_path=f'assets/map_data/stage{self.current_stage+1}.csv'
-        if not os.path.exists(next_csv_path):
+        if not self.loader.catalog.exists(self.current_stage):
             msg="you win."
         else:
             msg="game over."
 
-        txt=font.render(msg,True,(255,255,255))
+        txt=render_text(font,msg,(255,255,255))
         rect=txt.get_rect(center=(SCREEN_WIDTH//2,SCREEN_HEIGHT//2))
         self.screen.blit(txt,rect)
 
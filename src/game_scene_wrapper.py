@@ -1,13 +1,29 @@
-from game import Game
+from game import Game,preload_assets
 
 class GameSceneWrapper:
+    likely_next='menu'
+        # 게임이 끝나면 돌아갈 씬 (SceneManager가 미리 준비함)
+
     def __init__(self,manager):
         self.manager=manager
+        self.game=None
+
+    def enter(self):
+        # 처음엔 Game 생성, 다시 들어오면 에셋은 그대로 두고 게임 상태만 초기화
+        if self.game is None:
+            self.game=Game()
+        else:
+            self.game.reset()
 
     def run(self):
+        if self.game is None:
+            self.enter()
         # Game 내부에서 자체 루프 돌고 끝나면 run() 리턴됨
-        g=Game()
-        g.run()
+        self.game.run()
 
         # 게임 끝나고 나면 다시 메뉴로 돌아감
         return 'menu'
+
+def preload():
+    """SceneManager 백그라운드 준비용: 게임 씬 에셋 미리 디코딩."""
+    preload_assets()
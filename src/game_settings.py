@@ -1,6 +1,23 @@
 # UI, 게임 세부 설정
 UI_ALPHA = 180
 END_SCREEN_DELAY = 300
+STAGE_CLEAR_DELAY = 1000
+    # 스테이지 클리어 연출 최소 시간 (ms). 그동안 다음 스테이지를 백그라운드에서 준비
+STAGE_WATCH_INTERVAL = 500
+    # 스테이지 파일 변경 확인 간격 (ms). 게임 중에 바뀐 스테이지를 바로 다시 읽음. 0이면 끔
+WALL_DROP_ANIM_MS = 150
+    # 벽이 한 칸 내려가는(올라가는) 연출 시간 (ms). 0이면 바로 이동
+INSTANT_RESOLVE = False
+    # True면 발사 즉시 착지 (날아가는 연출 없이 궤적을 한 번에 계산)
+AUTOPLAY_SHOT_DELAY = 400
+    # 자동 플레이(A 키)에서 버블이 붙은 뒤 다음 발사까지 기다리는 시간 (ms)
+SOLVER_FRAME_BUDGET_MS = 4
+    # 힌트/자동 플레이 봇이 한 프레임에 풀이에 쓰는 시간 (ms). 못 끝내면 다음 프레임에 이어서 풂
+ARROW_ANGLE_STEP = 0.5
+    # 발사대 화살표 이미지를 미리 돌려 두는 각도 간격 (도). 조준 각도를 이 간격으로 반올림해서 그림
+    # (방향키는 90도에서 4도씩, 봇은 0.5도 간격이라 지금 설정에서는 그리는 각도와 실제 조준이 같음)
+ARROW_CACHE_SIZE = 64
+    # 돌려 둔 화살표 이미지를 들고 있을 최대 개수 (넘으면 가장 오래 안 쓴 각도부터 버림)
 
 # 사운드 볼륨 설정 (0.0-1.0)
 POP_SOUND_VOLUME = 0.3
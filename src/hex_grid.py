@@ -0,0 +1,552 @@
+import math
+    # 거리 계산 위해
+import csv
+    # CSV 파일 읽기 위해
+import heapq
+    # 천장 연결 복구 시 우선순위 큐
+from functools import lru_cache
+    # 이웃 표 캐시 위해
+from typing import Dict,FrozenSet,Iterable,List,Optional,Set,Tuple,Union
+
+from config import (
+    SCREEN_WIDTH,CELL_SIZE,BUBBLE_RADIUS,BUBBLE_SPEED,
+    WALL_DROP_PIXELS,MAP_ROWS,MAP_COLS
+)
+from color_settings import COLORS
+
+from obstacle import Obstacle
+
+# pygame 없이 import 가능한 순수 게임 모델 (Bubble, HexGrid, 스테이지 로드).
+# 렌더링은 game.py 쪽에서 담당함.
+
+# 행 홀짝별 6방향 이웃 오프셋 (dr,dc) - [0]: 짝수 행, [1]: 홀수 행
+NEIGHBOR_OFFSETS:Tuple[Tuple[Tuple[int,int],...],...]=(
+    ((0,-1),(-1,-1),(-1,0),(0,1),(1,0),(1,-1)),
+    ((0,-1),(-1,0),(-1,1),(0,1),(1,1),(1,0)),
+)
+
+NeighborTable=Tuple[Tuple[Tuple[Tuple[int,int],...],...],...]
+    # table[r][c] -> (r,c)의 범위 안 이웃 좌표들
+
+@lru_cache(maxsize=None)
+def build_neighbor_table(rows:int,cols:int,
+                         blocked:FrozenSet[Tuple[int,int]]=frozenset())->NeighborTable:
+    """셀마다 범위 안에 있는 이웃 좌표를 미리 계산한 표 반환함.
+
+    같은 크기의 그리드끼리 표를 공유함 (값이 바뀌지 않는 튜플이라 안전함).
+
+    Args:
+        rows (int): 행 개수.
+        cols (int): 열 개수.
+        blocked (FrozenSet[Tuple[int,int]]): 패딩 셀 ('/' 칸, 에디터의 홀수 행 마지막 칸 등).
+            다른 셀의 이웃에서는 빠짐. 패딩 셀 자신의 이웃은 그대로 둠
+            (패딩 셀 위에 떨어진 버블이 옆 빈 칸을 찾을 수 있도록).
+
+    Returns:
+        NeighborTable: table[r][c]로 이웃 좌표 튜플 조회
+    """
+    table=[]
+    for r in range(rows):
+        row=[]
+        for c in range(cols):
+            row.append(tuple(
+                (r+dr,c+dc) for dr,dc in NEIGHBOR_OFFSETS[r%2]
+                if 0<=r+dr<rows and 0<=c+dc<cols and (r+dr,c+dc) not in blocked
+            ))
+        table.append(tuple(row))
+    return tuple(table)
+
+# ======== 유틸리티 ========
+def clamp(v:float,lo:float,hi:float)->float:
+    return max(lo,min(hi,v))
+
+def side_walls(cols:int=MAP_COLS)->Tuple[int,int]:
+    """발사체가 반사되는 좌/우 벽의 x좌표 반환함."""
+    grid_x_start=(SCREEN_WIDTH-(cols*CELL_SIZE))//2
+    grid_x_end=grid_x_start+(cols*CELL_SIZE)
+    return grid_x_start,grid_x_end
+
+def load_stage_from_csv(stage_index:int,folder:str='assets/map_data')->List[List[str]]:
+    csv_path=f'{folder}/stage{stage_index+1}.csv'
+
+    stage_map=[]
+    try:
+        with open(csv_path,'r',encoding='utf-8') as f:
+            reader=csv.reader(f)
+            for row in reader:
+                map_row=[]
+                for cell in row:
+                    cell=cell.strip()
+                    if cell=='' or cell.upper()=='X':
+                        map_row.append('.')
+                    elif cell.upper()=='N':
+                        map_row.append('N')
+                    elif cell.upper() in COLORS:
+                        map_row.append(cell.upper())
+                    else:
+                        map_row.append('.')
+                while len(map_row)<MAP_COLS:
+                    map_row.append('.')
+                map_row=map_row[:MAP_COLS]
+                stage_map.append(map_row)
+
+        while len(stage_map)<MAP_ROWS:
+            stage_map.append(['.' for _ in range(MAP_COLS)])
+        stage_map=stage_map[:MAP_ROWS]
+
+        print(f"스테이지 {stage_index+1} 맵 데이터 로드 완료: {csv_path}")
+        return stage_map
+
+    except FileNotFoundError:
+        return [['.' for _ in range(MAP_COLS)] for _ in range(MAP_ROWS)]
+            # 빈 맵 반환 (로드 안 되면 빈 맵으로 처리)
+    except Exception as e:
+        print(f"오류: {csv_path} 파일을 읽는 중 오류가 발생했습니다: {e}")
+        return [['.' for _ in range(MAP_COLS)] for _ in range(MAP_ROWS)]
+
+# ======== Bubble ========
+class Bubble:
+    def __init__(self,x:float,y:float,color:str,radius:int=BUBBLE_RADIUS)->None:
+        self.x:float=x
+        self.y:float=y
+        self.color:str=color
+        self.radius:int=radius
+        self.in_air:bool=False
+        self.is_attached:bool=False
+        self.angle_degree:float=90
+        self.speed:int=BUBBLE_SPEED
+        self.row_idx:int=-1
+        self.col_idx:int=-1
+
+    def set_angle(self,angle_degree:float)->None:
+        self.angle_degree=angle_degree
+
+    def set_grid_index(self,r:int,c:int)->None:
+        self.row_idx=r
+        self.col_idx=c
+
+    def move(self)->None:
+        rad=math.radians(self.angle_degree)
+        dx=self.speed*math.cos(rad)
+        dy=-self.speed*math.sin(rad)
+        self.x+=dx
+        self.y+=dy
+
+        grid_x_start,grid_x_end=side_walls()
+
+        if self.x-self.radius<grid_x_start:
+            self.x=grid_x_start+self.radius
+            self.angle_degree=180-self.angle_degree
+        elif self.x+self.radius>grid_x_end:
+            self.x=grid_x_end-self.radius
+            self.angle_degree=180-self.angle_degree
+
+# ======== HexGrid ========
+class HexGrid:
+    def __init__(self,rows:int,cols:int,cell_size:int,wall_offset:int=0,
+                 x_offset:int=0,y_offset:int=0)->None:
+        self.rows:int=rows
+        self.cols:int=cols
+        self.cell:int=cell_size
+        self.wall_offset:int=wall_offset
+        self.x_offset:int=x_offset
+        self.y_offset:int=y_offset
+        self.map:List[List[str]]=[['.' for _ in range(cols)] for _ in range(rows)]
+        self.neighbors:NeighborTable=build_neighbor_table(rows,cols)
+            # 미리 계산한 이웃 표 (모든 탐색이 이걸 씀)
+        self.bubble_list:List[Bubble]=[]
+        self.obs_list:List[Obstacle]=[]
+            # 붙어있는 버블/장애물의 x,y는 벽 위치(wall_offset)를 뺀 그리드 기준 좌표.
+            # 화면 좌표는 world_pos()로 구함 (벽이 움직여도 객체 좌표는 안 바꿈)
+        self.occupants:Dict[Tuple[int,int],Union[Bubble,Obstacle]]={}
+            # (r,c) -> 그 셀에 붙어있는 버블/장애물 (충돌 검사용 셀 인덱스)
+        self.support_depth:Dict[Tuple[int,int],int]={}
+            # 천장과 이어진 버블 -> 천장까지의 지지 깊이 (맨 윗줄 0).
+            # 깊이 d인 버블 옆에는 항상 깊이 d-1인 버블이 있음.
+        self.loose_cells:Set[Tuple[int,int]]=set()
+            # 지지 깊이가 없는 버블 (장애물에만 붙은 배치 등, 천장과 안 이어졌을 수 있음)
+        self.version:int=0
+            # 셀 상태나 벽 위치가 바뀔 때마다 1씩 증가 (화면 캐시 무효화 판단용)
+        self.color_counts:Dict[str,int]=dict.fromkeys(COLORS,0)
+            # 색 -> 맵에 남은 그 색 버블 수 (셀을 바꿀 때마다 같이 갱신)
+        self.bubble_count:int=0
+            # 맵에 남은 버블 수 (0이면 스테이지 클리어)
+        self.row_counts:List[int]=[0]*rows
+            # 행 -> 그 행의 버블 수
+        self.lowest_row:int=-1
+            # 버블이 있는 가장 아래 행 (없으면 -1)
+
+    def load_from_stage(self,stage_map:List[List[str]])->None:
+        self.map=[row[:] for row in stage_map]
+        self.bubble_list=[]
+        self.obs_list=[]
+        self.occupants={}
+        self.color_counts=dict.fromkeys(COLORS,0)
+        self.bubble_count=0
+        self.row_counts=[0]*self.rows
+        self.lowest_row=-1
+        for r in range(self.rows):
+            if r>=len(self.map):
+                break
+            for c in range(self.cols):
+                if c<len(self.map[r]):
+                    ch=self.map[r][c]
+                else:
+                    ch='.'
+
+                # 버블 파싱
+                if ch in COLORS:
+                    x,y=self.get_local_center(r,c)
+                    b=Bubble(x,y,ch)
+                    b.is_attached=True
+                    b.set_grid_index(r,c)
+                    self.bubble_list.append(b)
+                    self.occupants[(r,c)]=b
+                    self._count_cell(r,ch,1)
+                    continue
+
+                # 장애물 파싱
+                if ch=='N':
+                    obsx,obsy=self.get_local_center(r,c)
+                    # ob=Obstacle(obsx,obsy,BUBBLE_RADIUS)
+                    ob=Obstacle(obsx,obsy,BUBBLE_RADIUS,r,c)
+                    self.obs_list.append(ob)
+                    self.occupants[(r,c)]=ob
+                    self.map[r][c]='N'
+                    continue
+
+        # '/' 패딩 셀은 이웃 표에서 뺌
+        padding=frozenset(
+            (r,c) for r in range(min(self.rows,len(self.map)))
+            for c in range(min(self.cols,len(self.map[r]))) if self.map[r][c]=='/'
+        )
+        self.neighbors=build_neighbor_table(self.rows,self.cols,padding)
+        self._rebuild_support()
+        self.version+=1
+
+    def get_cell_center(self,r:int,c:int)->Tuple[int,int]:
+        x=c*self.cell+self.cell//2+self.x_offset
+        y=r*self.cell+self.cell//2+self.wall_offset+self.y_offset
+        if r%2==1:
+            x+=self.cell//2
+        return x,y
+
+    def get_local_center(self,r:int,c:int)->Tuple[int,int]:
+        """벽 위치를 뺀 셀 중심 (붙어있는 버블/장애물 객체가 들고 있는 좌표)."""
+        x=c*self.cell+self.cell//2+self.x_offset
+        y=r*self.cell+self.cell//2+self.y_offset
+        if r%2==1:
+            x+=self.cell//2
+        return x,y
+
+    def world_pos(self,obj:Union[Bubble,Obstacle])->Tuple[float,float]:
+        """붙어있는 버블/장애물의 화면 좌표 (그리드 기준 좌표 + 벽 위치)."""
+        return obj.x,obj.y+self.wall_offset
+
+    def screen_to_grid(self,x:float,y:float)->Tuple[int,int]:
+        r=int((y-self.wall_offset-self.y_offset)//self.cell)
+        if r<0:
+            r=0
+        c_base=x-self.x_offset
+        if r%2==1:
+            c=int((c_base-self.cell//2)//self.cell)
+        else:
+            c=int(c_base//self.cell)
+        c=clamp(c,0,self.cols-1)
+        r=clamp(r,0,self.rows-1)
+        return int(r),int(c)
+
+    def place_bubble(self,bubble:Bubble,r:int,c:int)->None:
+        if r<0 or r>=self.rows or c<0 or c>=self.cols:
+            print(f"Error: Out of bounds placement at ({r},{c})")
+            return
+
+        if self.map[r][c]=='/':
+            c=clamp(c+1,0,self.cols-1)
+
+        if r>=len(self.map) or c>=len(self.map[r]):
+            print(f"Warning: Placing bubble at ({r},{c}) which may be out of map data bounds.")
+
+        old=self.occupants.get((r,c))
+        if old is not None:
+            # 빈 칸을 못 찾아 찬 셀에 억지로 붙일 때 원래 객체는 목록에서 뺌 (CompactHexGrid와 같게)
+            if isinstance(old,Obstacle):
+                self.obs_list.remove(old)
+            else:
+                self.bubble_list.remove(old)
+        self._count_cell(r,self.map[r][c],-1)
+        self.map[r][c]=bubble.color
+        self._count_cell(r,bubble.color,1)
+        cx,cy=self.get_local_center(r,c)
+        bubble.x,bubble.y=cx,cy
+        bubble.is_attached=True
+        bubble.in_air=False
+        bubble.set_grid_index(r,c)
+        self.bubble_list.append(bubble)
+        self.occupants[(r,c)]=bubble
+        self.version+=1
+        self._attach_support(r,c)
+
+    def _count_cell(self,r:int,ch:str,delta:int)->None:
+        """r행 셀 하나가 ch로 바뀌거나(delta=1) ch에서 비워질 때(delta=-1) 색/행 카운터 갱신함."""
+        if ch not in COLORS:
+            return
+        self.color_counts[ch]+=delta
+        self.bubble_count+=delta
+        self.row_counts[r]+=delta
+        if delta>0:
+            if r>self.lowest_row:
+                self.lowest_row=r
+        elif r==self.lowest_row:
+            # 가장 아래 행이 비었으면 버블 있는 행까지 위로 올라감
+            while self.lowest_row>=0 and self.row_counts[self.lowest_row]==0:
+                self.lowest_row-=1
+
+    def lowest_bubble_bottom(self)->int:
+        """가장 아래 버블의 아래쪽 끝 y 좌표 (벽 위치 포함). 버블이 없으면 0."""
+        if self.lowest_row<0:
+            return 0
+        return self.get_cell_center(self.lowest_row,0)[1]+BUBBLE_RADIUS
+
+    def present_colors(self)->List[str]:
+        """맵에 남아 있는 색 목록 (COLORS 순서)."""
+        return [color for color,n in self.color_counts.items() if n>0]
+
+    # ---------- 천장 지지 관리 ----------
+    def _rebuild_support(self)->None:
+        """맨 윗줄부터 BFS로 지지 깊이를 전부 다시 계산함 (스테이지 로드 때만)."""
+        depth:Dict[Tuple[int,int],int]={}
+        frontier=[(0,c) for c in range(self.cols) if self.rows>0 and self.cell_at(0,c) in COLORS]
+        for cell in frontier:
+            depth[cell]=0
+        neighbors=self.neighbors
+        cell_at=self.cell_at
+        d=0
+        while frontier:
+            d+=1
+            next_frontier=[]
+            for r,c in frontier:
+                for nb in neighbors[r][c]:
+                    if nb not in depth and cell_at(*nb) in COLORS:
+                        depth[nb]=d
+                        next_frontier.append(nb)
+            frontier=next_frontier
+        self.support_depth=depth
+        self.loose_cells={
+            (r,c) for r in range(self.rows) for c in range(self.cols)
+            if self.cell_at(r,c) in COLORS and (r,c) not in depth
+        }
+
+    def _attach_support(self,r:int,c:int)->None:
+        """새로 붙은 버블의 지지 깊이를 이웃에서 정함. 지지할 이웃이 없으면 loose_cells로."""
+        self.loose_cells.discard((r,c))
+        if r==0:
+            self.support_depth[(r,c)]=0
+            return
+        best=None
+        for nb in self.neighbors[r][c]:
+            d=self.support_depth.get(nb)
+            if d is not None and (best is None or d<best):
+                best=d
+        if best is None:
+            self.support_depth.pop((r,c),None)
+            self.loose_cells.add((r,c))
+        else:
+            self.support_depth[(r,c)]=best+1
+
+    def _repair_support(self,seeds:Iterable[Tuple[int,int]])->Set[Tuple[int,int]]:
+        """셀이 빠진 뒤 seeds(빠진 셀의 이웃)부터 지지를 잃은 버블만 다시 확인함.
+
+        지지하던 이웃을 잃은 버블과 그 아래로 이어진 버블만 무효화하고, 그 영역 안에서만
+        남은 지지 버블로부터 깊이를 다시 채움. 못 채운 버블이 떠 있는 버블임.
+
+        Returns:
+            Set[Tuple[int,int]]: 떠 있는 셀 좌표 집합
+        """
+        depth=self.support_depth
+        neighbors=self.neighbors
+
+        # 1) 지지 잃은 버블 찾기 (아래쪽으로 전파)
+        invalid:Set[Tuple[int,int]]=set()
+        stack=[cell for cell in seeds if cell in depth]
+        while stack:
+            r,c=stack.pop()
+            if (r,c) in invalid:
+                continue
+            d=depth[(r,c)]
+            if d==0:
+                continue
+                # 맨 윗줄은 항상 지지됨
+            supported=False
+            for nb in neighbors[r][c]:
+                if nb not in invalid and depth.get(nb)==d-1:
+                    supported=True
+                    break
+            if supported:
+                continue
+            invalid.add((r,c))
+            for nb in neighbors[r][c]:
+                if nb not in invalid and depth.get(nb)==d+1:
+                    stack.append(nb)
+
+        # 2) 무효화된 버블 + loose 버블을 남은 지지 버블에서부터 다시 채움
+        pool=invalid|self.loose_cells
+        for cell in invalid:
+            del depth[cell]
+        heap=[]
+        for r,c in pool:
+            best=None
+            for nb in neighbors[r][c]:
+                d=depth.get(nb)
+                if d is not None and (best is None or d<best):
+                    best=d
+            if best is not None:
+                heap.append((best+1,r,c))
+        heapq.heapify(heap)
+        while heap:
+            d,r,c=heapq.heappop(heap)
+            if (r,c) in depth:
+                continue
+            depth[(r,c)]=d
+            for nb in neighbors[r][c]:
+                if nb in pool and nb not in depth:
+                    heapq.heappush(heap,(d+1,nb[0],nb[1]))
+
+        self.loose_cells=set()
+        return {cell for cell in pool if cell not in depth}
+
+    def nearest_grid_to_point(self,x:float,y:float,warn:bool=True)->Tuple[int,int]:
+        """(x,y)에 붙일 셀. 이미 찬 셀이면 가장 가까운 빈 이웃 셀.
+
+        Args:
+            warn (bool): 빈 셀을 못 찾았을 때 경고 출력 여부 (각도를 훑는 봇은 끔).
+        """
+        r,c=self.screen_to_grid(x,y)
+
+        if not self.is_in_bounds(r,c):
+            return (0,clamp(c,0,self.cols-1))
+
+        cell_at=self.cell_at
+        ch=cell_at(r,c)
+        if ch in COLORS or ch=='/':
+            best_neighbor=(r,c)
+            min_dist_sq=float('inf')
+            found_empty=False
+
+            for nr,nc in self.get_neighbors(r,c):
+                if cell_at(nr,nc)=='.':
+                    nx,ny=self.get_cell_center(nr,nc)
+                    dist_sq=(x-nx)**2+(y-ny)**2
+                    if dist_sq<min_dist_sq:
+                        min_dist_sq=dist_sq
+                        best_neighbor=(nr,nc)
+                        found_empty=True
+
+            if found_empty:
+                return best_neighbor
+
+        if ch=='.':
+            return r,c
+
+        if warn:
+            print(f"Warning: no empty cell found near. ({r},{c}). Forcing.")
+        return r,c
+
+    def nearby_occupants(self,x:float,y:float)->List[Union[Bubble,Obstacle]]:
+        """(x,y) 주변 셀(행 ±1, 열 ±1)에 붙어있는 버블/장애물 반환함.
+
+        버블 지름이 셀 크기보다 작으므로 (x,y)에 닿을 수 있는 건 이 범위 안에만 있음.
+        보드 크기와 상관없이 최대 9칸만 확인함.
+        """
+        found=[]
+        r0=int((y-self.wall_offset-self.y_offset)//self.cell)
+        for r in range(r0-1,r0+2):
+            if r<0 or r>=self.rows:
+                continue
+            c_base=x-self.x_offset
+            if r%2==1:
+                c_base-=self.cell//2
+            c0=int(c_base//self.cell)
+            for c in range(c0-1,c0+2):
+                occ=self.occupants.get((r,c))
+                if occ is not None:
+                    found.append(occ)
+        return found
+
+    def is_in_bounds(self,r:int,c:int)->bool:
+        return 0<=r<self.rows and 0<=c<self.cols
+
+    def cell_at(self,r:int,c:int)->str:
+        """(r,c) 셀 문자 반환함. 범위 검사는 호출하는 쪽에서 함."""
+        return self.map[r][c]
+
+    def get_neighbors(self,r:int,c:int)->Tuple[Tuple[int,int],...]:
+        """(r,c)의 범위 안 이웃 좌표 반환함 (미리 계산한 표를 그대로 돌려줌)."""
+        if self.is_in_bounds(r,c):
+            return self.neighbors[r][c]
+        return tuple((r+dr,c+dc) for dr,dc in NEIGHBOR_OFFSETS[r%2] if self.is_in_bounds(r+dr,c+dc))
+
+    def dfs_same_color(self,row:int,col:int,color:str,visited:Set[Tuple[int,int]])->None:
+        if not self.is_in_bounds(row,col) or self.cell_at(row,col)!=color:
+            return
+        neighbors=self.neighbors
+        cell_at=self.cell_at
+        visited.add((row,col))
+        stack=[(row,col)]
+        while stack:
+            r,c=stack.pop()
+            for nb in neighbors[r][c]:
+                if nb not in visited and cell_at(*nb)==color:
+                    visited.add(nb)
+                    stack.append(nb)
+
+    def remove_cells(self,cells:Set[Tuple[int,int]])->None:
+        cell_set=set(cells)
+        for (r,c) in cell_set:
+            if self.is_in_bounds(r,c):
+                self._count_cell(r,self.map[r][c],-1)
+                self.map[r][c]='.'
+        self.bubble_list=[
+            b for b in self.bubble_list
+            if (b.row_idx,b.col_idx) not in cell_set
+        ]
+        for cell in cell_set:
+            if isinstance(self.occupants.get(cell),Bubble):
+                del self.occupants[cell]
+        self.version+=1
+        self.loose_cells-=cell_set
+        for cell in cell_set:
+            self.support_depth.pop(cell,None)
+
+    def remove_hanging(self,seeds:Optional[Iterable[Tuple[int,int]]]=None)->Set[Tuple[int,int]]:
+        """천장과 연결 끊긴 버블 제거함.
+
+        Args:
+            seeds (Optional[Iterable[Tuple[int,int]]]): 방금 빠진 셀들의 이웃. 주면 지지 깊이를
+                이용해 이 주변에서 지지를 잃은 버블만 확인함. None이면 보드 전체 재계산.
+
+        Returns:
+            Set[Tuple[int,int]]: 떨어진 셀 좌표 집합
+        """
+        if seeds is None:
+            self._rebuild_support()
+            not_connected=set(self.loose_cells)
+        else:
+            not_connected=self._repair_support(seeds)
+        if not_connected:
+            self.remove_cells(not_connected)
+        return not_connected
+
+    # ---------- 벽 이동 (객체 좌표는 그리드 기준이므로 오프셋만 바꿈) ----------
+    def drop_wall(self)->None:
+        self.wall_offset+=WALL_DROP_PIXELS
+        self.version+=1
+
+    def raise_wall(self)->None:
+        """벽을 한 칸 올려서(위로 이동) 여유 공간 늘림.
+        """
+        if self.wall_offset<=0:
+            # 더 이상 못 올리면
+            return
+        self.wall_offset=max(0,self.wall_offset-WALL_DROP_PIXELS)
+        self.version+=1
@@ -2,19 +2,24 @@ import sys
 import pygame
 
 from config import SCREEN_WIDTH, SCREEN_HEIGHT
+from startup_profiler import PROFILER
 from scene_manager import SceneManager
-from scene_factory import scene_factory
+from scene_factory import scene_factory, prewarm_scene
 
 
 def main() -> None:
     """프로그램 엔트리포인트: 메뉴 → 게임 씬으로 진입."""
-    pygame.init()
-    pygame.mixer.init()
+    with PROFILER.span('init', 'pygame.init'):
+        pygame.init()
+    with PROFILER.span('init', 'pygame.mixer.init'):
+        pygame.mixer.init()
 
     # 전역 디스플레이 생성 (모든 Scene은 이 surface를 공유)
-    pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    with PROFILER.span('init', 'pygame.display.set_mode'):
+        pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
 
-    manager = SceneManager(scene_factory)
+    # 씬 인스턴스 재사용 + 다음에 갈 씬은 백그라운드에서 미리 준비
+    manager = SceneManager(scene_factory, persistent=True, prewarm=prewarm_scene)
     # 첫 씬은 메뉴부터 시작
     manager.run("menu")
 
@@ -15,6 +15,9 @@ try:
     )
     from asset_paths import ASSET_PATHS
     from color_settings import COLORS
+    from text_cache import get_font, render_text
+    from asset_manager import ASSETS
+    from stage_pack import build_pack
 except ImportError:
     print("설정 파일을 찾을 수 없습니다. config.py 등이 같은 폴더에 있는지 확인해주세요.")
     sys.exit()
@@ -58,7 +61,7 @@ class Button:
         
         if self.text:
             # 텍스트 색상을 TEXT_COLOR 상수가 아닌 검정(버튼 위 가독성)으로 하거나 선택
-            txt = font.render(self.text, True, (0,0,0)) 
+            txt = render_text(font, self.text, (0,0,0))
             t_rect = txt.get_rect(center=self.rect.center)
             screen.blit(txt, t_rect)
 
@@ -79,19 +82,21 @@ class DecorCannon:
         self.y = y
         self.angle = 90
         try:
-            self.arrow_image = pygame.image.load(ASSET_PATHS['cannon_arrow']).convert_alpha()
             # 이미지 크기도 스케일에 맞춰 조정
             w = int(152 * SCALE)
             h = int(317 * SCALE)
-            self.arrow_image = pygame.transform.smoothscale(self.arrow_image, (w, h))
+            self.arrow_image = ASSETS.image(ASSET_PATHS['cannon_arrow'], (w, h))
         except:
             self.arrow_image = None
+        self.rotated = None  # (각도, 회전된 이미지, rect) - 각도가 바뀔 때만 다시 회전
 
     def draw(self, screen):
         if self.arrow_image:
-            rotated = pygame.transform.rotate(self.arrow_image, self.angle - 90)
-            rect = rotated.get_rect(center=(self.x, self.y))
-            screen.blit(rotated, rect)
+            if self.rotated is None or self.rotated[0] != self.angle:
+                image = pygame.transform.rotate(self.arrow_image, self.angle - 90)
+                self.rotated = (self.angle, image, image.get_rect(center=(self.x, self.y)))
+            _, image, rect = self.rotated
+            screen.blit(image, rect)
         else:
             line_len = int(100 * SCALE)
             width = max(1, int(4 * SCALE))
@@ -150,6 +155,19 @@ class EditorGrid:
                     # BUBBLE_RADIUS는 config에서 이미 스케일링 됨
                     pygame.draw.circle(screen, (30, 50, 80), (cx, cy), BUBBLE_RADIUS, 1)
 
+def preload_assets():
+    """에디터 이미지를 원본 크기로 미리 디코딩해서 캐시에 넣어 둠 (백그라운드 준비용, 실패는 무시)
+    디스크에서 읽기만 하고 디스플레이 변환은 에디터가 만들어질 때 메인 스레드에서 함"""
+    keys = ('editor_bg', 'map_editor_logo', 'cannon_arrow', 'bubble_red', 'bubble_yellow',
+            'bubble_blue', 'bubble_green', 'bubble_obstacle')
+    for key in keys:
+        path = ASSET_PATHS.get(key)
+        if path and os.path.exists(path):
+            try:
+                ASSETS.decode(path)
+            except pygame.error:
+                pass
+
 # ==========================================
 # 메인 에디터 클래스
 # ==========================================
@@ -162,14 +180,11 @@ class MapEditor:
         
         # --- 폰트 (크기 스케일링 적용) ---
         self.font_path = ASSET_PATHS.get('font')
-        if self.font_path and os.path.exists(self.font_path):
-            self.font_ui = pygame.font.Font(self.font_path, int(30 * SCALE))
-            self.font_title = pygame.font.Font(self.font_path, int(50 * SCALE))
-            self.font_big = pygame.font.Font(self.font_path, int(80 * SCALE))
-        else:
-            self.font_ui = pygame.font.Font(None, int(30 * SCALE))
-            self.font_title = pygame.font.Font(None, int(50 * SCALE))
-            self.font_big = pygame.font.Font(None, int(80 * SCALE))
+        if not (self.font_path and os.path.exists(self.font_path)):
+            self.font_path = None
+        self.font_ui = get_font(self.font_path, int(30 * SCALE))
+        self.font_title = get_font(self.font_path, int(50 * SCALE))
+        self.font_big = get_font(self.font_path, int(80 * SCALE))
 
         # --- 이미지 에셋 로드 ---
         self.bubble_images = {}
@@ -186,9 +201,7 @@ class MapEditor:
         for code, asset_key in color_key_map.items():
             path = ASSET_PATHS.get(asset_key)
             if path and os.path.exists(path):
-                img = pygame.image.load(path).convert_alpha()
-                img = pygame.transform.smoothscale(img, (target_size, target_size))
-                self.bubble_images[code] = img
+                self.bubble_images[code] = ASSETS.image(path, (target_size, target_size))
             else:
                 # 장애물은 회색 원으로 표시
                 surf = pygame.Surface((target_size, target_size), pygame.SRCALPHA)
@@ -202,10 +215,9 @@ class MapEditor:
         self.map_editor_logo = None
         if ASSET_PATHS.get('map_editor_logo') and os.path.exists(ASSET_PATHS['map_editor_logo']):
             try:
-                self.map_editor_logo = pygame.image.load(ASSET_PATHS['map_editor_logo']).convert_alpha()
                 w = int(250 * SCALE)
                 h = int(142 * SCALE)
-                self.map_editor_logo = pygame.transform.smoothscale(self.map_editor_logo, (w, h))
+                self.map_editor_logo = ASSETS.image(ASSET_PATHS['map_editor_logo'], (w, h))
             except:
                 pass
 
@@ -213,8 +225,7 @@ class MapEditor:
         self.editor_bg = None
         if ASSET_PATHS.get('editor_bg') and os.path.exists(ASSET_PATHS['editor_bg']):
             try:
-                self.editor_bg = pygame.image.load(ASSET_PATHS['editor_bg']).convert()
-                self.editor_bg = pygame.transform.smoothscale(self.editor_bg, (SCREEN_WIDTH, SCREEN_HEIGHT))
+                self.editor_bg = ASSETS.image(ASSET_PATHS['editor_bg'], (SCREEN_WIDTH, SCREEN_HEIGHT), alpha=False)
             except:
                 pass
 
@@ -264,6 +275,24 @@ class MapEditor:
         else:
             self.create_new_map()
 
+    def resume(self):
+        """에디터 씬에 다시 들어올 때 호출 (UI/에셋은 그대로 두고 파일 목록과 맵만 다시 읽음)"""
+        self.screen = pygame.display.get_surface()
+        pygame.display.set_caption("Bubble Pop - Map Editor")
+        self.running = True
+        self.save_msg_alpha = 0
+        self.scrollbar_dragging = False
+
+        self.refresh_file_list()
+        max_scroll = max(0, len(self.file_list) - self.max_visible_files)
+        self.scroll_y = min(self.scroll_y, max_scroll)
+        if self.current_filename in self.file_list:
+            self.load_map(self.current_filename)
+        elif self.file_list:
+            self.load_map(self.file_list[0])
+        else:
+            self.create_new_map()
+
     def create_ui_elements(self):
         """UI 요소 생성 (SCALE 적용)"""
 
@@ -416,6 +445,17 @@ class MapEditor:
             self.save_msg_alpha = 255
         except Exception as e:
             print(f"Save failed: {e}")
+            return
+
+        self.sync_stage_pack(folder)
+
+    def sync_stage_pack(self, folder):
+        """스테이지 팩을 쓰고 있으면 게임이 예전 맵을 읽지 않도록 CSV 폴더로 다시 만듦 (저장/생성/삭제 후)"""
+        if os.path.exists(ASSET_PATHS['stage_pack']):
+            try:
+                build_pack(folder, ASSET_PATHS['stage_pack'])
+            except OSError as e:
+                print(f"Stage pack rebuild failed: {e}")
 
     def create_new_map(self):
         folder = 'assets/map_data'
@@ -435,6 +475,7 @@ class MapEditor:
                 writer = csv.writer(f)
                 for row in empty_map:
                     writer.writerow(row)
+            self.sync_stage_pack(folder)
             self.refresh_file_list()
             self.load_map(new_filename)
             try:
@@ -458,6 +499,7 @@ class MapEditor:
         path = os.path.join(folder, self.current_filename)
         try:
             os.remove(path)
+            self.sync_stage_pack(folder)
             self.refresh_file_list()
             if self.file_list:
                 if current_index >= len(self.file_list):
@@ -590,13 +632,13 @@ class MapEditor:
         if self.map_editor_logo:
             self.screen.blit(self.map_editor_logo, (logo_x, logo_y))
         else:
-            title_surf = self.font_title.render("MAP EDITOR", True, (255, 255, 255))
+            title_surf = render_text(self.font_title, "MAP EDITOR", (255, 255, 255))
             self.screen.blit(title_surf, (title_x, title_y))
 
         # PALETTE 라벨
         label_offset_x = int(80 * SCALE)
         label_offset_y = int(70 * SCALE)
-        palette_txt = self.font_title.render("Bubble : ", True, THEME_BORDER)
+        palette_txt = render_text(self.font_title, "Bubble : ", THEME_BORDER)
         self.screen.blit(palette_txt, (self.left_panel_rect.x + label_offset_x, self.left_panel_rect.y + label_offset_y))
 
         # 현재 브러쉬
@@ -608,7 +650,7 @@ class MapEditor:
             rect = cur_img.get_rect(center=(self.left_panel_rect.centerx + brush_offset_x, self.left_panel_rect.y + brush_offset_y))
             self.screen.blit(cur_img, rect)
         elif self.selected_brush == '.':
-            e_txt = self.font_ui.render("ERASER", True, (200, 200, 200))
+            e_txt = render_text(self.font_ui, "ERASER", (200, 200, 200))
             e_rect_offset_x = int(250 * SCALE)
             e_rect_offset_y = int(80 * SCALE)
             self.screen.blit(e_txt, (self.left_panel_rect.x + e_rect_offset_x, self.left_panel_rect.y + e_rect_offset_y))
@@ -634,7 +676,7 @@ class MapEditor:
 
         st_title_offset_x = int(140 * SCALE)
         st_title_offset_y = int(350 * SCALE)
-        st_title = self.font_title.render("STAGES", True, THEME_BORDER)
+        st_title = render_text(self.font_title, "STAGES", THEME_BORDER)
         self.screen.blit(st_title, (right_x + st_title_offset_x, st_title_offset_y))
 
         # 5-1. 리스트 아이템
@@ -659,7 +701,7 @@ class MapEditor:
                 pygame.draw.rect(self.screen, BTN_IDLE, item_rect, border_radius=radius_sm)
 
             display_name = filename.replace('.csv', '').upper()
-            txt = self.font_ui.render(display_name, True, (0,0,0)) # 리스트 텍스트 검정
+            txt = render_text(self.font_ui, display_name, (0,0,0)) # 리스트 텍스트 검정
             txt_rect = txt.get_rect(center=item_rect.center)
             self.screen.blit(txt, txt_rect)
 
@@ -693,12 +735,12 @@ class MapEditor:
 
         # 7. 정보 텍스트
         bottom_offset = int(30 * SCALE)
-        file_info = self.font_ui.render(f"EDITING: {self.current_filename}", True, (150, 150, 150))
+        file_info = render_text(self.font_ui, f"EDITING: {self.current_filename}", (150, 150, 150))
         self.screen.blit(file_info, file_info.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT - bottom_offset)))
 
         # 8. Saved 메시지
         if self.save_msg_alpha > 0:
-            msg_surf = self.font_big.render("SAVED!", True, (100, 255, 100))
+            msg_surf = self.font_big.render("SAVED!", True, (100, 255, 100))  # 알파를 바꾸므로 캐시하지 않음
             msg_surf.set_alpha(self.save_msg_alpha)
             rect = msg_surf.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2))
 
@@ -1,8 +1,12 @@
 import pygame
 import os
 from config import SCREEN_WIDTH, SCREEN_HEIGHT, SCALE
+from asset_manager import ASSETS
+from startup_profiler import PROFILER
 
 class MenuScene:
+    likely_next = 'game'  # 메뉴에 있는 동안 게임 씬 에셋을 미리 준비
+
     def __init__(self, manager):
         self.manager = manager
         self.idx = 0
@@ -11,16 +15,17 @@ class MenuScene:
         base_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'assets', 'images')
         
         # 배경 이미지 로드 및 스케일 조정
-        background_img = pygame.image.load(os.path.join(base_path, 'menu_background.png'))
-        self.background = pygame.transform.scale(background_img, (int(SCREEN_WIDTH), int(SCREEN_HEIGHT)))
+        self.background = ASSETS.image(os.path.join(base_path, 'menu_background.png'),
+                                       (int(SCREEN_WIDTH), int(SCREEN_HEIGHT)), alpha=False, smooth=False)
         
         # 버튼 이미지 로드 및 스케일 조정
         button_files = ['menu_start.png', 'menu_map_editor.png', 'menu_exit.png']
         self.button_images = []
         for btn_file in button_files:
-            img = pygame.image.load(os.path.join(base_path, btn_file))
+            path = os.path.join(base_path, btn_file)
+            img = ASSETS.image(path, smooth=False)
             # 버튼 이미지를 SCALE에 맞게 조정
-            scaled_img = pygame.transform.scale(img, (int(img.get_width() * SCALE), int(img.get_height() * SCALE)))
+            scaled_img = ASSETS.image(path, (img.get_width() * SCALE, img.get_height() * SCALE), smooth=False)
             self.button_images.append(scaled_img)
         
         # 버튼 위치 설정 (스케일 기반)
@@ -51,6 +56,8 @@ class MenuScene:
                         self.idx = (self.idx - 1) % len(self.button_images)
                     elif e.key in (pygame.K_DOWN, pygame.K_s):
                         self.idx = (self.idx + 1) % len(self.button_images)
+                    elif e.key == pygame.K_r:
+                        return 'replay'  # 저장된 리플레이 보기
                     elif e.key in (pygame.K_RETURN, pygame.K_SPACE):
                         if self.idx == 0:
                             return 'game'
@@ -75,6 +82,7 @@ class MenuScene:
                     pygame.draw.rect(screen, (255, 255, 255), rect, self.border_thickness)
 
             pygame.display.flip()
+            PROFILER.finish('first_menu_frame')  # 첫 프레임에서만 타임라인 출력
             clock.tick(60)
 
         return None
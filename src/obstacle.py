@@ -1,7 +1,7 @@
-import pygame
-
 class Obstacle:
     """안 움직이고 DFS에도 안 들어감.
+
+    순수 데이터 객체임. 그리기는 game.py의 draw_grid()가 버블과 같이 한 번에 처리함.
     """
     def __init__(self,x,y,radius,row_idx,col_idx):
         self.x = x
@@ -11,13 +11,3 @@ class Obstacle:
         self.col_idx = col_idx
         self.is_static = True
             # 장애물 고정 여부
-
-    # 색은 회색 계열로 설정 (임시)
-    def draw(self, screen):
-        """장애물 그리기
-
-        Args:
-            screen (pygame.Surface): 장애물을 그릴 Surface 객체.
-        """
-        pygame.draw.circle(screen,(90,90,90),(int(self.x),int(self.y)),self.radius)
-        pygame.draw.circle(screen,(160,160,160),(int(self.x),int(self.y)),self.radius,4)
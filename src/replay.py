@@ -0,0 +1,326 @@
+import hashlib
+    # 보드 해시 위해
+import json
+    # 리플레이 파일 저장 위해
+import os
+    # 환경 변수, 경로 다루기 위해
+import random
+    # 시드 생성 위해
+import sys
+    # 명령행 인자 위해
+import time
+    # 재생 시간 측정 위해
+from typing import Dict,Iterator,List,NamedTuple,Sequence,Tuple,Union
+
+from config import CANNON_ANGLE_SPEED,CANNON_MAX_ANGLE,CANNON_MIN_ANGLE
+from constants import Action
+from hex_grid import HexGrid,clamp
+from simulator import SimState,Simulator
+
+# 한 판을 (시드, 스테이지 맵, 입력 기록)으로 남겨 두고 나중에 그대로 다시 돌려 보는 리플레이.
+# 시뮬레이터의 난수는 Simulator.rng 하나뿐이고, 입력은 Simulator.step()으로만 들어가므로
+# 같은 시드에 같은 프레임에 같은 입력을 주면 같은 판이 나옴. 재생은 pygame 없이 최대 속도로 돌고,
+# 마지막 보드 해시가 기록과 같은지 확인함 (버그 재현, 성능 변경 회귀 테스트용).
+#
+# 환경 변수:
+#   BUBBLE_POP_SEED=1234            -> 이 시드로 게임 시작 (기록된 판을 손으로 다시 해 볼 때)
+#   BUBBLE_POP_REPLAY=replay.json   -> 게임이 끝나면 리플레이 저장 (폴더면 그 안에 replay_<seed>.json)
+#
+#   python src/replay.py <리플레이 파일 또는 폴더> ...   -> 헤드리스로 재생해서 해시 검증
+
+SEED_ENV:str='BUBBLE_POP_SEED'
+REPLAY_ENV:str='BUBBLE_POP_REPLAY'
+REPLAY_VERSION:int=1
+SNAPSHOT_EVERY:int=10
+    # ReplayPlayer가 몇 발마다 판 상태를 저장해 두는지
+
+ACTION_CODES:Dict[Action,str]={
+    Action.FIRE:'F',
+    Action.SWAP:'S',
+    Action.RAISE:'U',
+    Action.RAINBOW:'W',
+    Action.LEFT:'L',
+    Action.RIGHT:'R',
+}
+    # 기록하는 입력 -> 한 글자 코드
+    # (LEFT/RIGHT는 같은 프레임의 다른 입력 사이에 있을 때만 남기고, 나머지는 기록 각도로 대신함)
+TURNS:Dict[Action,float]={Action.LEFT:+CANNON_ANGLE_SPEED,Action.RIGHT:-CANNON_ANGLE_SPEED}
+    # Simulator.step()의 회전량
+CODE_ACTIONS:Dict[str,Action]={code:action for action,code in ACTION_CODES.items()}
+
+class InputRecord(NamedTuple):
+    """한 프레임의 입력"""
+    frame:int
+    angle:float
+        # 이 프레임의 첫 입력(actions 첫 글자)을 처리하기 직전의 발사대 각도
+    actions:str
+        # ACTION_CODES 글자들 (입력 순서대로)
+
+class StageRecord(NamedTuple):
+    """스테이지를 올린 시점"""
+    frame:int
+        # 이 프레임을 진행하기 전에 올림
+    index:int
+    rows:List[str]
+        # 맵 (행마다 셀 문자를 이은 문자열)
+
+class ReplayLog(NamedTuple):
+    seed:int
+    instant_resolve:bool
+    frames:int
+        # 진행한 전체 프레임 수
+    final_hash:str
+    stages:List[StageRecord]
+    inputs:List[InputRecord]
+
+def new_seed()->int:
+    """게임 한 판의 시드. BUBBLE_POP_SEED가 있으면 그 값."""
+    value=os.environ.get(SEED_ENV)
+    if value:
+        return int(value)
+    return random.randrange(2**32)
+
+def board_hash(sim:Simulator)->str:
+    """판 상태(맵, 점수, 벽 위치, 발사 횟수, 현재/다음 버블, 아이템) 해시."""
+    h=hashlib.sha1()
+    for row in sim.grid.map:
+        h.update(''.join(row).encode('ascii'))
+        h.update(b'|')
+    current=sim.current_bubble.color if sim.current_bubble else '-'
+    next_color=sim.next_bubble.color if sim.next_bubble else '-'
+    h.update(f'{sim.score},{sim.grid.wall_offset},{sim.fire_count},{current}{next_color},'
+             f'{sim.item_swap_count}{sim.item_raise_count}{sim.item_rainbow_count}'.encode('ascii'))
+    return h.hexdigest()
+
+# ======== 기록 ========
+class ReplayRecorder:
+    def __init__(self,seed:int,instant_resolve:bool)->None:
+        self.seed:int=seed
+        self.instant_resolve:bool=instant_resolve
+        self.frame:int=0
+            # 다음에 진행할 프레임 번호 (Simulator.step 호출 수)
+        self.stages:List[StageRecord]=[]
+        self.inputs:List[InputRecord]=[]
+
+    def stage(self,index:int,stage_map:Sequence[Sequence[str]])->None:
+        """시뮬레이터에 스테이지를 올리기 직전에 부름."""
+        self.stages.append(StageRecord(self.frame,index,[''.join(row) for row in stage_map]))
+
+    def record(self,sim:Simulator,actions:Sequence[Action])->None:
+        """sim.step(*actions) 직전에 부름. 회전만 있는 프레임은 프레임 수만 셈.
+
+        step()처럼 입력 순서대로 각도를 따라가면서, 첫 입력 직전의 각도를 기록 각도로 남기고
+        입력 사이의 회전은 그대로 남김. 그래서 방향키와 FIRE가 어떤 순서로 와도 실제로 쏜 각도가 남음.
+        버블이 날아가는 중(또는 쏠 버블이 없을 때) 눌러서 무시되는 발사는 판에 아무 영향이 없으므로
+        기록하지 않음. 그래서 기록된 'F'는 전부 실제 발사이고 ReplayPlayer는 그것만 발사로 셈.
+        """
+        codes=''
+        turns=''
+            # 마지막 입력 뒤의 회전 (뒤에 입력이 또 오면 남김)
+        angle=start=sim.cannon_angle
+        in_air=sim.fire_in_air
+        for action in actions:
+            code=ACTION_CODES.get(action)
+            if code is None:
+                continue
+            if action in TURNS:
+                angle=clamp(angle+TURNS[action],CANNON_MIN_ANGLE,CANNON_MAX_ANGLE)
+                if codes:
+                    turns+=code
+                continue
+            if action==Action.FIRE:
+                if sim.current_bubble is None or in_air:
+                    continue
+                in_air=not sim.instant_resolve
+                    # 즉시 착지 모드는 바로 다음 버블이 준비됨
+            if not codes:
+                start=angle
+            codes+=turns+code
+            turns=''
+        if codes:
+            self.inputs.append(InputRecord(self.frame,start,codes))
+        self.frame+=1
+
+    def finish(self,sim:Simulator)->ReplayLog:
+        return ReplayLog(self.seed,self.instant_resolve,self.frame,board_hash(sim),
+                         list(self.stages),list(self.inputs))
+
+# ======== 저장/읽기 ========
+def save_replay(log:ReplayLog,path:str)->str:
+    """리플레이를 JSON으로 저장함. path가 폴더면 그 안에 replay_<seed>.json. 저장한 경로 반환함."""
+    if os.path.isdir(path):
+        path=os.path.join(path,f'replay_{log.seed}.json')
+    data={
+        'version':REPLAY_VERSION,
+        'seed':log.seed,
+        'instant_resolve':log.instant_resolve,
+        'frames':log.frames,
+        'final_hash':log.final_hash,
+        'stages':[[s.frame,s.index,s.rows] for s in log.stages],
+        'inputs':[[i.frame,i.angle,i.actions] for i in log.inputs],
+    }
+    with open(path,'w',encoding='utf-8') as f:
+        json.dump(data,f,separators=(',',':'))
+    return path
+
+def load_replay(path:str)->ReplayLog:
+    """
+    Raises:
+        OSError: 파일을 열 수 없을 때
+        ValueError: 형식/버전이 맞지 않을 때
+    """
+    with open(path,encoding='utf-8') as f:
+        data=json.load(f)
+    if data.get('version')!=REPLAY_VERSION:
+        raise ValueError(f'{path}: 지원하지 않는 리플레이 버전 ({data.get("version")})')
+    return ReplayLog(
+        data['seed'],data['instant_resolve'],data['frames'],data['final_hash'],
+        [StageRecord(f,i,rows) for f,i,rows in data['stages']],
+        [InputRecord(f,a,codes) for f,a,codes in data['inputs']],
+    )
+
+# ======== 재생 ========
+def _merged_events(log:ReplayLog)->Iterator[Tuple[int,Union[StageRecord,InputRecord]]]:
+    """스테이지/입력 기록을 프레임 순서로 (같은 프레임이면 스테이지 먼저)."""
+    events=[(s.frame,0,n,s) for n,s in enumerate(log.stages)]
+    events+=[(i.frame,1,n,i) for n,i in enumerate(log.inputs)]
+    events.sort(key=lambda e:e[:3])
+    for frame,_,_,event in events:
+        yield frame,event
+
+class ReplayPlayer:
+    """리플레이를 한 프레임씩 진행하거나 원하는 발사 시점으로 바로 이동함.
+
+    버블이 날아가는 중이 아닌 빈 프레임은 건너뜀 (입력 없이 step()해도 아무 일 없음).
+    snapshot_every발마다 판 상태(SimState)를 남겨 두고, seek()는 가장 가까운
+    이전 상태에서 차이만 다시 진행함. 0이면 상태를 안 남김 (처음부터 끝까지 한 번 돌릴 때).
+
+    "k발 시점"은 k번째 발사까지 처리하고 k+1번째 발사 입력을 처리하기 직전의 상태.
+    """
+    def __init__(self,log:ReplayLog,grid_cls:type=HexGrid,snapshot_every:int=SNAPSHOT_EVERY)->None:
+        self.log:ReplayLog=log
+        self.grid_cls:type=grid_cls
+        self.snapshot_every:int=snapshot_every
+        self.events:List[Tuple[int,Union[StageRecord,InputRecord]]]=list(_merged_events(log))
+        self.shot_total:int=sum('F' in i.actions for i in log.inputs)
+            # 기록된 'F'는 실제로 나간 발사뿐임 (ReplayRecorder.record). 즉시 착지 모드에서
+            # 한 프레임에 여러 발 쏜 경우는 멈출 수 있는 시점이 하나라 한 발로 셈
+        self.snapshots:Dict[int,Tuple[int,int,SimState]]={}
+            # 발사 번호 -> (다음 이벤트 위치, 프레임, 판 상태)
+        self.rewind()
+
+    def rewind(self)->None:
+        """처음(스테이지도 안 올린 상태)으로 돌아감."""
+        self.sim:Simulator=Simulator(instant_resolve=self.log.instant_resolve,
+                                     grid_cls=self.grid_cls,seed=self.log.seed)
+        self.pos:int=0
+            # 다음에 처리할 이벤트 위치
+        self.frame:int=0
+        self.shot:int=0
+            # 지금까지 처리한 발사 입력 수
+
+    @property
+    def at_end(self)->bool:
+        return self.pos>=len(self.events) and not (self.frame<self.log.frames and self.sim.fire_in_air)
+
+    def advance(self)->bool:
+        """한 프레임(또는 이벤트 하나) 진행함. 더 진행할 게 없으면 False."""
+        if self.pos>=len(self.events):
+            if self.frame<self.log.frames and self.sim.fire_in_air:
+                self.sim.step()
+                self.frame+=1
+                return True
+            return False
+
+        event_frame,event=self.events[self.pos]
+        if self.frame<event_frame and self.sim.fire_in_air:
+            self.sim.step()
+            self.frame+=1
+            return True
+        self.frame=event_frame
+        self.pos+=1
+        if isinstance(event,StageRecord):
+            self.sim.load_stage([list(row) for row in event.rows])
+            return True
+
+        if 'F' in event.actions:
+            if self.snapshot_every>0 and self.shot%self.snapshot_every==0 and self.shot not in self.snapshots:
+                self.snapshots[self.shot]=(self.pos-1,self.frame,self.sim.snapshot())
+            self.shot+=1
+        self.sim.cannon_angle=event.angle
+        self.sim.step(*(CODE_ACTIONS[code] for code in event.actions))
+        self.frame+=1
+        return True
+
+    def at_shot(self,shot:int)->bool:
+        """shot발 시점에 와 있는지 (다음 이벤트가 shot+1번째 발사 입력이고 날아가는 버블도 없음)."""
+        if self.pos>=len(self.events) or self.shot!=shot:
+            return False
+        event_frame,event=self.events[self.pos]
+        if self.frame<event_frame and self.sim.fire_in_air:
+            return False
+        return isinstance(event,InputRecord) and 'F' in event.actions
+
+    def build_snapshots(self)->None:
+        """끝까지 한 번 진행하면서 상태를 모아 두고 처음 발사 시점으로 돌아감."""
+        while self.advance():
+            pass
+        self.seek(0)
+
+    def seek(self,shot:int)->None:
+        """shot발 시점으로 이동함 (shot_total이면 끝)."""
+        shot=max(0,min(shot,self.shot_total))
+        bases=[s for s in self.snapshots if s<=shot]
+        base=max(bases) if bases else None
+        if not (base is not None and base<=self.shot<=shot) and not (base is None and self.shot<=shot):
+            # 지금 위치에서 앞으로 가는 게 더 가깝지 않으면 저장된 상태(없으면 처음)에서 다시 시작
+            if base is None:
+                self.rewind()
+            else:
+                self.pos,self.frame,state=self.snapshots[base]
+                self.sim.restore(state)
+                self.shot=base
+        while not self.at_shot(shot) and self.advance():
+            pass
+
+def run_replay(log:ReplayLog,grid_cls:type=HexGrid)->Simulator:
+    """기록된 판을 헤드리스로 끝까지 다시 진행하고 마지막 상태의 시뮬레이터 반환함."""
+    player=ReplayPlayer(log,grid_cls,snapshot_every=0)
+    while player.advance():
+        pass
+    return player.sim
+
+def verify_replay(log:ReplayLog,grid_cls:type=HexGrid)->bool:
+    """다시 진행한 결과의 보드 해시가 기록과 같은지."""
+    return board_hash(run_replay(log,grid_cls))==log.final_hash
+
+def _replay_paths(paths:Sequence[str])->List[str]:
+    found=[]
+    for path in paths:
+        if os.path.isdir(path):
+            found.extend(sorted(os.path.join(path,name) for name in os.listdir(path)
+                                if name.endswith('.json')))
+        else:
+            found.append(path)
+    return found
+
+if __name__=='__main__':
+    paths=_replay_paths(sys.argv[1:])
+    if not paths:
+        print("사용법: python src/replay.py <리플레이 파일 또는 폴더> ...")
+        sys.exit(2)
+    failed=0
+    start=time.perf_counter()
+    for path in paths:
+        try:
+            ok=verify_replay(load_replay(path))
+        except (OSError,ValueError,KeyError) as e:
+            print(f"읽기 실패: {path}: {e}")
+            failed+=1
+            continue
+        if not ok:
+            print(f"해시 불일치: {path}")
+            failed+=1
+    elapsed=time.perf_counter()-start
+    print(f"리플레이 {len(paths)}개 중 {len(paths)-failed}개 일치 ({elapsed:.2f}s)")
+    sys.exit(1 if failed else 0)
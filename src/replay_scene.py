@@ -0,0 +1,190 @@
+import bisect
+    # 스테이지 번호 찾기 위해
+import os
+    # 리플레이 파일 찾기 위해
+import time
+    # 무제한 속도 재생 시간 예산 위해
+from typing import List,Optional
+
+import pygame
+    # 게임 라이브러리
+
+from config import SCREEN_WIDTH,SCREEN_HEIGHT,FPS,SCALE
+from asset_paths import ASSET_PATHS
+from replay import REPLAY_ENV,ReplayPlayer,StageRecord,load_replay
+from game import draw_bubble,draw_grid
+from text_cache import get_font,render_text
+
+# 저장된 리플레이(replay.py)를 보는 씬. 메뉴에서 R 키로 들어옴.
+# 몇 발마다 저장된 판 상태에서 차이만 다시 진행하므로 어느 발사 시점으로든 바로 이동하고,
+# 빠른 재생은 한 화면 프레임에 여러 시뮬레이션 프레임을 진행한 뒤 마지막 상태만 그림.
+#
+#   SPACE 재생/정지   ←/→ 한 발   PgUp/PgDn 열 발   Home/End 처음/끝
+#   1~4 속도 (1x, 2x, 8x, 무제한)   진행 막대 클릭: 그 시점으로 이동   ESC 메뉴
+
+SPEEDS:List[int]=[1,2,8,0]
+    # 화면 프레임당 시뮬레이션 프레임 수 (0 = 시간 예산 안에서 최대한)
+UNBOUNDED_BUDGET_MS:float=1000/FPS*0.7
+    # 무제한 속도일 때 한 화면 프레임에 쓰는 시뮬레이션 시간
+
+def find_replay()->Optional[str]:
+    """BUBBLE_POP_REPLAY가 가리키는 리플레이 (폴더면 가장 최근 파일)."""
+    path=os.environ.get(REPLAY_ENV)
+    if not path or not os.path.exists(path):
+        return None
+    if not os.path.isdir(path):
+        return path
+    files=[os.path.join(path,name) for name in os.listdir(path) if name.endswith('.json')]
+    return max(files,key=os.path.getmtime) if files else None
+
+class ReplayScene:
+    likely_next='menu'
+
+    def __init__(self,manager)->None:
+        self.manager=manager
+        self.player:Optional[ReplayPlayer]=None
+        self.path:Optional[str]=None
+        self.message:str=''
+        self.playing:bool=False
+        self.speed_idx:int=0
+        self.stage_pos:List[int]=[]
+        self.stage_index:List[int]=[]
+            # 스테이지를 올린 이벤트 위치 / 스테이지 번호 (이벤트 위치로 지금 스테이지 찾기용)
+        self.font=get_font(ASSET_PATHS['font'],int(36*SCALE))
+        self.small_font=get_font(ASSET_PATHS['font'],int(24*SCALE))
+        bar_w=int(SCREEN_WIDTH*0.6)
+        self.bar_rect=pygame.Rect((SCREEN_WIDTH-bar_w)//2,SCREEN_HEIGHT-int(60*SCALE),bar_w,int(16*SCALE))
+
+    def enter(self)->None:
+        """들어올 때마다 가장 최근 리플레이를 다시 읽음."""
+        self.playing=False
+        self.player=None
+        self.path=find_replay()
+        if self.path is None:
+            self.message=f'리플레이 없음 ({REPLAY_ENV} 환경 변수로 파일/폴더 지정)'
+            return
+        try:
+            log=load_replay(self.path)
+        except (OSError,ValueError,KeyError) as e:
+            self.message=f'리플레이 읽기 실패: {e}'
+            return
+        self.player=ReplayPlayer(log)
+        self.player.build_snapshots()
+            # 끝까지 한 번 돌면서 되감기용 상태를 모아 둠 (긴 판도 수십 ms)
+        self.stage_pos=[n for n,(_,event) in enumerate(self.player.events) if isinstance(event,StageRecord)]
+        self.stage_index=[self.player.events[n][1].index for n in self.stage_pos]
+        self.message=os.path.basename(self.path)
+
+    def run(self)->Optional[str]:
+        if self.player is None and not self.message:
+            self.enter()
+        screen=pygame.display.get_surface()
+        clock=pygame.time.Clock()
+        while True:
+            for event in pygame.event.get():
+                if event.type==pygame.QUIT:
+                    return None
+                if event.type==pygame.KEYDOWN and event.key==pygame.K_ESCAPE:
+                    return 'menu'
+                if self.player is not None:
+                    self.handle_event(event)
+            if self.player is not None and self.playing:
+                self.play_frame()
+            self.draw(screen)
+            pygame.display.flip()
+            clock.tick(FPS)
+
+    def handle_event(self,event:pygame.event.Event)->None:
+        player=self.player
+        if event.type==pygame.KEYDOWN:
+            if event.key==pygame.K_SPACE:
+                if player.at_end:
+                    player.seek(0)
+                self.playing=not self.playing
+            elif event.key==pygame.K_LEFT:
+                self.seek(player.shot-1)
+                    # 발사 시점이든 날아가는 중이든 한 발 전 시점
+            elif event.key==pygame.K_RIGHT:
+                self.seek(player.shot+1 if player.at_shot(player.shot) else player.shot)
+            elif event.key==pygame.K_PAGEUP:
+                self.seek(player.shot-10)
+            elif event.key==pygame.K_PAGEDOWN:
+                self.seek(player.shot+10)
+            elif event.key==pygame.K_HOME:
+                self.seek(0)
+            elif event.key==pygame.K_END:
+                self.seek(player.shot_total)
+            elif pygame.K_1<=event.key<pygame.K_1+len(SPEEDS):
+                self.speed_idx=event.key-pygame.K_1
+        elif event.type==pygame.MOUSEBUTTONDOWN and event.button==1:
+            if self.bar_rect.inflate(0,int(20*SCALE)).collidepoint(event.pos):
+                frac=(event.pos[0]-self.bar_rect.left)/max(1,self.bar_rect.width)
+                self.seek(round(frac*player.shot_total))
+
+    def seek(self,shot:int)->None:
+        self.playing=False
+        self.player.seek(shot)
+
+    def play_frame(self)->None:
+        """속도만큼 진행함. 중간 상태는 그리지 않음."""
+        player=self.player
+        speed=SPEEDS[self.speed_idx]
+        if speed>0:
+            for _ in range(speed):
+                if not player.advance():
+                    break
+        else:
+            deadline=time.perf_counter()+UNBOUNDED_BUDGET_MS/1000
+            while time.perf_counter()<deadline and player.advance():
+                pass
+        if player.at_end:
+            self.playing=False
+
+    def draw(self,screen:pygame.Surface)->None:
+        screen.fill((10,20,30))
+        if self.player is None:
+            text=render_text(self.font,self.message,(255,255,255))
+            screen.blit(text,text.get_rect(center=(SCREEN_WIDTH//2,SCREEN_HEIGHT//2)))
+            return
+
+        player=self.player
+        sim=player.sim
+        game_rect=pygame.Rect(*sim.game_area)
+        pygame.draw.rect(screen,(0,100,200),game_rect)
+        pygame.draw.line(screen,(0,255,3),(game_rect.left,sim.game_over_line),
+                         (game_rect.right,sim.game_over_line),10)
+        draw_grid(screen,sim.grid)
+
+        # 발사 방향
+        end=pygame.math.Vector2(1,0).rotate(-sim.cannon_angle)*int(120*SCALE)
+        pygame.draw.line(screen,(255,255,255),(sim.cannon_x,sim.cannon_y),
+                         (sim.cannon_x+end.x,sim.cannon_y+end.y),max(2,int(4*SCALE)))
+        if sim.current_bubble:
+            draw_bubble(screen,sim.current_bubble)
+        if sim.next_bubble:
+            nb=sim.next_bubble
+            x,y=nb.x,nb.y
+            nb.x,nb.y=game_rect.right+int(80*SCALE),sim.cannon_y
+            draw_bubble(screen,nb)
+            nb.x,nb.y=x,y
+
+        # 진행 막대
+        pygame.draw.rect(screen,(60,60,60),self.bar_rect)
+        if player.shot_total:
+            filled=self.bar_rect.copy()
+            filled.width=int(self.bar_rect.width*player.shot/player.shot_total)
+            pygame.draw.rect(screen,(100,255,100),filled)
+
+        n=bisect.bisect_right(self.stage_pos,player.pos-1)-1
+        stage=self.stage_index[n]+1 if n>=0 else 0
+        speed=SPEEDS[self.speed_idx]
+        state='PLAY' if self.playing else 'PAUSE'
+        hud=(f'{state}  x{speed if speed else "MAX"}   SHOT {player.shot}/{player.shot_total}'
+             f'   STAGE {stage}   SCORE {sim.score}')
+        text=render_text(self.font,hud,(255,255,255))
+        screen.blit(text,(int(30*SCALE),int(20*SCALE)))
+        info=render_text(self.small_font,self.message,(180,180,180))
+        screen.blit(info,(int(30*SCALE),int(20*SCALE)+text.get_height()))
+        help_text=render_text(self.small_font,
+                              'SPACE 재생/정지  ←/→ 1발  PgUp/PgDn 10발  1-4 속도  ESC 메뉴',(180,180,180))
+        screen.blit(help_text,help_text.get_rect(midbottom=(SCREEN_WIDTH//2,self.bar_rect.top-int(10*SCALE))))
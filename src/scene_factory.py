@@ -1,12 +1,36 @@
-from menu_scene import MenuScene
-from game_scene_wrapper import GameSceneWrapper
-from editor_scene import EditorScene
+import importlib
+
+from startup_profiler import PROFILER
+
+# 씬 이름 -> (모듈, 클래스). 모듈은 그 씬이 처음 요청될 때 임포트함
+# (메뉴를 띄우는 데 게임/에디터 모듈을 미리 읽을 필요 없음).
+SCENE_MODULES={
+    'menu':('menu_scene','MenuScene'),
+    'game':('game_scene_wrapper','GameSceneWrapper'),
+    'editor':('editor_scene','EditorScene'),
+    'replay':('replay_scene','ReplayScene'),
+}
 
 def scene_factory(name,manager):
-    if name=='menu':
-        return MenuScene(manager)
-    if name=='game':
-        return GameSceneWrapper(manager)
-    if name=='editor':
-        return EditorScene(manager)
-    raise ValueError(f'unknown scene: {name}')
+    if name not in SCENE_MODULES:
+        raise ValueError(f'unknown scene: {name}')
+    module_name,class_name=SCENE_MODULES[name]
+    with PROFILER.span('import',module_name):
+        module=importlib.import_module(module_name)
+    return getattr(module,class_name)(manager)
+
+def prewarm_scene(name):
+    """씬 모듈을 임포트하고 모듈의 preload()가 있으면 불러서 에셋을 미리 디코딩함.
+
+    SceneManager가 백그라운드 스레드에서 호출함. 실패해도 실제 전환 때 다시 시도되므로 무시함.
+    """
+    if name not in SCENE_MODULES:
+        return
+    module_name,_=SCENE_MODULES[name]
+    try:
+        module=importlib.import_module(module_name)
+        preload=getattr(module,'preload',None)
+        if preload is not None:
+            preload()
+    except Exception as e:
+        print(f'씬 미리 준비 실패: {name} - {e}')
@@ -1,13 +1,47 @@
+import threading
+
 class SceneManager:
-    def __init__(self,scene_factory):
+    """씬 전환 관리.
+
+    persistent=True면 한 번 만든 씬 인스턴스를 이름별로 보관해서 재사용함.
+    씬이 enter()/exit()를 가지고 있으면 들어갈 때/나올 때 호출함 (상태 초기화는 enter에서).
+    씬의 likely_next 속성에 적힌 다음 씬은 prewarm 함수로 백그라운드에서 미리 준비함.
+    """
+    def __init__(self,scene_factory,persistent=True,prewarm=None):
         self.scene_factory=scene_factory
+        self.persistent=persistent
+        self.prewarm_fn=prewarm
+            # name -> None. 모듈 임포트, 에셋 디코딩 등 (백그라운드 스레드에서 실행)
+        self.scenes={}
+        self.prewarmed=set()
         self.current_scene=None
 
+    def get_scene(self,name):
+        scene=self.scenes.get(name)
+        if scene is None:
+            scene=self.scene_factory(name,self)
+            if self.persistent:
+                self.scenes[name]=scene
+        return scene
+
+    def prewarm(self,name):
+        if self.prewarm_fn is None or name in self.prewarmed or name in self.scenes:
+            return
+        self.prewarmed.add(name)
+        threading.Thread(target=self.prewarm_fn,args=(name,),daemon=True).start()
+
     def run(self,initial_scene_name):
         scene_name=initial_scene_name
         while scene_name is not None:
-            self.current_scene=self.scene_factory(scene_name,self)
+            self.current_scene=self.get_scene(scene_name)
             if not hasattr(self.current_scene,'run'):
                 raise AttributeError(f'scene {scene_name} has no run()')
+            if hasattr(self.current_scene,'enter'):
+                self.current_scene.enter()
+            next_hint=getattr(self.current_scene,'likely_next',None)
+            if next_hint:
+                self.prewarm(next_hint)
             scene_name=self.current_scene.run()
+            if hasattr(self.current_scene,'exit'):
+                self.current_scene.exit()
         # None 리턴되면 전체 게임 종료
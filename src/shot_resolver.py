@@ -0,0 +1,180 @@
+import math
+    # 궤적 계산 위해
+from typing import List,NamedTuple,Tuple
+
+from config import BUBBLE_RADIUS
+from hex_grid import HexGrid,side_walls
+
+# 프레임 단위 Bubble.move 반복 대신, 벽 반사와 원-원 충돌을 해석적으로 풀어서
+# 발사 한 번의 착지 셀을 한 번에 구함. 프레임 속도와 무관하게 같은 결과가 나오고
+# BUBBLE_SPEED가 커져도 버블을 뚫고 지나가지 않음.
+
+MAX_BOUNCES:int=256
+    # 거의 수평으로 쏠 때 무한 반사 방지용 상한
+
+class ResolvedShot(NamedTuple):
+    """해석적으로 구한 발사 결과"""
+    row:int
+    col:int
+        # 붙을 셀
+    x:float
+    y:float
+        # 처음 닿은 순간의 버블 중심
+    path:List[Tuple[float,float]]
+        # 발사 지점, 벽 반사 지점들, 충돌 지점 순서의 꺾은선
+
+def _first_hit_time(px:float,py:float,dx:float,dy:float,
+                    cx:float,cy:float,hit_dist:float)->float:
+    """단위 방향 (dx,dy)로 움직이는 점이 (cx,cy)에서 hit_dist 안으로 처음 들어가는 거리.
+
+    안 닿으면 inf 반환함.
+    """
+    ox=px-cx
+    oy=py-cy
+    c=ox*ox+oy*oy-hit_dist*hit_dist
+    if c<=0:
+        return 0.0
+        # 이미 겹쳐 있음
+    b=ox*dx+oy*dy
+    if b>=0:
+        return math.inf
+        # 멀어지는 중
+    disc=b*b-c
+    if disc<0:
+        return math.inf
+    return -b-math.sqrt(disc)
+
+class PathSegment(NamedTuple):
+    """벽/천장 사이를 곧게 가는 궤적 한 구간 (버블 충돌 전)"""
+    x:float
+    y:float
+        # 구간 시작 지점
+    dx:float
+    dy:float
+        # 단위 방향
+    length:float
+    ceiling:bool
+        # 구간 끝이 천장인지 (아니면 좌/우 벽 반사)
+
+Target=Tuple[float,float,float]
+    # (화면 x, 화면 y, 닿는 거리)
+
+class ShotTargets(NamedTuple):
+    """충돌 대상 목록 (발사 여러 번에 같이 씀)"""
+    items:List[Target]
+        # 아래쪽(y가 큰 것)부터 정렬
+    reach:float
+        # 가장 큰 닿는 거리
+
+def trace_path(x:float,y:float,angle_degree:float,ceiling:float,
+               radius:int=BUBBLE_RADIUS)->List[PathSegment]:
+    """버블이 없다고 보고 (x,y)에서 쏜 궤적을 벽 반사 구간들로 나눔.
+
+    그리드 내용과 무관하고 천장 위치(벽 위치)에만 의존하므로 발사 지점/각도/천장별로 캐시해도 됨.
+
+    Args:
+        ceiling (float): 버블 중심이 이 y 이하로 가면 천장에 닿음.
+    """
+    rad=math.radians(angle_degree)
+    dx=math.cos(rad)
+    dy=-math.sin(rad)
+
+    grid_x_start,grid_x_end=side_walls()
+    left=grid_x_start+radius
+    right=grid_x_end-radius
+
+    segments=[]
+    for _ in range(MAX_BOUNCES):
+        if dx>0:
+            t_wall=(right-x)/dx
+        elif dx<0:
+            t_wall=(left-x)/dx
+        else:
+            t_wall=math.inf
+        t_wall=max(t_wall,0.0)
+        t_ceiling=max((ceiling-y)/dy,0.0) if dy<0 else math.inf
+        t_end=min(t_wall,t_ceiling)
+        segments.append(PathSegment(x,y,dx,dy,t_end,t_ceiling<=t_wall))
+        if t_ceiling<=t_wall:
+            break
+        x,y=x+dx*t_end,y+dy*t_end
+        dx=-dx
+            # 좌/우 벽 반사
+    return segments
+
+def shot_targets(grid:HexGrid,radius:int=BUBBLE_RADIUS)->ShotTargets:
+    """붙어있는 버블/장애물을 충돌 대상으로 만듦."""
+    wall=grid.wall_offset
+        # 붙어있는 객체 좌표는 그리드 기준이므로 벽 위치를 더해서 화면 좌표로 씀
+    items=[(b.x,b.y+wall,radius+b.radius-2) for b in grid.bubble_list]
+    items.extend((ob.x,ob.y+wall,radius+ob.radius-2) for ob in grid.obs_list)
+    items.sort(key=lambda t:-t[1])
+    return ShotTargets(items,max((t[2] for t in items),default=0.0))
+
+def land_on_path(grid:HexGrid,segments:List[PathSegment],targets:ShotTargets,
+                 warn:bool=True)->ResolvedShot:
+    """trace_path 궤적을 따라가다 처음 닿는 버블(없으면 천장)에서 붙을 셀을 구함.
+
+    궤적은 항상 위로 올라가므로 아래쪽 대상부터 보다가, 지금까지 찾은 충돌보다
+    먼저 닿을 수 없는 높이까지 올라가면 나머지 대상은 안 봄.
+
+    Args:
+        targets (ShotTargets): shot_targets() 결과.
+        warn (bool): 붙을 빈 셀을 못 찾았을 때 경고 출력 여부.
+    """
+    items=targets.items
+    reach=targets.reach
+    first=segments[0]
+    path=[(first.x,first.y)]
+    for seg in segments:
+        x,y,dx,dy,t_end=seg.x,seg.y,seg.dx,seg.dy,seg.length
+        t_hit=math.inf
+        limit=t_end
+            # min(t_hit,t_end)
+        for cx,cy,hit_dist in items:
+            if dy<0:
+                if cy-reach>y:
+                    continue
+                    # 시작 지점보다 아래 (멀어지기만 함)
+                if y-cy-reach>-dy*limit:
+                    break
+                    # 이 위쪽 대상들은 더 늦게 닿음
+            t=_first_hit_time(x,y,dx,dy,cx,cy,hit_dist)
+            if t<t_hit:
+                t_hit=t
+                if t<limit:
+                    limit=t
+
+        if t_hit<=t_end:
+            hx,hy=x+dx*t_hit,y+dy*t_hit
+            path.append((hx,hy))
+            r,c=grid.nearest_grid_to_point(hx,hy,warn)
+            return ResolvedShot(r,c,hx,hy,path)
+
+        x,y=x+dx*t_end,y+dy*t_end
+        path.append((x,y))
+        if seg.ceiling:
+            _,c=grid.nearest_grid_to_point(x,y,warn)
+            return ResolvedShot(0,c,x,y,path)
+
+    # 반사 상한 넘으면 마지막 위치 기준으로 붙임
+    r,c=grid.nearest_grid_to_point(x,y,warn)
+    return ResolvedShot(r,c,x,y,path)
+
+def resolve_shot(grid:HexGrid,x:float,y:float,angle_degree:float,
+                 radius:int=BUBBLE_RADIUS)->ResolvedShot:
+    """(x,y)에서 angle_degree로 쏜 버블이 붙을 셀을 구함.
+
+    Args:
+        grid (HexGrid): 현재 그리드 (버블/장애물 위치, 천장 위치 사용).
+        x (float): 발사 지점 x.
+        y (float): 발사 지점 y.
+        angle_degree (float): 발사 각도 (90 = 정면).
+        radius (int): 발사 버블 반지름.
+
+    Returns:
+        ResolvedShot: 착지 셀과 충돌 지점, 궤적
+    """
+    ceiling=grid.y_offset+grid.wall_offset+radius
+    segments=trace_path(x,y,angle_degree,ceiling,radius)
+    return land_on_path(grid,segments,shot_targets(grid,radius))
@@ -0,0 +1,385 @@
+import math
+    # 거리 계산 위해
+import random
+    # 난수 생성 위해
+from typing import List,NamedTuple,Optional,Tuple
+
+from config import (
+    SCREEN_WIDTH,SCREEN_HEIGHT,CELL_SIZE,BUBBLE_RADIUS,
+    LAUNCH_COOLDOWN,MAP_ROWS,MAP_COLS,SCALE,
+    CANNON_MIN_ANGLE,CANNON_MAX_ANGLE,CANNON_ANGLE_SPEED
+)
+from constants import Action
+from color_settings import COLORS
+from hex_grid import Bubble,HexGrid,clamp
+from shot_resolver import resolve_shot
+
+# 디스플레이/사운드 없이 게임 한 판을 진행하는 순수 파이썬 엔진.
+# Game(game.py)은 이 엔진 위에서 입력 변환과 렌더링만 담당함.
+
+class ShotResult(NamedTuple):
+    """발사 한 번의 결과"""
+    row:int
+    col:int
+        # 버블이 붙은 셀
+    popped:int
+        # 같은 색 매칭으로 터진 개수
+    dropped:int
+        # 천장과 끊겨서 떨어진 개수
+
+class SimState(NamedTuple):
+    """Simulator.snapshot()이 남기는 판 상태 (리플레이 되감기용)"""
+    rows:Tuple[str,...]
+        # 맵 (행마다 셀 문자를 이은 문자열)
+    wall_offset:int
+    score:int
+    fire_count:int
+    items:Tuple[int,int,int]
+        # (swap, raise, rainbow) 남은 개수
+    cannon_angle:float
+    current:Optional[Tuple[str,float,float,float,bool]]
+        # 현재 버블 (색, x, y, 각도, 날아가는 중)
+    next_color:Optional[str]
+    fire_in_air:bool
+    rng_state:tuple
+
+# ======== Simulator ========
+class Simulator:
+    def __init__(self,rows:int=MAP_ROWS,cols:int=MAP_COLS,
+                 instant_resolve:bool=False,grid_cls:type=HexGrid,
+                 seed:Optional[int]=None)->None:
+        # 화면 배치 계산 (Game의 게임 영역과 동일한 좌표계 사용)
+        map_pixel_width=(cols*CELL_SIZE)+(CELL_SIZE//2)
+        self.grid_x_offset:int=((SCREEN_WIDTH-map_pixel_width)//2)+int(25*SCALE)
+        self.grid_y_offset:int=int(30*SCALE)
+
+        padding=int(10*SCALE)
+        game_area_w=map_pixel_width+(padding*2)
+        game_area_h=int(SCREEN_HEIGHT-self.grid_y_offset)
+        game_area_x=(SCREEN_WIDTH-game_area_w)//2
+        game_area_y=self.grid_y_offset-padding
+        self.game_area:tuple[int,int,int,int]=(game_area_x,game_area_y,game_area_w,game_area_h)
+            # (x,y,w,h) - Game에서 pygame.Rect로 변환해서 사용
+
+        self.grid:HexGrid=grid_cls(rows,cols,CELL_SIZE,
+                                   0,
+                                   self.grid_x_offset,self.grid_y_offset)
+            # grid_cls=CompactHexGrid로 주면 bytearray 기반 그리드 사용
+
+        self.cannon_x:int=game_area_x+game_area_w//2
+        self.cannon_y:int=game_area_y+game_area_h-int(170*SCALE)
+        self.cannon_angle:float=90
+
+        self.game_over_line:float=self.cannon_y-CELL_SIZE*0.5
+
+        self.current_bubble:Optional[Bubble]=None
+        self.next_bubble:Optional[Bubble]=None
+        self.fire_in_air:bool=False
+        self.fire_count:int=0
+        self.score:int=0
+        self.instant_resolve:bool=instant_resolve
+            # True면 FIRE 입력 시 프레임 이동 없이 바로 착지시킴
+        self.rng:random.Random=random.Random(seed)
+            # 버블 색 뽑기용 난수 (같은 seed + 같은 입력이면 같은 판이 나옴)
+
+        self.item_swap_count:int=3
+            # 버블 스왑 아이템 개수
+        self.item_raise_count:int=3
+            # 벽 한 줄 올리기 아이템 개수
+        self.item_rainbow_count:int=3
+            # 무지개 버블 아이템 개수
+
+    def load_stage(self,stage_map:List[List[str]])->None:
+        self.grid.wall_offset=0
+        self.grid.y_offset=self.grid_y_offset
+
+        self.grid.load_from_stage(stage_map)
+
+        self.current_bubble=None
+        self.next_bubble=None
+        self.fire_in_air=False
+        self.fire_count=0
+
+        self.prepare_bubbles()
+
+    # ---------- 상태 저장/복원 ----------
+    def snapshot(self)->SimState:
+        """지금 판 상태를 작은 값 묶음으로 남김 (버블 객체 대신 셀 문자열)."""
+        b=self.current_bubble
+        current=(b.color,b.x,b.y,b.angle_degree,b.in_air) if b else None
+        return SimState(
+            tuple(''.join(row) for row in self.grid.map),
+            self.grid.wall_offset,self.score,self.fire_count,
+            (self.item_swap_count,self.item_raise_count,self.item_rainbow_count),
+            self.cannon_angle,current,
+            self.next_bubble.color if self.next_bubble else None,
+            self.fire_in_air,self.rng.getstate(),
+        )
+
+    def restore(self,state:SimState)->None:
+        """snapshot()으로 남긴 상태로 되돌림. 이후 같은 입력을 주면 같은 결과가 나옴."""
+        self.grid.load_from_stage([list(row) for row in state.rows])
+        self.grid.wall_offset=state.wall_offset
+            # 붙어있는 버블 좌표는 벽 위치와 무관하므로 오프셋만 맞추면 됨
+        self.score=state.score
+        self.fire_count=state.fire_count
+        self.item_swap_count,self.item_raise_count,self.item_rainbow_count=state.items
+        self.cannon_angle=state.cannon_angle
+        self.current_bubble=None
+        if state.current is not None:
+            color,x,y,angle,in_air=state.current
+            self.current_bubble=Bubble(x,y,color)
+            self.current_bubble.set_angle(angle)
+            self.current_bubble.in_air=in_air
+        self.next_bubble=None
+        if state.next_color is not None:
+            self.next_bubble=Bubble(self.cannon_x,self.cannon_y,state.next_color)
+        self.fire_in_air=state.fire_in_air
+        self.rng.setstate(state.rng_state)
+
+    # ---------- 버블 준비 ----------
+    def random_color_from_map(self)->str:
+        colors=self.grid.present_colors()
+            # 그리드가 세고 있는 색 카운터 사용 (버블 목록 안 훑음)
+        if not colors:
+            colors=list(COLORS.keys())
+        return self.rng.choice(colors)
+
+    def create_bubble(self)->Bubble:
+        color=self.random_color_from_map()
+        b=Bubble(self.cannon_x,self.cannon_y,color)
+        return b
+
+    def prepare_bubbles(self)->None:
+        if self.next_bubble is not None:
+            self.current_bubble=self.next_bubble
+        else:
+            self.current_bubble=self.create_bubble()
+        self.current_bubble.x,self.current_bubble.y=self.cannon_x,self.cannon_y
+        self.current_bubble.in_air=False
+        self.next_bubble=self.create_bubble()
+
+    # ---------- 입력 ----------
+    def rotate(self,delta:float)->None:
+        self.cannon_angle+=delta
+        self.cannon_angle=clamp(self.cannon_angle,CANNON_MIN_ANGLE,CANNON_MAX_ANGLE)
+
+    def launch(self)->bool:
+        """현재 각도로 버블 발사 시작함. 이미 날아가는 중이면 무시함."""
+        if self.current_bubble is None or self.fire_in_air:
+            return False
+        self.fire_in_air=True
+        self.current_bubble.in_air=True
+        self.current_bubble.set_angle(self.cannon_angle)
+        return True
+
+    def step(self,*actions:Action)->Optional[ShotResult]:
+        """한 프레임 진행함.
+
+        Args:
+            *actions (Action): 이번 프레임 입력 (주어진 순서대로 처리).
+
+        Returns:
+            Optional[ShotResult]: 이번 프레임에 버블이 붙었으면 그 결과
+        """
+        result=None
+        for action in actions:
+            if action==Action.FIRE:
+                if self.instant_resolve:
+                    result=self.fire()
+                else:
+                    self.launch()
+            elif action==Action.SWAP:
+                self.use_item_swap()
+            elif action==Action.RAISE:
+                self.use_item_raise()
+            elif action==Action.RAINBOW:
+                self.use_item_rainbow()
+            elif action==Action.LEFT:
+                self.rotate(+CANNON_ANGLE_SPEED)
+            elif action==Action.RIGHT:
+                self.rotate(-CANNON_ANGLE_SPEED)
+
+        if self.current_bubble and self.fire_in_air:
+            return self.advance()
+        return result
+
+    def fire(self,angle:Optional[float]=None)->Optional[ShotResult]:
+        """발사하고 착지까지 프레임 없이 바로 진행함 (헤드리스용).
+
+        착지 셀은 shot_resolver가 해석적으로 한 번에 계산함.
+
+        Args:
+            angle (Optional[float]): 발사 각도. None이면 현재 발사대 각도 사용.
+
+        Returns:
+            Optional[ShotResult]: 착지 결과. 발사할 버블이 없으면 None
+        """
+        if angle is not None:
+            self.cannon_angle=clamp(angle,CANNON_MIN_ANGLE,CANNON_MAX_ANGLE)
+        if not self.launch():
+            return None
+        bubble=self.current_bubble
+        shot=resolve_shot(self.grid,bubble.x,bubble.y,bubble.angle_degree,bubble.radius)
+        bubble.x,bubble.y=shot.x,shot.y
+        return self.end_shot(self.attach(shot.row,shot.col))
+
+    # ---------- 발사체 진행 ----------
+    def advance(self)->Optional[ShotResult]:
+        """날아가는 버블을 한 칸 이동시키고 충돌하면 붙임."""
+        self.current_bubble.move()
+
+        if self.current_bubble.y<-BUBBLE_RADIUS:
+            self.fire_in_air=False
+            self.prepare_bubbles()
+            return None
+
+        result=self.process_collision_and_attach()
+        if result is not None:
+            self.end_shot(result)
+        return result
+
+    def end_shot(self,result:ShotResult)->ShotResult:
+        """착지 후 처리 (발사 횟수, 벽 하강, 다음 버블 준비)."""
+        self.fire_count+=1
+        if self.fire_count>=LAUNCH_COOLDOWN:
+            self.grid.drop_wall()
+            self.fire_count=0
+        self.current_bubble=None
+        self.fire_in_air=False
+        self.prepare_bubbles()
+        return result
+
+    def process_collision_and_attach(self)->Optional[ShotResult]:
+        if self.current_bubble is None:
+            return None
+
+        if self.current_bubble.y-self.current_bubble.radius<=(
+            self.grid.y_offset+self.grid.wall_offset
+        ):
+            r,c=self.grid.nearest_grid_to_point(self.current_bubble.x,self.current_bubble.y)
+            r=0
+            return self.attach(r,c)
+
+        # 주변 셀의 버블/장애물만 검사 (장애물 근처에 붙어도 매칭 체크는 해야 함)
+        for occ in self.grid.nearby_occupants(self.current_bubble.x,self.current_bubble.y):
+            ox,oy=self.grid.world_pos(occ)
+            dist=math.hypot(self.current_bubble.x-ox,self.current_bubble.y-oy)
+            if dist<=self.current_bubble.radius+occ.radius-2:
+                r,c=self.grid.nearest_grid_to_point(self.current_bubble.x,self.current_bubble.y)
+                return self.attach(r,c)
+
+        return None
+
+    def attach(self,r:int,c:int)->ShotResult:
+        self.grid.place_bubble(self.current_bubble,r,c)
+        popped,dropped=self.pop_if_match(r,c)
+        return ShotResult(r,c,popped,dropped)
+
+    def pop_if_match(self,row:int,col:int)->tuple[int,int]:
+        """매칭되면 터트리고 (터진 개수, 떨어진 개수) 반환함."""
+        if self.current_bubble is None:
+            return 0,0
+
+        if not self.grid.is_in_bounds(row,col):
+            return 0,0
+
+        color=self.grid.map[row][col]
+        if color not in COLORS:
+            return 0,0
+
+        visited=set()
+        self.grid.dfs_same_color(row,col,color,visited)
+
+        if len(visited)>=3:
+            self.grid.remove_cells(visited)
+            # 터진 셀 주변 덩어리만 천장 연결 여부 확인
+            seeds={n for cell in visited for n in self.grid.get_neighbors(*cell)}
+            dropped=self.grid.remove_hanging(seeds-visited)
+            self.score+=len(visited)*10
+            return len(visited),len(dropped)
+        return 0,0
+
+    # ---------- 상태 판정 ----------
+    def is_stage_cleared(self)->bool:
+        return self.grid.bubble_count==0
+
+    def lowest_bubble_bottom(self)->int:
+        return self.grid.lowest_bubble_bottom()
+            # 그리드가 가장 아래 버블 행을 세고 있으므로 버블 목록 안 훑음
+
+    def is_game_over(self)->bool:
+        return self.lowest_bubble_bottom()>self.game_over_line
+
+    # ---------- 아이템 ----------
+    def use_item_swap(self)->None:
+        """현재 버블과 다음 버블 스왑함.
+        """
+        if self.item_swap_count<=0:
+            print("No SWAP items left.")
+            return
+        if self.current_bubble is None or self.next_bubble is None:
+            print("Cannot swap: one of the bubbles is missing.")
+            return
+
+        self.current_bubble.color,self.next_bubble.color\
+            =self.next_bubble.color,self.current_bubble.color
+
+        self.item_swap_count-=1
+        print(f"SWAP used. Remaining: {self.item_swap_count}")
+
+    def use_item_raise(self)->None:
+        """벽을 한 줄 올림.
+        """
+        if self.item_raise_count<=0:
+            print("No RAISE items left.")
+            return
+
+        # HexGrid에 위임
+        before_offset=self.grid.wall_offset
+        self.grid.raise_wall()
+
+        if self.grid.wall_offset==before_offset:
+            print("Cannot RAISE: wall is already at the top.")
+            return
+
+        self.item_raise_count-=1
+        print(f"RAISE used. Remaining: {self.item_raise_count}")
+
+    def best_color_for_rainbow(self)->str:
+        """현재 맵에서 가장 많이 남아있는 색 선택함.
+
+        Returns:
+            str: 가장 많이 등장한 색을 반환
+        """
+        color_count=self.grid.color_counts
+
+        # 맵 거의 비어있으면 그냥 랜덤 색
+        if self.grid.bubble_count==0:
+            return self.rng.choice(list(COLORS.keys()))
+        # 가장 많이 등장한 색 반환함.
+        best=max(color_count,key=color_count.get)
+        return best
+
+    def use_item_rainbow(self)->None:
+        """현재 버블을 최적의 색으로 변경함.
+        """
+        if self.item_rainbow_count<=0:
+            print("No RAINBOW items left.")
+            return
+        if self.current_bubble is None:
+            print("Cannot use RAINBOW: current bubble is missing.")
+            return
+
+        # 변환 전 색상 저장
+        original_color = self.current_bubble.color
+
+        # 최적 색상으로 변환
+        best_color = self.best_color_for_rainbow()
+        self.current_bubble.color = best_color
+
+        self.item_rainbow_count -= 1
+
+        # 변환 전후 색상 출력
+        print(f"🌈 RAINBOW: {original_color} → {best_color}")
+        print(f"RAINBOW used. Remaining: {self.item_rainbow_count}")
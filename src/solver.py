@@ -0,0 +1,285 @@
+import time
+    # 프레임당 시간 예산 위해
+from typing import Dict,Generator,List,NamedTuple,Optional,Tuple
+
+from config import BUBBLE_RADIUS,CANNON_MIN_ANGLE,CANNON_MAX_ANGLE,LAUNCH_COOLDOWN
+from color_settings import COLORS
+from hex_grid import Bubble,HexGrid
+from compact_grid import CompactHexGrid
+from shot_resolver import PathSegment,ResolvedShot,land_on_path,shot_targets,trace_path
+from simulator import Simulator
+
+# 발사 각도를 일정 간격으로 전부 훑어서 가장 많이 터트리는 각도를 고르는 봇.
+# 게임의 힌트 버튼과 자동 플레이가 씀 (pygame 비의존이라 헤드리스로도 돌릴 수 있음).
+#
+# 게임 프레임을 밀리지 않도록:
+#   - 벽 반사 궤적은 그리드 내용과 무관하므로 벽 위치별로 한 번만 계산해 둠
+#   - 충돌 검사는 shot_resolver.land_on_path가 아래쪽 대상부터 보다가 일찍 끊음
+#   - 각도는 2도 간격으로 먼저 쏴 보고, 옆 각도와 착지 셀이 다른 구간만 0.5도 간격으로 다시 쏨
+#   - 같은 셀에 붙는 각도들은 한 번만 평가하고, 한 수 내다보기는 1등과 동점인 후보만 함
+#   - 게임에서는 solve()를 프레임마다 budget_ms만큼씩 나눠서 진행함 (궤적 계산/평가도 중간중간 끊김)
+
+ANGLE_STEP:float=0.5
+    # 훑는 각도 간격
+COARSE_STRIDE:int=4
+    # 먼저 이만큼 건너뛰며 쏴 보고 (ANGLE_STEP*4 = 2도), 착지 셀이 바뀌는 구간만 촘촘히 다시 쏨
+LOOKAHEAD:int=2
+    # 다음 버블 색으로 한 수 더 내다볼 최대 후보 수 (1등과 순위가 같은 후보만)
+CHUNK:int=16
+    # 나눠서 풀 때 시간 확인 사이에 쏘는 각도 수
+TRACE_CACHE_SIZE:int=8
+    # 궤적을 들고 있을 벽 위치 개수
+
+class Move(NamedTuple):
+    """봇이 고른 발사"""
+    angle:float
+    row:int
+    col:int
+        # 붙을 셀
+    popped:int
+    dropped:int
+        # 이번 발사로 터지는/떨어지는 개수
+    path:List[Tuple[float,float]]
+        # 발사 지점부터 충돌 지점까지 꺾은선 (힌트 표시용)
+
+class Outcome(NamedTuple):
+    """한 착지 셀에 붙였을 때의 결과"""
+    popped:int
+    dropped:int
+    cluster:int
+        # 붙인 버블과 이어진 같은 색 개수 (터졌으면 터진 개수)
+    lost:bool
+        # 붙인 뒤 게임 오버 선을 넘는지
+    grid:CompactHexGrid
+        # 붙이고 터트린 뒤의 그리드
+
+class Landing(NamedTuple):
+    """같은 셀에 붙는 각도 묶음"""
+    index:int
+        # 대표 각도 인덱스 (가장 긴 구간의 가운데)
+    sampled:int
+        # 실제로 쏴서 이 셀에 붙는 걸 확인한 각도 인덱스
+    count:int
+        # 이 셀에 붙는 각도 수
+
+Steps=Generator[None,None,object]
+    # 나눠서 진행하는 작업 (yield마다 시간 확인, 끝나면 return 값이 결과)
+
+class Solver:
+    def __init__(self,x:float,y:float,min_angle:float=CANNON_MIN_ANGLE,
+                 max_angle:float=CANNON_MAX_ANGLE,step:float=ANGLE_STEP,
+                 radius:int=BUBBLE_RADIUS,game_over_line:Optional[float]=None)->None:
+        """
+        Args:
+            x (float): 발사 지점 x.
+            y (float): 발사 지점 y.
+            min_angle (float): 훑을 최소 각도.
+            max_angle (float): 훑을 최대 각도.
+            step (float): 각도 간격.
+            radius (int): 발사 버블 반지름.
+            game_over_line (Optional[float]): 주면 이 선을 넘기는 발사를 피함.
+        """
+        self.x:float=x
+        self.y:float=y
+        self.radius:int=radius
+        self.game_over_line:Optional[float]=game_over_line
+        count=int((max_angle-min_angle)/step)+1
+        self.angles:List[float]=[min_angle+i*step for i in range(count)]
+        self.traces:Dict[float,List[List[PathSegment]]]={}
+            # 천장 y -> 각도별 벽 반사 궤적 (천장은 벽 위치로 정해짐)
+        self.cache_key:Optional[Tuple[int,int,str,Optional[str],bool]]=None
+        self.cache_move:Optional[Move]=None
+            # 마지막 solve() 결과 (힌트는 매 프레임 부르므로 그리드가 그대로면 재사용)
+        self.pending_key:Optional[Tuple[int,int,str,Optional[str],bool]]=None
+        self.pending:Optional[Steps]=None
+            # 시간 예산을 넘겨서 다음 호출로 미룬 solve()
+
+    @classmethod
+    def for_sim(cls,sim:Simulator,**kwargs)->'Solver':
+        """시뮬레이터의 발사 지점/게임 오버 선으로 만듦."""
+        return cls(sim.cannon_x,sim.cannon_y,game_over_line=sim.game_over_line,**kwargs)
+
+    # ---------- 착지 셀 ----------
+    def trajectories(self,grid:HexGrid)->Steps:
+        """각도별 벽 반사 궤적. 결과는 List[List[PathSegment]]. 벽 위치마다 한 번만 계산함."""
+        ceiling=grid.y_offset+grid.wall_offset+self.radius
+        traces=self.traces.get(ceiling)
+        if traces is None:
+            traces=[]
+            for i,angle in enumerate(self.angles):
+                traces.append(trace_path(self.x,self.y,angle,ceiling,self.radius))
+                if i%CHUNK==CHUNK-1:
+                    yield
+            if len(self.traces)>=TRACE_CACHE_SIZE:
+                del self.traces[next(iter(self.traces))]
+                    # 가장 오래된 벽 위치부터 버림
+            self.traces[ceiling]=traces
+        return traces
+
+    def shoot(self,grid:HexGrid,traces:List[List[PathSegment]],index:int)->ResolvedShot:
+        """index번째 각도로 쏜 결과 (궤적 포함)."""
+        return land_on_path(grid,traces[index],shot_targets(grid,self.radius),warn=False)
+
+    def landings(self,grid:HexGrid,refine:bool=True)->Steps:
+        """각도를 훑어서 착지 셀별로 묶음. 결과는 Dict[(row,col),Landing].
+
+        2도 간격으로 먼저 쏘고, refine이면 이웃한 두 각도의 착지 셀이 다를 때만 그 사이를 전부 쏨
+        (양 끝이 같은 셀인 2도 구간은 가운데도 같은 셀로 봄).
+        셀마다 가장 길게 이어지는 각도 구간의 가운데 각도를 대표로 씀
+        (구간 끝 각도는 프레임 단위로 날아갈 때 옆 셀에 붙을 수 있으므로).
+        """
+        targets=shot_targets(grid,self.radius)
+        traces=yield from self.trajectories(grid)
+        last=len(traces)-1
+        cells:Dict[int,Tuple[int,int]]={}
+            # 쏴 본 각도 인덱스 -> 착지 셀
+        coarse=list(range(0,last+1,COARSE_STRIDE))
+        if coarse[-1]!=last:
+            coarse.append(last)
+        todo=[coarse]
+        if refine:
+            for a,b in zip(coarse,coarse[1:]):
+                todo.append(range(a+1,b))
+        for n,indices in enumerate(todo):
+            if n>0 and cells[indices.start-1]==cells[indices.stop]:
+                continue
+            for k,i in enumerate(indices):
+                shot=land_on_path(grid,traces[i],targets,warn=False)
+                cells[i]=(shot.row,shot.col)
+                if k%CHUNK==CHUNK-1:
+                    yield
+
+        found:Dict[Tuple[int,int],Landing]={}
+        longest:Dict[Tuple[int,int],int]={}
+        order=sorted(cells)
+        start=order[0]
+        for prev,i in zip(order,order[1:]+[None]):
+            if i is not None and cells[i]==cells[prev]:
+                continue
+            cell=cells[prev]
+            length=prev-start+1
+            landing=found.get(cell)
+            if landing is None or length>longest[cell]:
+                longest[cell]=length
+                found[cell]=Landing((start+prev)//2,start,length+(landing.count if landing else 0))
+            else:
+                found[cell]=landing._replace(count=landing.count+length)
+            start=i
+        return found
+
+    # ---------- 결과 평가 ----------
+    def evaluate(self,base:CompactHexGrid,row:int,col:int,color:str,drop_wall:bool=False)->Outcome:
+        """base 복사본에 color 버블을 붙이고 Simulator.pop_if_match와 같이 터트려 봄."""
+        grid=base.copy()
+        grid.place_bubble(Bubble(0,0,color),row,col)
+        popped=dropped=0
+        cluster=0
+        if grid.is_in_bounds(row,col) and grid.cell_at(row,col) in COLORS:
+            visited=set()
+            grid.dfs_same_color(row,col,grid.cell_at(row,col),visited)
+            cluster=len(visited)
+            if len(visited)>=3:
+                grid.remove_cells(visited)
+                seeds={n for cell in visited for n in grid.get_neighbors(*cell)}
+                popped=len(visited)
+                dropped=len(grid.remove_hanging(seeds-visited))
+        if drop_wall:
+            grid.drop_wall()
+        lost=self.game_over_line is not None and grid.lowest_bubble_bottom()>self.game_over_line
+        return Outcome(popped,dropped,cluster,lost,grid)
+
+    def best_removal(self,grid:CompactHexGrid,color:str)->Steps:
+        """grid에서 color 버블 한 발로 없앨 수 있는 최대 개수 (한 수 내다보기용).
+
+        동점을 가르는 용도라 2도 간격으로만 훑음.
+        """
+        best=0
+        found=yield from self.landings(grid,refine=False)
+        for row,col in found:
+            yield
+            outcome=self.evaluate(grid,row,col,color)
+            if not outcome.lost:
+                best=max(best,outcome.popped+outcome.dropped)
+        return best
+
+    # ---------- 고르기 ----------
+    def steps(self,grid:HexGrid,color:str,next_color:Optional[str],drop_wall:bool)->Steps:
+        """solve()의 본체. 결과는 Optional[Move]."""
+        base=grid if isinstance(grid,CompactHexGrid) else CompactHexGrid.from_grid(grid)
+        found=yield from self.landings(grid)
+        scored=[]
+        for (row,col),landing in found.items():
+            yield
+            outcome=self.evaluate(base,row,col,color,drop_wall)
+            rank=(not outcome.lost,outcome.popped+outcome.dropped,0,outcome.cluster,-row,landing.count)
+            scored.append((rank,row,col,outcome,landing))
+        if not scored:
+            return None
+        scored.sort(key=lambda s:s[0],reverse=True)
+
+        # 다음 버블로 내다보기는 1등과 (게임 오버 여부, 없애는 개수)가 같은 후보끼리만 가림
+        top=scored[0][0][:2]
+        tied=[s for s in scored[:LOOKAHEAD] if s[0][:2]==top]
+        if next_color is not None and top[0] and len(tied)>1:
+            for n,(rank,row,col,outcome,landing) in enumerate(tied):
+                yield
+                ahead=yield from self.best_removal(outcome.grid,next_color)
+                tied[n]=(rank[:2]+(ahead,)+rank[3:],row,col,outcome,landing)
+            tied.sort(key=lambda s:s[0],reverse=True)
+            scored[0]=tied[0]
+
+        _,row,col,outcome,landing=scored[0]
+        traces=yield from self.trajectories(grid)
+        index=landing.index
+        shot=self.shoot(grid,traces,index)
+        if (shot.row,shot.col)!=(row,col):
+            index=landing.sampled
+            shot=self.shoot(grid,traces,index)
+                # 건너뛴 가운데 각도가 다른 셀에 붙으면 실제로 쏴서 확인한 각도 사용
+        return Move(self.angles[index],row,col,outcome.popped,outcome.dropped,shot.path)
+
+    def solve(self,grid:HexGrid,color:str,next_color:Optional[str]=None,
+              drop_wall:bool=False,budget_ms:Optional[float]=None)->Optional[Move]:
+        """가장 좋은 발사를 고름.
+
+        순서: 게임 오버가 안 되는 것 > 없애는 개수(터짐+떨어짐) > 다음 버블로 없앨 수 있는 개수
+        > 이어지는 같은 색 개수 > 위쪽 셀.
+
+        Args:
+            grid (HexGrid): 현재 그리드 (바꾸지 않음).
+            color (str): 지금 쏠 버블 색.
+            next_color (Optional[str]): 다음 버블 색. 주면 동점인 상위 후보를 한 수 더 내다봄.
+            drop_wall (bool): 이번 발사 뒤에 벽이 내려오는지.
+            budget_ms (Optional[float]): 이번 호출에 쓸 시간. 넘으면 진행 상태를 남기고 None 반환하고,
+                같은 상태로 다시 부르면 이어서 진행함. None이면 끝까지 풂.
+
+        Returns:
+            Optional[Move]: 고른 발사. 쏠 곳이 없거나 아직 푸는 중이면 None
+        """
+        key=(id(grid),grid.version,color,next_color,drop_wall)
+        if key==self.cache_key:
+            return self.cache_move
+        if key!=self.pending_key:
+            self.pending=self.steps(grid,color,next_color,drop_wall)
+            self.pending_key=key
+                # 그리드가 바뀌었으면 하던 건 버리고 새로 시작
+
+        deadline=None if budget_ms is None else time.perf_counter()+budget_ms/1000
+        try:
+            while deadline is None or time.perf_counter()<deadline:
+                next(self.pending)
+        except StopIteration as done:
+            self.pending=None
+            self.pending_key=None
+            self.cache_key=key
+            self.cache_move=done.value
+            return done.value
+        return None
+
+    def suggest(self,sim:Simulator,budget_ms:Optional[float]=None)->Optional[Move]:
+        """시뮬레이터의 지금 상태(현재/다음 버블, 벽 하강 예정)로 solve() 함."""
+        if sim.current_bubble is None or sim.fire_in_air:
+            return None
+        next_color=sim.next_bubble.color if sim.next_bubble else None
+        return self.solve(sim.grid,sim.current_bubble.color,next_color,
+                          sim.fire_count+1>=LAUNCH_COOLDOWN,budget_ms)
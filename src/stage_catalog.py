@@ -0,0 +1,158 @@
+import os
+    # 스테이지 폴더 스캔 위해
+import re
+    # stageN.csv 파일 이름 해석 위해
+from typing import Dict,List,NamedTuple,Optional,Tuple
+
+from asset_paths import ASSET_PATHS
+from hex_grid import load_stage_from_csv
+from stage_pack import StagePack,open_pack
+
+# 어떤 스테이지가 몇 개 있는지를 한 번만 조사해서 메모리에 들고 있는 목록.
+# 스테이지 존재 여부/개수 판단은 전부 이 목록을 보고 하므로 플레이 중에는 파일 시스템을 안 건드림.
+# 파일이 바뀌었을 수 있을 때(새 게임 시작, 에디터 저장 등) refresh()로 명시적으로 다시 조사함.
+# scan()은 목록을 안 바꾸고 mtime만 읽으므로 감시 스레드(stage_watcher.py)에서 불러도 됨.
+# 그 결과를 update()에 넘기면 mtime이 바뀐 스테이지만 골라서 반영함 (팩은 레코드 내용이 바뀐 스테이지만).
+# 팩보다 새로 고친 CSV가 있으면 팩은 오래된 것으로 보고 CSV에서 읽음 (손으로 CSV를 고쳐도 바로 반영).
+
+STAGE_FILE=re.compile(r'stage(\d+)\.csv$')
+
+Snapshot=Dict[str,float]
+    # 경로 -> mtime (스테이지 CSV들과 팩 파일)
+
+class StageInfo(NamedTuple):
+    """스테이지 하나의 메타데이터"""
+    path:str
+        # CSV 경로 (팩에서 읽는 경우 팩 경로)
+    mtime:float
+    size:Optional[Tuple[int,int]]
+        # (rows,cols). CSV는 처음 로드할 때 채워짐
+
+class StageCatalog:
+    def __init__(self,folder:str=ASSET_PATHS['map_data'],
+                 pack_path:str=ASSET_PATHS['stage_pack'])->None:
+        self.folder:str=folder
+        self.pack_path:str=pack_path
+        self.pack:Optional[StagePack]=None
+            # None이면 CSV 파일에서 읽음
+        self.stages:List[StageInfo]=[]
+            # stages[i] = i번째 스테이지 (stage{i+1})
+        self.snapshot:Snapshot={}
+            # 목록을 만들 때 쓴 scan() 결과
+        self.refresh()
+
+    def scan(self)->Snapshot:
+        """폴더/팩의 현재 mtime을 읽음. 목록은 바꾸지 않음."""
+        snapshot:Snapshot={}
+        try:
+            snapshot[self.pack_path]=os.path.getmtime(self.pack_path)
+        except OSError:
+            pass
+        try:
+            with os.scandir(self.folder) as entries:
+                for entry in entries:
+                    if STAGE_FILE.match(entry.name) and entry.is_file():
+                        snapshot[entry.path]=entry.stat().st_mtime
+        except FileNotFoundError:
+            pass
+        return snapshot
+
+    def refresh(self)->List[int]:
+        """폴더/팩을 다시 조사함 (명시적으로 부를 때만). 바뀐 스테이지 번호 반환함."""
+        return self.update(self.scan())
+
+    def update(self,snapshot:Snapshot)->List[int]:
+        """scan() 결과를 목록에 반영함. 추가/삭제/수정된 스테이지 번호 반환함 (0부터).
+
+        팩이 있어도 CSV가 팩보다 새로 고쳐졌거나 CSV 개수가 팩과 다르면 (손으로 CSV를 고친 경우 등)
+        오래된 팩으로 보고 CSV에서 읽음. 에디터가 팩을 다시 만들면 그때부터 다시 팩을 씀.
+        """
+        if snapshot==self.snapshot:
+            return []
+        old=self.stages
+        old_pack=self.pack
+        old_pack_mtime=self.snapshot.get(self.pack_path)
+        self.snapshot=snapshot
+
+        csv_paths=self._csv_paths(snapshot)
+        pack=open_pack(self.pack_path) if self.pack_path in snapshot else None
+        if pack is not None and self._pack_is_stale(pack,snapshot,csv_paths):
+            print(f"스테이지 팩이 CSV보다 오래돼서 CSV에서 읽음: {self.pack_path} "
+                  f"(python src/stage_pack.py 로 다시 만들 수 있음)")
+            pack=None
+        self.pack=pack
+        if pack is not None:
+            entries=[(self.pack_path,snapshot[self.pack_path],(pack.rows,pack.cols))]*len(pack)
+        else:
+            entries=[(path,snapshot[path],None) for path in csv_paths]
+
+        stages:List[StageInfo]=[]
+        changed:List[int]=[]
+        for i,(path,mtime,size) in enumerate(entries):
+            prev=old[i] if i<len(old) else None
+            same=prev is not None and self._unchanged(i,prev,old_pack,old_pack_mtime,csv_paths)
+            if same and prev.path==path and (prev.mtime==mtime or path==self.pack_path):
+                stages.append(prev)
+                    # 안 바뀐 파일은 읽어 둔 크기 정보까지 그대로 씀
+            else:
+                stages.append(StageInfo(path,mtime,size or (prev.size if same else None)))
+            if not same:
+                changed.append(i)
+        self.stages=stages
+        return changed+list(range(len(stages),len(old)))
+
+    def _csv_paths(self,snapshot:Snapshot)->List[str]:
+        """stage1부터 번호가 끊기지 않는 데까지의 CSV 경로 (게임 진행 순서와 같음)."""
+        found:Dict[int,str]={}
+        for path in snapshot:
+            m=STAGE_FILE.match(os.path.basename(path))
+            if m:
+                found[int(m.group(1))]=path
+        paths:List[str]=[]
+        while len(paths)+1 in found:
+            paths.append(found[len(paths)+1])
+        return paths
+
+    def _pack_is_stale(self,pack:StagePack,snapshot:Snapshot,csv_paths:List[str])->bool:
+        """CSV가 있는데 팩보다 새로 고쳐졌거나 개수가 다르면 팩이 CSV를 반영하지 못한 것."""
+        if not csv_paths:
+            return False
+            # 팩만 배포한 경우
+        pack_mtime=snapshot[self.pack_path]
+        return len(csv_paths)!=len(pack) or any(snapshot[path]>pack_mtime for path in csv_paths)
+
+    def _unchanged(self,stage_index:int,prev:StageInfo,old_pack:Optional[StagePack],
+                   old_pack_mtime:Optional[float],csv_paths:List[str])->bool:
+        """prev(지난 목록의 stage_index번)와 지금 읽을 내용이 같은지."""
+        if prev.path!=self.pack_path:
+            return self.snapshot.get(prev.path)==prev.mtime
+                # CSV 그대로면 같음 (새로 생긴 팩도 최신이면 그 CSV로 만든 것)
+        if old_pack is None:
+            return False
+        if self.pack is not None:
+            return old_pack.record(stage_index)==self.pack.record(stage_index)
+                # 팩을 다시 써도 레코드 바이트가 같으면 안 바뀐 스테이지
+        if stage_index>=len(csv_paths) or old_pack_mtime is None:
+            return False
+        return self.snapshot[csv_paths[stage_index]]<=old_pack_mtime
+            # 팩에서 CSV로 넘어갈 때: 팩을 만든 뒤로 안 고친 CSV는 팩과 같은 내용
+
+    @property
+    def count(self)->int:
+        return len(self.stages)
+
+    def exists(self,stage_index:int)->bool:
+        return 0<=stage_index<len(self.stages)
+
+    def load(self,stage_index:int)->Optional[List[List[str]]]:
+        """스테이지 맵 반환함. 목록에 없으면 None."""
+        if not self.exists(stage_index):
+            return None
+        if self.pack is not None:
+            return self.pack.get(stage_index)
+        info=self.stages[stage_index]
+        stage_map=load_stage_from_csv(stage_index,self.folder)
+        if info.size is None and self.stages[stage_index] is info:
+                # 읽는 사이에 update()로 바뀌었으면 건드리지 않음 (로더 스레드에서 불림)
+            self.stages[stage_index]=info._replace(size=(len(stage_map),len(stage_map[0]) if stage_map else 0))
+        return stage_map
@@ -0,0 +1,54 @@
+from concurrent.futures import Future,ThreadPoolExecutor
+    # 워커 스레드에서 로드하기 위해
+from typing import Callable,Dict,List,NamedTuple,Optional
+
+from stage_catalog import Snapshot,StageCatalog
+
+# 스테이지 CSV 파싱과 에셋 디코딩을 워커 스레드 하나에서 처리해서
+# 메인 루프(이벤트 처리, 화면 갱신)가 I/O 때문에 멈추지 않게 함.
+# 어떤 스테이지가 있는지는 StageCatalog가 들고 있음 (팩이 있으면 팩에서 읽음).
+
+class LoadedStage(NamedTuple):
+    """워커 스레드가 준비한 스테이지"""
+    index:int
+    exists:bool
+        # 스테이지 파일이 있는지 (없으면 마지막 스테이지를 깬 것)
+    stage_map:List[List[str]]
+
+def _load_stage(stage_index:int,catalog:StageCatalog)->LoadedStage:
+    stage_map=catalog.load(stage_index)
+    return LoadedStage(stage_index,stage_map is not None,stage_map or [])
+
+class StageLoader:
+    def __init__(self)->None:
+        self.executor:ThreadPoolExecutor=ThreadPoolExecutor(max_workers=1,thread_name_prefix='stage-loader')
+        self.stages:Dict[int,'Future[LoadedStage]']={}
+            # 스테이지 번호 -> 로드 작업 (같은 스테이지는 한 번만 읽음)
+        self.catalog:StageCatalog=StageCatalog()
+            # 스테이지 개수/존재 여부 (sync() 때만 다시 조사)
+
+    def request(self,stage_index:int)->'Future[LoadedStage]':
+        """stage_index 스테이지 로드를 예약함. 이미 예약/완료된 경우 같은 Future 반환함."""
+        future=self.stages.get(stage_index)
+        if future is None:
+            future=self.executor.submit(_load_stage,stage_index,self.catalog)
+            self.stages[stage_index]=future
+        return future
+
+    def submit(self,fn:Callable[[],None])->Future:
+        """에셋 디코딩 같은 임의 작업을 같은 워커에서 실행함."""
+        return self.executor.submit(fn)
+
+    def sync(self,snapshot:Optional[Snapshot]=None)->List[int]:
+        """스테이지 파일 변경을 반영함. 바뀐 스테이지의 캐시만 버리고 그 번호들 반환함.
+
+        Args:
+            snapshot (Optional[Snapshot]): StageWatcher가 읽어 온 mtime. None이면 지금 조사함.
+        """
+        if snapshot is None:
+            snapshot=self.catalog.scan()
+        changed=self.catalog.update(snapshot)
+        for stage_index in changed:
+            self.stages.pop(stage_index,None)
+                # 읽고 있던 중이어도 버림 (다음 request()에서 새로 읽음)
+        return changed
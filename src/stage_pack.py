@@ -0,0 +1,126 @@
+import os
+    # 파일 경로 다루기 위해
+import struct
+    # 헤더/인덱스 바이너리 인코딩 위해
+import sys
+    # 명령행 인자 위해
+from typing import List,Optional,Sequence
+
+from config import MAP_ROWS,MAP_COLS
+from asset_paths import ASSET_PATHS
+from hex_grid import load_stage_from_csv
+
+# 스테이지 CSV 폴더를 파일 하나로 묶은 바이너리 스테이지 팩.
+#
+#   헤더   : magic 'BPSP' | version u16 | rows u8 | cols u8 | count u32   (little endian, 12바이트)
+#   인덱스 : count x offset u32 (파일 처음부터의 바이트 위치)
+#   레코드 : 스테이지마다 rows*cols 바이트, 셀 문자 그대로 ('.','R','Y','B','G','N')
+#
+# 레코드 길이가 고정이라 몇 번째 스테이지든 인덱스 한 번 보고 바로 잘라 읽음 (파일 존재 확인 없음).
+# 오프셋 기반이라 mmap으로도 읽을 수 있지만, 스테이지당 수십 바이트라 한 번에 읽어서 들고 있음
+# (에디터가 팩을 다시 쓸 때 열린 파일 핸들이 남아 있지 않도록).
+
+PACK_MAGIC:bytes=b'BPSP'
+PACK_VERSION:int=1
+HEADER=struct.Struct('<4sHBBI')
+OFFSET=struct.Struct('<I')
+
+class StagePackError(Exception):
+    """팩 파일 형식이 잘못됐을 때"""
+
+class StagePack:
+    def __init__(self,path:str)->None:
+        """팩 파일을 열고 헤더를 검사함.
+
+        Raises:
+            OSError: 파일을 열 수 없을 때
+            StagePackError: 형식/버전/크기가 맞지 않을 때
+        """
+        self.path:str=path
+        with open(path,'rb') as f:
+            self.data:bytes=f.read()
+        if len(self.data)<HEADER.size:
+            raise StagePackError(f'{path}: 헤더가 잘렸음')
+        magic,version,rows,cols,count=HEADER.unpack_from(self.data,0)
+        if magic!=PACK_MAGIC or version!=PACK_VERSION:
+            raise StagePackError(f'{path}: 스테이지 팩이 아니거나 지원하지 않는 버전 ({version})')
+        self.rows:int=rows
+        self.cols:int=cols
+        self.count:int=count
+        self.record_size:int=rows*cols
+        if len(self.data)<HEADER.size+count*OFFSET.size:
+            raise StagePackError(f'{path}: 인덱스가 잘렸음')
+
+    def __len__(self)->int:
+        return self.count
+
+    def record(self,stage_index:int)->Optional[bytes]:
+        """stage_index번째 스테이지 레코드 바이트 그대로 (0부터). 범위 밖이면 None."""
+        if not 0<=stage_index<self.count:
+            return None
+        (offset,)=OFFSET.unpack_from(self.data,HEADER.size+stage_index*OFFSET.size)
+        record=self.data[offset:offset+self.record_size]
+        if len(record)!=self.record_size:
+            raise StagePackError(f'{self.path}: {stage_index+1}번 스테이지 레코드가 잘렸음')
+        return record
+
+    def get(self,stage_index:int)->Optional[List[List[str]]]:
+        """stage_index번째 스테이지 맵 반환함 (0부터). 범위 밖이면 None."""
+        data=self.record(stage_index)
+        if data is None:
+            return None
+        record=data.decode('ascii')
+        cols=self.cols
+        return [list(record[r*cols:(r+1)*cols]) for r in range(self.rows)]
+
+def write_pack(stages:Sequence[List[List[str]]],path:str,
+               rows:int=MAP_ROWS,cols:int=MAP_COLS)->None:
+    """스테이지 맵들을 팩 파일로 저장함 (임시 파일에 쓴 뒤 교체)."""
+    count=len(stages)
+    record_size=rows*cols
+    data_start=HEADER.size+count*OFFSET.size
+    out=bytearray(HEADER.pack(PACK_MAGIC,PACK_VERSION,rows,cols,count))
+    for i in range(count):
+        out+=OFFSET.pack(data_start+i*record_size)
+    for stage_map in stages:
+        for r in range(rows):
+            row=stage_map[r] if r<len(stage_map) else []
+            out+=''.join(row[c] if c<len(row) else '.' for c in range(cols)).encode('ascii')
+    tmp_path=path+'.tmp'
+    with open(tmp_path,'wb') as f:
+        f.write(out)
+    os.replace(tmp_path,path)
+
+def csv_stage_count(folder:str)->int:
+    """stage1.csv부터 번호가 끊기지 않고 이어지는 스테이지 개수."""
+    count=0
+    while os.path.exists(os.path.join(folder,f'stage{count+1}.csv')):
+        count+=1
+    return count
+
+def build_pack(folder:str=ASSET_PATHS['map_data'],out_path:str=ASSET_PATHS['stage_pack'])->int:
+    """CSV 폴더를 팩으로 변환함. 묶은 스테이지 개수 반환함."""
+    stages=[load_stage_from_csv(i,folder) for i in range(csv_stage_count(folder))]
+    write_pack(stages,out_path)
+    return len(stages)
+
+def open_pack(path:str=ASSET_PATHS['stage_pack'])->Optional[StagePack]:
+    """팩이 있고 현재 맵 크기와 맞으면 열어서 반환함. 없거나 못 쓰면 None (CSV로 대체)."""
+    try:
+        pack=StagePack(path)
+    except FileNotFoundError:
+        return None
+    except (OSError,StagePackError) as e:
+        print(f"스테이지 팩 무시함: {e}")
+        return None
+    if (pack.rows,pack.cols)!=(MAP_ROWS,MAP_COLS):
+        print(f"스테이지 팩 무시함: 맵 크기 {pack.rows}x{pack.cols} != {MAP_ROWS}x{MAP_COLS}")
+        return None
+    return pack
+
+if __name__=='__main__':
+    # python src/stage_pack.py [CSV 폴더] [출력 파일]
+    folder=sys.argv[1] if len(sys.argv)>1 else ASSET_PATHS['map_data']
+    out_path=sys.argv[2] if len(sys.argv)>2 else ASSET_PATHS['stage_pack']
+    n=build_pack(folder,out_path)
+    print(f"스테이지 {n}개 -> {out_path}")
@@ -0,0 +1,54 @@
+import threading
+    # 백그라운드에서 폴더 감시하기 위해
+from typing import Optional
+
+from game_settings import STAGE_WATCH_INTERVAL
+from stage_catalog import Snapshot,StageCatalog
+
+# 맵 에디터 등에서 스테이지 파일을 고치면 게임을 다시 시작하지 않아도 반영되도록
+# 백그라운드 스레드가 STAGE_WATCH_INTERVAL마다 스테이지 폴더의 mtime을 읽어 봄.
+# 바뀐 게 있으면 최신 스냅숏만 남겨 두고, 메인 루프가 poll()로 가져가서
+# StageLoader.sync()에 넘기면 바뀐 스테이지만 다시 읽음.
+# (표준 라이브러리만 쓰기 위해 inotify 대신 폴링. 폴더 하나 scandir라 비용이 작음)
+
+class StageWatcher:
+    def __init__(self,catalog:StageCatalog,interval:int=STAGE_WATCH_INTERVAL)->None:
+        self.catalog:StageCatalog=catalog
+        self.interval:int=interval
+            # ms. 0 이하면 감시 안 함
+        self.latest:Optional[Snapshot]=None
+            # 아직 안 가져간 최신 스냅숏
+        self.lock:threading.Lock=threading.Lock()
+        self.thread:Optional[threading.Thread]=None
+        self.stop_event:threading.Event=threading.Event()
+
+    def start(self)->None:
+        if self.interval<=0 or self.thread is not None:
+            return
+        self.stop_event=threading.Event()
+            # 스레드마다 따로 (멈추는 중인 이전 스레드와 섞이지 않도록)
+        self.thread=threading.Thread(target=self._run,args=(self.stop_event,),
+                                     name='stage-watcher',daemon=True)
+        self.thread.start()
+
+    def stop(self)->None:
+        self.stop_event.set()
+        self.thread=None
+
+    def _run(self,stop_event:threading.Event)->None:
+        last=self.catalog.snapshot
+        while not stop_event.wait(self.interval/1000):
+            snapshot=self.catalog.scan()
+            if snapshot!=last:
+                last=snapshot
+                with self.lock:
+                    self.latest=snapshot
+
+    def poll(self)->Optional[Snapshot]:
+        """마지막으로 가져간 뒤 파일이 바뀌었으면 최신 스냅숏 반환함. 아니면 None."""
+        if self.latest is None:
+            return None
+                # 대부분의 프레임은 락 없이 여기서 끝남
+        with self.lock:
+            snapshot,self.latest=self.latest,None
+        return snapshot
@@ -0,0 +1,76 @@
+import json
+    # 타임라인 JSON 저장 위해
+import os
+    # 환경 변수 읽기 위해
+import time
+    # 시간 측정 위해
+from contextlib import contextmanager,nullcontext
+from typing import ContextManager,Dict,Iterator,List,Optional
+
+# 실행 시작부터 첫 메뉴 프레임까지 무엇에 시간이 드는지 기록하는 타임라인.
+# BUBBLE_POP_PROFILE 환경 변수로 켬:
+#   BUBBLE_POP_PROFILE=1            -> 콘솔에 타임라인 출력
+#   BUBBLE_POP_PROFILE=startup.json -> JSON 파일로 저장
+# 꺼져 있으면 span()이 아무것도 안 하는 컨텍스트라 비용이 거의 없음.
+
+PROFILE_ENV:str='BUBBLE_POP_PROFILE'
+
+class StartupProfiler:
+    def __init__(self,target:Optional[str])->None:
+        self.target:Optional[str]=target
+            # None이면 꺼짐, '1'이면 출력, 그 외에는 JSON 경로
+        self.enabled:bool=bool(target)
+        self.t0:float=time.perf_counter()
+        self.events:List[Dict]=[]
+            # {'category','name','start_ms','duration_ms'} (시작 순서대로)
+
+    def span(self,category:str,name:str)->ContextManager[None]:
+        """with 블록 하나를 타임라인 한 줄로 기록함.
+
+        Args:
+            category (str): 'import', 'image', 'sound', 'font', 'init' 등.
+            name (str): 모듈 이름, 파일 경로 등.
+        """
+        if not self.enabled:
+            return nullcontext()
+        return self._span(category,name)
+
+    @contextmanager
+    def _span(self,category:str,name:str)->Iterator[None]:
+        event={'category':category,'name':name,
+               'start_ms':(time.perf_counter()-self.t0)*1000.0,'duration_ms':0.0}
+        self.events.append(event)
+        start=time.perf_counter()
+        try:
+            yield
+        finally:
+            event['duration_ms']=(time.perf_counter()-start)*1000.0
+
+    def finish(self,label:str)->None:
+        """label 시점(첫 메뉴 프레임 등)을 기록하고 타임라인을 내보낸 뒤 꺼짐."""
+        if not self.enabled:
+            return
+        self.events.append({'category':'mark','name':label,
+                            'start_ms':(time.perf_counter()-self.t0)*1000.0,'duration_ms':0.0})
+        self.enabled=False
+        if self.target=='1':
+            self.print_timeline()
+        else:
+            self.write_json(self.target)
+
+    def print_timeline(self)->None:
+        print("======== 시작 타임라인 ========")
+        for e in self.events:
+            print(f"{e['start_ms']:9.1f}ms  {e['duration_ms']:8.1f}ms  {e['category']:<7} {e['name']}")
+        totals:Dict[str,float]={}
+        for e in self.events:
+            totals[e['category']]=totals.get(e['category'],0.0)+e['duration_ms']
+        print("합계: "+", ".join(f"{k} {v:.1f}ms" for k,v in totals.items() if k!='mark'))
+
+    def write_json(self,path:str)->None:
+        with open(path,'w',encoding='utf-8') as f:
+            json.dump({'events':self.events},f,ensure_ascii=False,indent=2)
+        print(f"시작 타임라인 저장: {path}")
+
+PROFILER:StartupProfiler=StartupProfiler(os.environ.get(PROFILE_ENV))
+    # 프로세스 전역 인스턴스
@@ -0,0 +1,71 @@
+from collections import OrderedDict
+    # LRU 순서 관리 위해
+from typing import Dict,Optional,Tuple
+
+import pygame
+    # 게임 라이브러리
+
+from startup_profiler import PROFILER
+
+# 매 프레임 같은 문자열을 다시 래스터화하지 않도록 폰트와 텍스트 Surface를 모아 두는 캐시.
+# 모든 씬이 같은 캐시를 공유함. 폰트는 (파일, 크기)마다 한 개만 만들고,
+# 텍스트 Surface는 (폰트, 문자열, 색, 안티앨리어싱) 키로 최근 사용 순서대로 보관함.
+
+MAX_TEXT_SURFACES:int=256
+    # 보관할 텍스트 Surface 최대 개수 (넘으면 가장 오래 안 쓴 것부터 버림)
+
+Color=Tuple[int,...]
+TextKey=Tuple[pygame.font.Font,str,Color,bool]
+
+_fonts:Dict[Tuple[Optional[str],int],pygame.font.Font]={}
+_sys_fonts:Dict[Tuple[str,int],pygame.font.Font]={}
+_surfaces:'OrderedDict[TextKey,pygame.Surface]'=OrderedDict()
+
+def get_font(path:Optional[str],size:int)->pygame.font.Font:
+    """(path,size) 폰트 반환함. 처음 요청할 때만 파일을 읽음.
+
+    Args:
+        path (Optional[str]): 폰트 파일 경로. None이면 pygame 기본 폰트.
+        size (int): 글자 크기.
+
+    Returns:
+        pygame.font.Font: 로드 실패 시 같은 크기의 기본 폰트
+    """
+    key=(path,size)
+    font=_fonts.get(key)
+    if font is None:
+        try:
+            with PROFILER.span('font',f'{path} {size}'):
+                font=pygame.font.Font(path,size)
+        except (pygame.error,OSError,FileNotFoundError):
+            print(f"폰트 로드 실패: {path}. 기본 폰트로 대체합니다.")
+            font=pygame.font.Font(None,size)
+        _fonts[key]=font
+    return font
+
+def get_sys_font(name:str,size:int)->pygame.font.Font:
+    """시스템 폰트 버전 get_font."""
+    key=(name,size)
+    font=_sys_fonts.get(key)
+    if font is None:
+        with PROFILER.span('font',f'SysFont {name} {size}'):
+            font=pygame.font.SysFont(name,size)
+        _sys_fonts[key]=font
+    return font
+
+def render_text(font:pygame.font.Font,text:str,color:Color,
+                antialias:bool=True)->pygame.Surface:
+    """font.render 결과를 캐시해서 반환함.
+
+    반환된 Surface는 다른 호출과 공유되므로 직접 수정하지 말 것.
+    """
+    key=(font,text,tuple(color),antialias)
+    surf=_surfaces.get(key)
+    if surf is not None:
+        _surfaces.move_to_end(key)
+        return surf
+    surf=font.render(text,antialias,color)
+    _surfaces[key]=surf
+    if len(_surfaces)>MAX_TEXT_SURFACES:
+        _surfaces.popitem(last=False)
+    return surf
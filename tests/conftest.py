@@ -0,0 +1,29 @@
+import os
+import sys
+
+import pytest
+
+# 게임 모듈은 src/ 안에서 서로 이름으로 임포트하고(from config import ...), 에셋 경로는
+# 저장소 루트 기준 상대 경로이므로 테스트도 src/를 경로에 넣고 루트에서 돌림.
+# pygame이 필요한 테스트는 창/사운드 없이 돌도록 dummy 드라이버를 씀.
+
+ROOT:str=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0,os.path.join(ROOT,'src'))
+os.environ.setdefault('SDL_VIDEODRIVER','dummy')
+os.environ.setdefault('SDL_AUDIODRIVER','dummy')
+
+@pytest.fixture(autouse=True)
+def repo_root(monkeypatch):
+    """에셋/맵 경로가 맞도록 저장소 루트에서 실행."""
+    monkeypatch.chdir(ROOT)
+
+@pytest.fixture
+def game():
+    """dummy 드라이버로 띄운 Game. 끝나면 스테이지 감시 스레드를 멈춤."""
+    pygame=pytest.importorskip('pygame')
+    import game as game_module
+    pygame.init()
+    g=game_module.Game()
+    yield g
+    g.watcher.stop()
+    pygame.quit()
@@ -0,0 +1,76 @@
+import threading
+import time
+
+import pytest
+
+pygame=pytest.importorskip('pygame')
+
+import asset_manager
+from asset_manager import AssetManager
+from asset_paths import ASSET_PATHS
+
+@pytest.fixture
+def loads(monkeypatch):
+    """pygame.image.load를 느리게 만들고 경로별 호출 횟수를 셈 (스레드가 겹치도록)."""
+    counts={}
+    real_load=pygame.image.load
+    def slow_load(path):
+        counts[path]=counts.get(path,0)+1
+        time.sleep(0.01)
+        return real_load(path)
+    monkeypatch.setattr(pygame.image,'load',slow_load)
+    return counts
+
+@pytest.fixture
+def assets(monkeypatch):
+    """빈 캐시로 바꿔 끼운 ASSETS (게임/에디터 모듈이 쓰는 것도 같이)."""
+    import game
+    import map_editor
+    manager=AssetManager()
+    for module in (asset_manager,game,map_editor):
+        monkeypatch.setattr(module,'ASSETS',manager)
+    return manager
+
+def run_threads(fns):
+    threads=[threading.Thread(target=fn) for fn in fns]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+def test_concurrent_decode_loads_once(loads):
+    manager=AssetManager()
+    path=ASSET_PATHS['bubble_red']
+    results=[]
+    run_threads([lambda:results.append(manager.decode(path))]*8)
+    assert loads[path]==1
+    assert len(results)==8 and all(surf is results[0] for surf in results)
+
+def test_preload_threads_only_decode(loads,assets):
+    import game
+    import map_editor
+    run_threads([game.preload_assets,map_editor.preload_assets,game.preload_assets])
+    assert assets.images=={}
+        # 워커 스레드에서는 디스플레이 변환을 안 함
+    assert ASSET_PATHS['cannon_arrow'] in assets.decoded
+        # 게임과 에디터가 같이 쓰는 이미지
+    assert loads and all(count==1 for count in loads.values())
+
+def test_image_converts_decoded_on_main_thread(loads,assets):
+    import game
+    pygame.init()
+    try:
+        pygame.display.set_mode((64,64))
+        thread=threading.Thread(target=game.preload_assets)
+        thread.start()
+        thread.join()
+        path=ASSET_PATHS['bubble_red']
+        raw=assets.decoded[path]
+        surf=assets.image(path,(32,32))
+        assert surf.get_size()==(32,32)
+        assert assets.image(path,(32,32)) is surf
+        assert assets.image(path) is not raw
+            # 메인 스레드에서 디스플레이 포맷으로 변환한 것
+        assert loads[path]==1
+    finally:
+        pygame.quit()
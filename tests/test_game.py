@@ -0,0 +1,71 @@
+import collections
+
+import pygame
+import pytest
+
+import game as game_module
+from config import CELL_SIZE
+from replay import verify_replay
+
+def hold_keys(monkeypatch,*keys:int)->None:
+    pressed=collections.defaultdict(bool,{key:True for key in keys})
+    monkeypatch.setattr(pygame.key,'get_pressed',lambda:pressed)
+
+@pytest.mark.parametrize('key',[pygame.K_LEFT,pygame.K_RIGHT])
+def test_autoplay_with_arrow_held_replays(game,monkeypatch,key):
+    """방향키를 누른 채 자동 플레이해도 봇 각도로 쏘고 리플레이가 맞아야 함."""
+    hold_keys(monkeypatch,key)
+    monkeypatch.setattr(game_module,'AUTOPLAY_SHOT_DELAY',0)
+    game.autoplay=True
+    fired=[]
+    for _ in range(3000):
+        if not game.running or game.clear_started is not None or len(fired)>=6:
+            break
+        move=game.solver.suggest(game.sim,0)
+        in_air=game.sim.fire_in_air
+        game.update()
+        if move is not None and not in_air and game.sim.fire_in_air:
+            fired.append((move.angle,game.sim.current_bubble.angle_degree))
+    assert fired
+    for solved,actual in fired:
+        assert actual==pytest.approx(solved)
+    assert verify_replay(game.recorder.finish(game.sim))
+
+def test_arrow_drawn_at_aim_angle(game):
+    """방향키 각도든 봇 각도든, 힌트를 켰다 꺼도 화살표는 실제 조준 각도로 그려져야 함."""
+    cannon=game.cannon
+    keyboard=[90+k*cannon.angle_speed for k in range(-20,21)]
+    for show_hint in (True,False):
+        game.show_hint=show_hint
+        game.update()
+        for angle in keyboard+game.solver.angles:
+            angle=min(max(angle,cannon.min_angle),cannon.max_angle)
+            assert cannon.angle_step(angle)*game_module.ARROW_ANGLE_STEP==pytest.approx(angle)
+
+def test_arrow_cache_is_bounded(game):
+    cannon=game.cannon
+    assert cannon.arrow_image is not None
+    for angle in game.solver.angles:
+        cannon.rotated_arrow(angle)
+    assert len(cannon.rotated_cache)==game_module.ARROW_CACHE_SIZE
+    last=game.solver.angles[-1]
+    assert cannon.angle_step(last) in cannon.rotated_cache
+
+def test_hint_circle_follows_path_during_wall_drop(game,monkeypatch):
+    """벽이 내려오는 연출 중에도 힌트 원이 궤적 끝(붙는 자리)에 그려져야 함."""
+    game.grid.drop_wall()
+        # 화면의 벽(wall_shown)은 아직 이전 위치
+    assert game.wall_shown!=game.grid.wall_offset
+    move=game.hint_move=game.solver.suggest(game.sim)
+    circles=[]
+    real_circle=pygame.draw.circle
+    def circle(surface,color,center,radius,width=0):
+        circles.append(center)
+        return real_circle(surface,color,center,radius,width)
+    monkeypatch.setattr(pygame.draw,'circle',circle)
+    game.draw_hint(game.screen)
+    (cx,cy),=circles
+    assert game.grid.screen_to_grid(cx,cy)==(move.row,move.col)
+        # 궤적과 같은 (실제 벽) 기준
+    ex,ey=move.path[-1]
+    assert (cx-ex)**2+(cy-ey)**2<=CELL_SIZE**2
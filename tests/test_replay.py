@@ -0,0 +1,114 @@
+import random
+
+import pytest
+
+from compact_grid import CompactHexGrid
+from constants import Action
+from hex_grid import HexGrid
+from replay import ReplayPlayer,ReplayRecorder,board_hash,load_replay,save_replay,verify_replay
+from simulator import Simulator
+from stage_catalog import StageCatalog
+
+def start(seed:int,instant_resolve:bool=False):
+    sim=Simulator(instant_resolve=instant_resolve,seed=seed)
+    recorder=ReplayRecorder(seed,instant_resolve)
+    stage_map=StageCatalog().load(0)
+    recorder.stage(0,stage_map)
+    sim.load_stage(stage_map)
+    return sim,recorder
+
+def play(sim:Simulator,recorder:ReplayRecorder,frames)->None:
+    for actions in frames:
+        recorder.record(sim,actions)
+        sim.step(*actions)
+
+@pytest.mark.parametrize('instant_resolve',[False,True])
+@pytest.mark.parametrize('grid_cls',[HexGrid,CompactHexGrid])
+def test_turns_around_fire_replay(instant_resolve,grid_cls):
+    """같은 프레임에서 FIRE 앞뒤/사이에 회전이 있어도 실제로 쏜 각도로 재생되어야 함."""
+    sim,recorder=start(7,instant_resolve)
+    frames=[
+        [Action.LEFT,Action.FIRE],
+        *[[]]*80,
+        [Action.FIRE,Action.RIGHT],
+        *[[]]*80,
+        [Action.RIGHT,Action.RIGHT,Action.FIRE,Action.LEFT],
+        *[[]]*80,
+        [Action.FIRE,Action.LEFT,Action.LEFT,Action.FIRE],
+        *[[]]*80,
+    ]
+    play(sim,recorder,frames)
+    assert verify_replay(recorder.finish(sim),grid_cls)
+
+@pytest.mark.parametrize('instant_resolve',[False,True])
+def test_random_inputs_replay(instant_resolve):
+    rng=random.Random(3)
+    sim,recorder=start(11,instant_resolve)
+    choices=[Action.LEFT,Action.RIGHT,Action.FIRE,Action.SWAP,Action.RAISE,Action.RAINBOW]
+    weights=[8,8,3,1,1,1]
+    frames=[rng.choices(choices,weights,k=rng.randrange(4)) for _ in range(1500)]
+    play(sim,recorder,frames)
+    log=recorder.finish(sim)
+    assert sum('F' in i.actions for i in log.inputs)>5
+    assert verify_replay(log)
+    assert verify_replay(log,CompactHexGrid)
+
+def long_log(seed:int,instant_resolve:bool):
+    """스테이지가 여러 번 바뀌는 긴 판."""
+    rng=random.Random(seed)
+    sim,recorder=start(seed,instant_resolve)
+    catalog=StageCatalog()
+    stage=0
+    for _ in range(5000):
+        actions=[rng.choice([Action.LEFT,Action.RIGHT])]
+        k=rng.random()
+        if k<0.05:
+            actions.append(Action.FIRE)
+        elif k<0.055:
+            actions.append(rng.choice([Action.SWAP,Action.RAISE,Action.RAINBOW]))
+        play(sim,recorder,[actions])
+        if sim.is_stage_cleared() or sim.is_game_over():
+            stage=(stage+1)%catalog.count
+            stage_map=catalog.load(stage)
+            recorder.stage(stage,stage_map)
+            sim.load_stage(stage_map)
+    return recorder.finish(sim)
+
+@pytest.mark.parametrize('instant_resolve',[False,True])
+def test_seek_matches_sequential_play(instant_resolve):
+    """저장된 상태에서 이어 가는 seek()가 처음부터 차례로 진행한 결과와 같아야 함."""
+    log=long_log(2,instant_resolve)
+    assert len(log.stages)>1
+    ref=ReplayPlayer(log,snapshot_every=0)
+    hashes=[]
+    for shot in range(ref.shot_total+1):
+        ref.seek(shot)
+        hashes.append(board_hash(ref.sim))
+    assert ref.shot_total>20
+
+    for grid_cls in (HexGrid,CompactHexGrid):
+        player=ReplayPlayer(log,grid_cls)
+        player.build_snapshots()
+        order=list(range(player.shot_total+1))
+        random.Random(3).shuffle(order)
+        for shot in order:
+            player.seek(shot)
+            assert board_hash(player.sim)==hashes[shot]
+        player.seek(player.shot_total)
+        while player.advance():
+            pass
+        assert board_hash(player.sim)==log.final_hash
+
+def test_saved_replay_verifies(tmp_path):
+    log=long_log(5,False)
+    path=save_replay(log,str(tmp_path))
+    loaded=load_replay(path)
+    assert loaded==log
+    assert verify_replay(loaded)
+    assert verify_replay(loaded,CompactHexGrid)
+
+def test_tampered_replay_fails():
+    log=long_log(6,True)
+    shot=next(n for n,i in enumerate(log.inputs) if 'F' in i.actions)
+    assert not verify_replay(log._replace(inputs=log.inputs[:shot]+log.inputs[shot+1:]))
+    assert not verify_replay(log._replace(final_hash='0'*40))
@@ -0,0 +1,89 @@
+import math
+import random
+
+import pytest
+
+from compact_grid import CompactHexGrid
+from hex_grid import HexGrid,load_stage_from_csv,side_walls
+from shot_resolver import land_on_path,resolve_shot,shot_targets,trace_path
+from simulator import Simulator
+
+def boards(grid_cls:type,count:int):
+    """실제 판을 무작위로 진행하면서 나오는 보드들 (벽 위치도 바뀜)."""
+    rng=random.Random(grid_cls.__name__)
+    for stage in range(3):
+        sim=Simulator(instant_resolve=True,grid_cls=grid_cls,seed=stage)
+        sim.load_stage(load_stage_from_csv(stage))
+        for _ in range(count):
+            if sim.is_game_over() or sim.is_stage_cleared():
+                break
+            yield sim
+            sim.fire(rng.uniform(10,170))
+
+def contacts(sim:Simulator):
+    """붙어있는 버블/장애물의 (화면 x, 화면 y, 닿는 거리). Simulator의 충돌 판정과 같은 기준."""
+    radius=sim.current_bubble.radius
+    objects=sim.grid.bubble_list+sim.grid.obs_list
+    return [(*sim.grid.world_pos(o),radius+o.radius-2) for o in objects]
+
+@pytest.mark.parametrize('grid_cls',[HexGrid,CompactHexGrid])
+def test_first_contact_is_exact(grid_cls):
+    """충돌 지점에서 딱 닿아 있고(또는 천장), 그 전까지의 궤적은 어떤 대상도 파고들지 않아야 함."""
+    rng=random.Random(1)
+    checked=0
+    for sim in boards(grid_cls,15):
+        b=sim.current_bubble
+        ceiling=sim.grid.y_offset+sim.grid.wall_offset+b.radius
+        items=contacts(sim)
+        for _ in range(6):
+            shot=resolve_shot(sim.grid,b.x,b.y,rng.uniform(10,170),b.radius)
+            hx,hy=shot.path[-1]
+            assert (hx,hy)==(shot.x,shot.y)
+            gaps=[math.hypot(hx-cx,hy-cy)-hit for cx,cy,hit in items]
+            assert min(gaps,default=math.inf)>=-1e-6
+            assert min(gaps,default=math.inf)<=1e-6 or hy==pytest.approx(ceiling)
+            for (x0,y0),(x1,y1) in zip(shot.path,shot.path[1:]):
+                length=math.hypot(x1-x0,y1-y0)
+                for k in range(int(length)):
+                    px,py=x0+(x1-x0)*k/length,y0+(y1-y0)*k/length
+                    for cx,cy,hit in items:
+                        assert math.hypot(px-cx,py-cy)>=hit-1e-6
+            checked+=1
+    assert checked>100
+
+def test_reflects_off_side_walls():
+    sim=Simulator()
+    sim.load_stage(load_stage_from_csv(0))
+    b=sim.current_bubble
+    left,right=side_walls()
+    ceiling=sim.grid.y_offset+b.radius
+    for angle in (12,25,155,168):
+        segments=trace_path(b.x,b.y,angle,ceiling,b.radius)
+        assert len(segments)>1
+        for seg,nxt in zip(segments,segments[1:]):
+            end_x=seg.x+seg.dx*seg.length
+            assert end_x==pytest.approx(left+b.radius) or end_x==pytest.approx(right-b.radius)
+            assert nxt.dx==pytest.approx(-seg.dx) and nxt.dy==pytest.approx(seg.dy)
+        assert segments[-1].ceiling
+
+def test_straight_up_on_empty_board_hits_ceiling():
+    sim=Simulator()
+    sim.load_stage([['.']*sim.grid.cols for _ in range(sim.grid.rows)])
+    b=sim.current_bubble
+    shot=resolve_shot(sim.grid,b.x,b.y,90,b.radius)
+    assert shot.row==0
+    assert shot.y==pytest.approx(sim.grid.y_offset+b.radius)
+    assert shot.x==pytest.approx(b.x)
+
+@pytest.mark.parametrize('grid_cls',[HexGrid,CompactHexGrid])
+def test_cached_trace_matches_resolve_shot(grid_cls):
+    """봇처럼 궤적/대상을 미리 만들어 두고 써도 resolve_shot과 같은 결과여야 함."""
+    rng=random.Random(2)
+    for sim in boards(grid_cls,10):
+        b=sim.current_bubble
+        ceiling=sim.grid.y_offset+sim.grid.wall_offset+b.radius
+        targets=shot_targets(sim.grid,b.radius)
+        for _ in range(10):
+            angle=rng.uniform(10,170)
+            cached=land_on_path(sim.grid,trace_path(b.x,b.y,angle,ceiling,b.radius),targets,warn=False)
+            assert cached==resolve_shot(sim.grid,b.x,b.y,angle,b.radius)
@@ -0,0 +1,91 @@
+import random
+import subprocess
+import sys
+
+from config import LAUNCH_COOLDOWN,MAP_COLS,MAP_ROWS,WALL_DROP_PIXELS
+from constants import Action
+from hex_grid import load_stage_from_csv
+from replay import board_hash
+from simulator import Simulator
+
+def empty_map():
+    return [['.']*MAP_COLS for _ in range(MAP_ROWS)]
+
+def random_frames(seed:int,count:int):
+    rng=random.Random(seed)
+    choices=[Action.LEFT,Action.RIGHT,Action.FIRE,Action.SWAP,Action.RAISE,Action.RAINBOW]
+    return [rng.choices(choices,[8,8,3,1,1,1],k=rng.randrange(3)) for _ in range(count)]
+
+def test_imports_without_pygame():
+    """헤드리스 엔진은 pygame 없이 임포트되어야 함."""
+    code='import sys; import simulator, replay, solver; print("pygame" in sys.modules)'
+    out=subprocess.run([sys.executable,'-c',code],cwd='src',capture_output=True,text=True,check=True)
+    assert out.stdout.strip()=='False'
+
+def test_same_seed_same_game():
+    sims=[Simulator(seed=5),Simulator(seed=5)]
+    for sim in sims:
+        sim.load_stage(load_stage_from_csv(0))
+    for actions in random_frames(1,1500):
+        for sim in sims:
+            sim.step(*actions)
+        assert board_hash(sims[0])==board_hash(sims[1])
+
+def test_snapshot_restore_continues_identically():
+    sim=Simulator(seed=9)
+    sim.load_stage(load_stage_from_csv(1))
+    frames=random_frames(2,1200)
+    for actions in frames[:400]:
+        sim.step(*actions)
+    state=sim.snapshot()
+    for actions in frames[400:]:
+        sim.step(*actions)
+    expected=board_hash(sim)
+
+    sim.restore(state)
+    for actions in frames[400:]:
+        sim.step(*actions)
+    assert board_hash(sim)==expected
+
+def test_match_pops_and_drops_hanging():
+    stage_map=empty_map()
+    stage_map[0][0]=stage_map[0][1]='R'
+    stage_map[1][0]='B'
+        # 홀수 행 (1,0)은 (0,0)/(0,1)에만 매달려 있음
+    stage_map[0][5]='G'
+    sim=Simulator(seed=0)
+    sim.load_stage(stage_map)
+    sim.current_bubble.color='R'
+    result=sim.attach(0,2)
+    assert (result.popped,result.dropped)==(3,1)
+    assert sim.score==30
+    assert sim.grid.map[1][0]=='.'
+    assert sim.grid.bubble_count==1
+
+def test_instant_fire_drops_wall_after_cooldown():
+    stage_map=empty_map()
+    stage_map[0]=list('RYBGRYBG')
+    sim=Simulator(instant_resolve=True,seed=3)
+    sim.load_stage(stage_map)
+    for n in range(LAUNCH_COOLDOWN):
+        assert sim.grid.wall_offset==0
+        assert sim.fire(20+n*40) is not None
+        assert not sim.fire_in_air
+    assert sim.grid.wall_offset==WALL_DROP_PIXELS
+
+def test_frame_stepped_shot_lands():
+    """instant_resolve가 아니면 FIRE 뒤 프레임마다 날아가다 붙음."""
+    stage_map=empty_map()
+    stage_map[0]=list('RYBGRYBG')
+    sim=Simulator(seed=4)
+    sim.load_stage(stage_map)
+    before=sim.grid.bubble_count
+    sim.step(Action.FIRE)
+    assert sim.fire_in_air
+    result=None
+    for _ in range(1000):
+        result=sim.step()
+        if result is not None:
+            break
+    assert result is not None and not sim.fire_in_air
+    assert sim.grid.bubble_count==before+1-result.popped-result.dropped
@@ -0,0 +1,74 @@
+import gc
+import time
+
+import pytest
+
+from compact_grid import CompactHexGrid
+from hex_grid import HexGrid,load_stage_from_csv
+from simulator import Simulator
+from solver import Solver
+
+def positions(grid_cls:type=HexGrid,shots:int=8):
+    """봇이 고른 대로 진행하면서 나오는 판들."""
+    for stage in range(0,7,2):
+        sim=Simulator(instant_resolve=True,grid_cls=grid_cls,seed=stage)
+        sim.load_stage(load_stage_from_csv(stage))
+        solver=Solver.for_sim(sim)
+        for _ in range(shots):
+            if sim.is_game_over() or sim.is_stage_cleared():
+                break
+            yield sim
+            sim.fire(solver.suggest(sim).angle)
+
+def test_budgeted_solve_matches_full_solve():
+    """시간 예산으로 나눠 풀어도 한 번에 푼 것과 같은 발사를 골라야 하고, 실제로 여러 번에 나눠져야 함."""
+    budget_ms=1
+    worst=0.0
+    for sim in positions():
+        expected=Solver.for_sim(sim).suggest(sim)
+        solver=Solver.for_sim(sim)
+        calls=0
+        move=None
+        gc.disable()
+            # 잰 시간에 GC 멈춤이 끼지 않게 함
+        try:
+            while move is None:
+                start=time.perf_counter()
+                move=solver.suggest(sim,budget_ms)
+                worst=max(worst,time.perf_counter()-start)
+                calls+=1
+                assert calls<1000
+        finally:
+            gc.enable()
+        assert move==expected
+        assert calls>1
+    assert worst*1000<budget_ms+10
+        # 시간 확인 사이의 작업 한 덩어리 만큼은 넘을 수 있음
+
+def test_zero_budget_only_returns_finished_result():
+    sim=next(positions())
+    solver=Solver.for_sim(sim)
+    assert solver.suggest(sim,0) is None
+    move=solver.suggest(sim)
+    assert move is not None
+    assert solver.suggest(sim,0)==move
+
+def test_changed_grid_restarts_pending_solve():
+    """풀던 중에 판이 바뀌면 하던 건 버리고 새 판을 풀어야 함."""
+    sim=next(positions())
+    solver=Solver.for_sim(sim)
+    assert solver.suggest(sim,0) is None
+    sim.fire(30)
+    move=None
+    while move is None:
+        move=solver.suggest(sim,1)
+    assert move==Solver.for_sim(sim).suggest(sim)
+
+@pytest.mark.parametrize('grid_cls',[HexGrid,CompactHexGrid])
+def test_move_lands_where_predicted(grid_cls):
+    """고른 각도로 실제로 쏘면 예측한 셀에 붙고 예측한 만큼 없어져야 함."""
+    for sim in positions(grid_cls):
+        move=Solver.for_sim(sim).suggest(sim)
+        result=sim.fire(move.angle)
+        assert (result.row,result.col)==(move.row,move.col)
+        assert (result.popped,result.dropped)==(move.popped,move.dropped)
@@ -0,0 +1,102 @@
+import csv
+import os
+import shutil
+import time
+
+import pytest
+
+from asset_paths import ASSET_PATHS
+from hex_grid import load_stage_from_csv
+from stage_catalog import StageCatalog
+from stage_pack import build_pack
+from stage_watcher import StageWatcher
+
+@pytest.fixture
+def folder(tmp_path):
+    """실제 스테이지 CSV를 복사하고 팩을 만든 폴더. 팩 mtime은 CSV보다 뒤로 맞춤."""
+    folder=tmp_path/'map_data'
+    shutil.copytree(ASSET_PATHS['map_data'],folder,ignore=shutil.ignore_patterns('*.pack'))
+    build_pack(str(folder),str(folder/'stages.pack'))
+    set_mtime(folder/'stages.pack',time.time()+10)
+    return folder
+
+def set_mtime(path,mtime:float)->None:
+    os.utime(path,(mtime,mtime))
+
+def write_stage(folder,number:int,rows,mtime:float)->None:
+    path=folder/f'stage{number}.csv'
+    with open(path,'w',newline='',encoding='utf-8') as f:
+        csv.writer(f).writerows(rows)
+    set_mtime(path,mtime)
+
+def catalog_for(folder)->StageCatalog:
+    return StageCatalog(str(folder),str(folder/'stages.pack'))
+
+def edited(folder,index:int):
+    rows=load_stage_from_csv(index,str(folder))
+    rows[0][0]='Y' if rows[0][0]!='Y' else 'B'
+    return rows
+
+def test_fresh_pack_is_used(folder):
+    catalog=catalog_for(folder)
+    assert catalog.pack is not None
+    assert catalog.load(2)==load_stage_from_csv(2,str(folder))
+
+def test_csv_edited_after_pack_is_read(folder):
+    """팩보다 새로 고친 CSV가 있으면 팩 대신 CSV를 읽고, 고친 스테이지만 바뀐 걸로 알려야 함."""
+    catalog=catalog_for(folder)
+    rows=edited(folder,2)
+    write_stage(folder,3,rows,time.time()+20)
+    assert catalog.refresh()==[2]
+    assert catalog.pack is None
+    assert catalog.load(2)==rows
+    assert catalog.load(0)==load_stage_from_csv(0,str(folder))
+
+    # 팩을 다시 만들면 내용이 같으므로 바뀐 스테이지 없이 다시 팩을 씀
+    build_pack(str(folder),str(folder/'stages.pack'))
+    set_mtime(folder/'stages.pack',time.time()+30)
+    assert catalog.refresh()==[]
+    assert catalog.pack is not None
+    assert catalog.load(2)==rows
+
+def test_csv_count_mismatch_falls_back(folder):
+    catalog=catalog_for(folder)
+    count=catalog.count
+    write_stage(folder,count+1,edited(folder,0),time.time()-100)
+    assert catalog.refresh()==[count]
+    assert catalog.pack is None and catalog.count==count+1
+
+def test_pack_rewrite_reports_changed_records_only(folder):
+    catalog=catalog_for(folder)
+    rows=edited(folder,4)
+    write_stage(folder,5,rows,time.time()-100)
+    build_pack(str(folder),str(folder/'stages.pack'))
+    set_mtime(folder/'stages.pack',time.time()+10)
+    assert catalog.refresh()==[4]
+    assert catalog.pack is not None and catalog.load(4)==rows
+
+def test_pack_without_csvs_is_used(folder):
+    for name in os.listdir(folder):
+        if name.endswith('.csv'):
+            os.remove(folder/name)
+    catalog=catalog_for(folder)
+    assert catalog.pack is not None and catalog.count==len(catalog.pack)
+
+def test_watcher_sees_csv_edit_behind_pack(folder):
+    """팩이 있어도 감시 스레드가 CSV 수정을 알려 주고, 그 스테이지만 다시 읽혀야 함."""
+    catalog=catalog_for(folder)
+    watcher=StageWatcher(catalog,interval=10)
+    watcher.start()
+    try:
+        rows=edited(folder,1)
+        write_stage(folder,2,rows,time.time()+20)
+        snapshot=None
+        deadline=time.time()+5
+        while snapshot is None and time.time()<deadline:
+            time.sleep(0.01)
+            snapshot=watcher.poll()
+    finally:
+        watcher.stop()
+    assert snapshot is not None
+    assert catalog.update(snapshot)==[1]
+    assert catalog.load(1)==rows
@@ -0,0 +1,56 @@
+import shutil
+
+import pytest
+
+from asset_paths import ASSET_PATHS
+from config import MAP_COLS,MAP_ROWS
+from hex_grid import load_stage_from_csv
+from stage_pack import StagePack,StagePackError,build_pack,csv_stage_count,open_pack,write_pack
+
+def test_write_read_round_trip(tmp_path):
+    stages=[
+        [list('RYBG.NRY'),list('.'*7+'/'),*[list('.'*MAP_COLS)]*(MAP_ROWS-2)],
+        [list('GGGGGGGG') for _ in range(MAP_ROWS)],
+    ]
+    path=str(tmp_path/'stages.pack')
+    write_pack(stages,path)
+    pack=StagePack(path)
+    assert len(pack)==2
+    assert [pack.get(i) for i in range(2)]==stages
+    assert pack.get(2) is None and pack.get(-1) is None
+    assert pack.record(1)==b'G'*(MAP_ROWS*MAP_COLS)
+
+def test_short_rows_are_padded(tmp_path):
+    path=str(tmp_path/'stages.pack')
+    write_pack([[list('RY')]],path)
+    stage=StagePack(path).get(0)
+    assert stage[0]==list('RY'+'.'*(MAP_COLS-2))
+    assert stage[1:]==[['.']*MAP_COLS]*(MAP_ROWS-1)
+
+def test_build_pack_matches_csv(tmp_path):
+    folder=tmp_path/'map_data'
+    shutil.copytree(ASSET_PATHS['map_data'],folder)
+    path=str(tmp_path/'stages.pack')
+    count=build_pack(str(folder),path)
+    assert count==csv_stage_count(str(folder))>0
+    pack=open_pack(path)
+    for i in range(count):
+        assert pack.get(i)==load_stage_from_csv(i,str(folder))
+
+@pytest.mark.parametrize('cut',[4,13,20])
+def test_truncated_pack_is_rejected(tmp_path,cut):
+    path=tmp_path/'stages.pack'
+    write_pack([[list('R'*MAP_COLS)]*MAP_ROWS]*2,str(path))
+    data=path.read_bytes()
+    path.write_bytes(data[:cut])
+    with pytest.raises(StagePackError):
+        StagePack(str(path)).get(1)
+
+def test_open_pack_ignores_missing_or_foreign_files(tmp_path):
+    assert open_pack(str(tmp_path/'missing.pack')) is None
+    other=tmp_path/'other.pack'
+    write_pack([[list('R'*4)]*3],str(other),rows=3,cols=4)
+    assert open_pack(str(other)) is None
+    bogus=tmp_path/'bogus.pack'
+    bogus.write_bytes(b'NOPE'+bytes(20))
+    assert open_pack(str(bogus)) is None
@@ -0,0 +1,83 @@
+import random
+
+import pytest
+
+from color_settings import COLORS
+from compact_grid import CompactHexGrid
+from config import MAP_COLS,MAP_ROWS
+from hex_grid import NEIGHBOR_OFFSETS,Bubble,HexGrid
+
+def random_map(rng:random.Random):
+    stage_map=[[rng.choice('RRYYBBGG...N') for _ in range(MAP_COLS)] for _ in range(MAP_ROWS)]
+    if rng.random()<0.3:
+        for r in range(1,MAP_ROWS,2):
+            stage_map[r][MAP_COLS-1]='/'
+    return stage_map
+
+def connected_to_ceiling(grid:HexGrid):
+    """보드 전체를 맨 윗줄부터 다시 훑는 기준 구현."""
+    found={(0,c) for c in range(grid.cols) if grid.cell_at(0,c) in COLORS}
+    stack=list(found)
+    while stack:
+        r,c=stack.pop()
+        for dr,dc in NEIGHBOR_OFFSETS[r%2]:
+            nb=(r+dr,c+dc)
+            if grid.is_in_bounds(*nb) and nb not in found and grid.cell_at(*nb) in COLORS:
+                found.add(nb)
+                stack.append(nb)
+    return found
+
+def colored_cells(grid:HexGrid):
+    return {(r,c) for r in range(grid.rows) for c in range(grid.cols) if grid.cell_at(r,c) in COLORS}
+
+def check_depths(grid:HexGrid)->None:
+    """깊이 d인 버블 옆에는 항상 깊이 d-1인 버블이 있어야 함."""
+    depth=grid.support_depth
+    for (r,c),d in depth.items():
+        if d==0:
+            assert r==0
+        else:
+            assert any(depth.get(nb)==d-1 for nb in grid.get_neighbors(r,c))
+
+def new_grid(grid_cls:type)->HexGrid:
+    return grid_cls(MAP_ROWS,MAP_COLS,40)
+
+@pytest.mark.parametrize('grid_cls',[HexGrid,CompactHexGrid])
+def test_incremental_matches_full_flood(grid_cls):
+    rng=random.Random(grid_cls.__name__)
+    for _ in range(600):
+        grid=new_grid(grid_cls)
+        grid.load_from_stage(random_map(rng))
+        check_depths(grid)
+        for _ in range(6):
+            if rng.random()<0.5:
+                empty=[(r,c) for r in range(grid.rows) for c in range(grid.cols) if grid.cell_at(r,c)=='.']
+                if empty:
+                    r,c=rng.choice(empty)
+                    grid.place_bubble(Bubble(0,0,rng.choice('RYBG')),r,c)
+                    check_depths(grid)
+            cells=colored_cells(grid)
+            if not cells:
+                break
+            start=rng.choice(sorted(cells))
+            removed=set()
+            if rng.random()<0.5:
+                grid.dfs_same_color(*start,grid.cell_at(*start),removed)
+            else:
+                removed={start}
+            grid.remove_cells(removed)
+            expected=colored_cells(grid)-connected_to_ceiling(grid)
+            seeds={nb for cell in removed for nb in grid.get_neighbors(*cell)}-removed
+            assert grid.remove_hanging(seeds)==expected
+            assert set(grid.support_depth)==colored_cells(grid)==connected_to_ceiling(grid)
+            check_depths(grid)
+
+@pytest.mark.parametrize('grid_cls',[HexGrid,CompactHexGrid])
+def test_full_rebuild_matches_full_flood(grid_cls):
+    rng=random.Random(1)
+    for _ in range(300):
+        grid=new_grid(grid_cls)
+        grid.load_from_stage(random_map(rng))
+        expected=colored_cells(grid)-connected_to_ceiling(grid)
+        assert grid.remove_hanging()==expected
+        assert set(grid.support_depth)==connected_to_ceiling(grid)